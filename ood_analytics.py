@@ -0,0 +1,168 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Analytics module.
+
+This module computes exact odds from the populated Bins of a wheel instead of simulating
+spins. A bet is given as a list of (Outcome, amount) pairs placed on one spin; every bin
+is equally likely, so the distribution of a spin's net result follows directly from which
+Bins contain which Outcomes. Probabilities are Fractions by default, or floats when exact
+is False, which is much faster for long sessions.
+"""
+
+from fractions import Fraction
+
+
+def net_result(bin_, bets):
+    """Settles bets against one Bin.
+
+    Parameters:
+        bin_ (Bin): The winning Bin.
+        bets (list of tuple): The Outcome and amount of every bet.
+
+    Returns:
+        The net amount won, negative when the bets lose.
+
+    """
+    return sum(outcome.win_amount(amount) if outcome in bin_ else -amount for outcome, amount in bets)
+
+
+def spin_distribution(wheel, bets, exact=True):
+    """Computes the distribution of the net result of one spin.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        bets (list of tuple): The Outcome and amount of every bet.
+        exact (bool): Whether probabilities are Fractions rather than floats.
+
+    Returns:
+        The probability of every possible net result.
+
+    Return type:
+        dict
+    """
+    bin_probability = Fraction(1, len(wheel.bins)) if exact else 1 / len(wheel.bins)
+    distribution = {}
+    for bin_ in wheel.bins:
+        net = net_result(bin_, bets)
+        distribution[net] = distribution.get(net, 0) + bin_probability
+    return distribution
+
+
+def expected_value(wheel, bets, exact=True):
+    """Computes the expected net result of one spin.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        bets (list of tuple): The Outcome and amount of every bet.
+        exact (bool): Whether the result is a Fraction rather than a float.
+
+    Returns:
+        The expected net result.
+
+    """
+    return sum(net * probability for net, probability in spin_distribution(wheel, bets, exact).items())
+
+
+def variance(wheel, bets, exact=True):
+    """Computes the variance of the net result of one spin.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        bets (list of tuple): The Outcome and amount of every bet.
+        exact (bool): Whether the result is a Fraction rather than a float.
+
+    Returns:
+        The variance of the net result.
+
+    """
+    distribution = spin_distribution(wheel, bets, exact)
+    mean = sum(net * probability for net, probability in distribution.items())
+    return sum((net - mean) ** 2 * probability for net, probability in distribution.items())
+
+
+def house_edge(wheel, outcome, exact=True):
+    """Computes the house edge of an Outcome: the expected loss of a one unit bet.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        outcome (Outcome): The Outcome bet on.
+        exact (bool): Whether the result is a Fraction rather than a float.
+
+    Returns:
+        The house edge, e.g. 1/19 for Red on an American wheel.
+
+    """
+    return -expected_value(wheel, [(outcome, 1)], exact)
+
+
+def bankroll_distribution(wheel, bets, bankroll, spin_count, exact=True):
+    """Computes the exact distribution of the bankroll after spin_count spins by dynamic
+    programming over the reachable bankrolls. A player whose bankroll no longer covers the
+    bets stops playing and keeps that bankroll.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        bets (list of tuple): The Outcome and amount of every bet placed on each spin.
+        bankroll (int or Fraction): The starting bankroll.
+        spin_count (int): The number of spins.
+        exact (bool): Whether probabilities are Fractions rather than floats.
+
+    Returns:
+        The probability of every possible final bankroll.
+
+    Return type:
+        dict
+    """
+    step = spin_distribution(wheel, bets, exact).items()
+    total_stake = sum(amount for _, amount in bets)
+    distribution = {bankroll: Fraction(1) if exact else 1.0}
+    for _ in range(spin_count):
+        next_distribution = {}
+        for current_bankroll, probability in distribution.items():
+            if current_bankroll < total_stake:
+                next_distribution[current_bankroll] = next_distribution.get(current_bankroll, 0) + probability
+                continue
+            for net, step_probability in step:
+                next_bankroll = current_bankroll + net
+                next_distribution[next_bankroll] = next_distribution.get(next_bankroll, 0) + probability * step_probability
+        distribution = next_distribution
+    return distribution
+
+
+def ruin_probability(wheel, bets, bankroll, spin_count, exact=True):
+    """Computes the probability that the bankroll no longer covers the bets within spin_count spins.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        bets (list of tuple): The Outcome and amount of every bet placed on each spin.
+        bankroll (int or Fraction): The starting bankroll.
+        spin_count (int): The number of spins.
+        exact (bool): Whether the result is a Fraction rather than a float.
+
+    Returns:
+        The probability of ruin.
+
+    """
+    total_stake = sum(amount for _, amount in bets)
+    return sum(probability for final_bankroll, probability
+               in bankroll_distribution(wheel, bets, bankroll, spin_count, exact).items()
+               if final_bankroll < total_stake)
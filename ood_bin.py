@@ -24,6 +24,7 @@ The Bin module.
 This module contains the Bin class
 The Roulette wheel has 38 bins, identified with a number and a color.
 Each of these bins defines a number of closely related winning Outcomes.
+The BitsetBin class additionally keeps its Outcomes as a bitmask over their registry ids.
 """
 
 
@@ -33,3 +34,49 @@ class Bin(frozenset):
     that are paid for a particular bin on a Roulette wheel.
 
     """
+
+
+class BitsetBin(Bin):
+    """
+    BitsetBin is a Bin which also stores its Outcomes as a bitmask over their dense
+    outcome_id, so that checking whether a registered Outcome wins is a single bit test.
+    All of its Outcomes must come from the same OutcomeRegistry.
+
+    Fields:
+        mask: Integer with bit outcome_id set for every Outcome in this Bin.
+
+    """
+
+    def __new__(cls, outcomes=()):
+        """Creates the Bin from the given Outcomes and computes its mask.
+
+        Parameter:
+            outcomes (iterable of Outcome): The registered Outcomes of this Bin.
+
+        Raises:
+            ValueError: If one of the Outcomes has no outcome_id.
+
+        """
+        bin_ = super().__new__(cls, outcomes)
+        mask = 0
+        for outcome in bin_:
+            if outcome.outcome_id is None:
+                raise ValueError("Outcome %s is not registered" % outcome.name)
+            mask |= 1 << outcome.outcome_id
+        bin_.mask = mask
+        return bin_
+
+    def wins(self, outcome_id):
+        """Checks whether the Outcome with the given id is in this Bin.
+
+        Parameter:
+            outcome_id (int): The registry id of the Outcome.
+
+        Returns:
+            True if the Outcome wins when this Bin is spun.
+
+        Return type:
+            bool
+
+        """
+        return (self.mask >> outcome_id) & 1 == 1
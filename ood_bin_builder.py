@@ -24,40 +24,132 @@ The Bin Builder module.
 This module contains the BinBuilder class.
 """
 
-from ood_wheel import Wheel
-from ood_outcome import Outcome
+from functools import lru_cache
+
+import ood_instrumentation
+from ood_outcome import outcome_registry
+from ood_wheel_layout import AMERICAN
+
+BET_FAMILY_GENERATORS = {
+    'straight': 'generate_straight_bets',
+    'split': 'generate_split_bets',
+    'street': 'generate_street_bets',
+    'corner': 'generate_corner_bets',
+    'line': 'generate_line_bets',
+    'dozen': 'generate_dozen_bets',
+    'column': 'generate_column_bets',
+    'money': 'generate_money_bets',
+    'zero': 'generate_zero_bets',
+}
+
+
+class BinOutcomeCollector:
+    """
+    BinOutcomeCollector stands in for a Wheel while its Bins are generated, gathering the
+    Outcomes of every Bin in a mutable set so that no Bin is rebuilt per added Outcome.
+
+    Fields:
+        bin_outcomes: One set of Outcomes per bin number.
+
+    """
+
+    def __init__(self, bin_count):
+        """Creates a collector with bin_count empty sets of Outcomes.
+
+        Parameter:
+            bin_count (int): The number of bins of the wheel being built.
+
+        """
+        self.bin_outcomes = [set() for _ in range(bin_count)]
+
+    def add_outcome_to_wheel_bin(self, bin_number, outcome):
+        """Adds the given Outcome to the set of the given bin number.
+
+        Parameters:
+            bin_number (int): bin number of the Outcome.
+            outcome (Outcome): The Outcome to add.
+
+        """
+        self.bin_outcomes[bin_number].add(outcome)
+
+
+@lru_cache(maxsize=None)
+def compile_layout(layout, registry):
+    """Generates the Outcomes of every bin of a layout, once per layout and registry.
+
+    Parameters:
+        layout (WheelLayout): The layout to compile.
+        registry (OutcomeRegistry): The registry to take Outcomes from.
+
+    Returns:
+        The Outcomes of every bin, indexed by bin number.
+
+    Return type:
+        tuple of frozenset of Outcome
+    """
+    bin_builder = BinBuilder(registry, layout)
+    collector = BinOutcomeCollector(layout.bin_count)
+    for bet_family in layout.bet_families:
+        generate = getattr(bin_builder, BET_FAMILY_GENERATORS[bet_family])
+        instrumentation = ood_instrumentation.instrumentation
+        if instrumentation is None:
+            generate(collector)
+        else:
+            with instrumentation.timer(generate.__name__):
+                generate(collector)
+    return tuple(frozenset(outcomes) for outcomes in collector.bin_outcomes)
 
 
 class BinBuilder:
     """
-    BinBuilder creates the Outcomes for all of the 38 individual Bin on a Roulette wheel.
+    BinBuilder creates the Outcomes for all of the individual Bin on a Roulette wheel,
+    following a WheelLayout.
+
+    Fields:
+        outcome_registry: The OutcomeRegistry providing the shared Outcome instances.
+        layout: The WheelLayout of the wheels being built.
 
     """
 
-    def __init__(self):
+    def __init__(self, registry=None, layout=AMERICAN):
         """Initializes the BinBuilder.
 
+        Parameters:
+            registry (OutcomeRegistry): The registry to take Outcomes from, defaults to the
+                module level outcome_registry of ood_outcome.
+            layout (WheelLayout): The layout of the wheels being built, American by default.
+
         """
-        pass
+        self.outcome_registry = outcome_registry if registry is None else registry
+        self.layout = layout
 
     def build_bins(self, wheel):
-        """Creates the Outcome instances and uses the addOutcome() method to place each
-        Outcome in the appropriate Bin of wheel
+        """Places each Outcome of the layout in the appropriate Bin of wheel.
+        The layout is compiled into its bin tables on first use and each Bin is then frozen once.
 
         Parameter:
             wheel (Wheel): The Wheel with Bins that must be populated with Outcomes.
 
+        Raises:
+            ValueError: If the wheel does not have the number of bins of the layout.
+
+        """
+        if len(wheel.bins) != self.layout.bin_count:
+            raise ValueError("The %s layout needs %d bins, the wheel has %d"
+                             % (self.layout.name, self.layout.bin_count, len(wheel.bins)))
+        instrumentation = ood_instrumentation.instrumentation
+        if instrumentation is None:
+            wheel.load_wheel_bins(compile_layout(self.layout, self.outcome_registry))
+        else:
+            with instrumentation.timer('build_bins'):
+                wheel.load_wheel_bins(compile_layout(self.layout, self.outcome_registry))
+
+    def numbers_outcome(self, numbers, odds):
         """
-        self.generate_column_bets(wheel)
-        self.generate_corner_bets(wheel)
-        self.generate_line_bets(wheel)
-        self.generate_dozen_bets(wheel)
-        self.generate_money_bets(wheel)
-        self.generate_special_case_double_zero(wheel)
-        self.generate_special_case_zero(wheel)
-        self.generate_split_bets(wheel)
-        self.generate_street_bets(wheel)
-        self.generate_straight_bets(wheel)
+        Returns the shared Outcome for a bet covering the given numbers, named '{n1 - n2 - ...}'
+
+        """
+        return self.outcome_registry.get_outcome("{" + " - ".join(str(number) for number in numbers) + "}", odds)
 
     def generate_straight_bets(self, wheel):
         """
@@ -65,7 +157,7 @@ class BinBuilder:
 
         """
         for number in range(1, 37):
-            wheel.add_outcome_to_wheel_bin(number, Outcome(str(number), 35))
+            wheel.add_outcome_to_wheel_bin(number, self.outcome_registry.get_outcome(str(number), 35))
 
     def generate_split_bets(self, wheel):
         """
@@ -76,24 +168,21 @@ class BinBuilder:
         for row in range(12):
             # Column 1-2 split
             first_column_number = (3 * row) + 1
-            wheel.add_outcome_to_wheel_bin(first_column_number, Outcome(
-                "{" + "{} - {}".format(str(first_column_number), str(first_column_number + 1)) + "}", 17))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 1, Outcome(
-                "{" + "{} - {}".format(str(first_column_number), str(first_column_number + 1)) + "}", 17))
+            split_outcome = self.numbers_outcome((first_column_number, first_column_number + 1), 17)
+            wheel.add_outcome_to_wheel_bin(first_column_number, split_outcome)
+            wheel.add_outcome_to_wheel_bin(first_column_number + 1, split_outcome)
 
             # column 2-3 split
             second_column_number = (3 * row) + 2
-            wheel.add_outcome_to_wheel_bin(second_column_number, Outcome(
-                "{" + "{} - {}".format(str(first_column_number), str(first_column_number + 1)) + "}", 17))
-            wheel.add_outcome_to_wheel_bin(second_column_number + 1, Outcome(
-                "{" + "{} - {}".format(str(first_column_number), str(first_column_number + 1)) + "}", 17))
+            split_outcome = self.numbers_outcome((second_column_number, second_column_number + 1), 17)
+            wheel.add_outcome_to_wheel_bin(second_column_number, split_outcome)
+            wheel.add_outcome_to_wheel_bin(second_column_number + 1, split_outcome)
 
         # up-down split bets
         for number in range(1, 34):
-            wheel.add_outcome_to_wheel_bin(number,
-                                           Outcome("{" + "{} - {}".format(str(number), str(number + 3)) + "}", 17))
-            wheel.add_outcome_to_wheel_bin(number + 3,
-                                           Outcome("{" + "{} - {}".format(str(number), str(number + 3)) + "}", 17))
+            split_outcome = self.numbers_outcome((number, number + 3), 17)
+            wheel.add_outcome_to_wheel_bin(number, split_outcome)
+            wheel.add_outcome_to_wheel_bin(number + 3, split_outcome)
 
     def generate_street_bets(self, wheel):
         """
@@ -102,15 +191,10 @@ class BinBuilder:
         """
         for row in range(12):
             first_column_number = (3 * row) + 1
-            wheel.add_outcome_to_wheel_bin(first_column_number, Outcome(
-                "{" + "{} - {} - {}".format(str(first_column_number), str(first_column_number + 1),
-                                            str(first_column_number + 2)) + "}", 11))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 1, Outcome(
-                "{" + "{} - {} - {}".format(str(first_column_number), str(first_column_number + 1),
-                                            str(first_column_number + 2)) + "}", 11))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 2, Outcome(
-                "{" + "{} - {} - {}".format(str(first_column_number), str(first_column_number + 1),
-                                            str(first_column_number + 2)) + "}", 11))
+            street_numbers = (first_column_number, first_column_number + 1, first_column_number + 2)
+            street_outcome = self.numbers_outcome(street_numbers, 11)
+            for number in street_numbers:
+                wheel.add_outcome_to_wheel_bin(number, street_outcome)
 
     def generate_corner_bets(self, wheel):
         """
@@ -123,18 +207,10 @@ class BinBuilder:
             Helper function to add the outcome to the bins of the wheel
 
             """
-            wheel.add_outcome_to_wheel_bin(column_number, Outcome(
-                "{" + "{} - {} - {} - {}".format(str(column_number), str(column_number + 1),
-                                                 str(column_number + 3), str(column_number + 4)) + "}", 8))
-            wheel.add_outcome_to_wheel_bin(column_number + 1, Outcome(
-                "{" + "{} - {} - {} - {}".format(str(column_number), str(column_number + 1),
-                                                 str(column_number + 3), str(column_number + 4)) + "}", 8))
-            wheel.add_outcome_to_wheel_bin(column_number + 3, Outcome(
-                "{" + "{} - {} - {} - {}".format(str(column_number), str(column_number + 1),
-                                                 str(column_number + 3), str(column_number + 4)) + "}", 8))
-            wheel.add_outcome_to_wheel_bin(column_number + 4, Outcome(
-                "{" + "{} - {} - {} - {}".format(str(column_number), str(column_number + 1),
-                                                 str(column_number + 3), str(column_number + 4)) + "}", 8))
+            corner_numbers = (column_number, column_number + 1, column_number + 3, column_number + 4)
+            corner_outcome = self.numbers_outcome(corner_numbers, 8)
+            for number in corner_numbers:
+                wheel.add_outcome_to_wheel_bin(number, corner_outcome)
 
         for row in range(11):
             # column 1-2 corner
@@ -150,28 +226,19 @@ class BinBuilder:
         Generates the line bets outcomes and adds them to the appropriate bins of the wheel
 
         """
-
-        def column_outcome(column_number):
-            return Outcome("{" + "{} - {} - {} - {} - {} - {}".format(str(column_number), str(column_number + 1),
-                                                                      str(column_number + 2),
-                                                                      str(column_number + 3), str(column_number + 4),
-                                                                      str(column_number + 5)) + "}", 5)
-
         for row in range(11):
             first_column_number = (3 * row) + 1
-            wheel.add_outcome_to_wheel_bin(first_column_number, column_outcome(first_column_number))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 1, column_outcome(first_column_number))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 2, column_outcome(first_column_number))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 3, column_outcome(first_column_number))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 4, column_outcome(first_column_number))
-            wheel.add_outcome_to_wheel_bin(first_column_number + 5, column_outcome(first_column_number))
+            line_numbers = range(first_column_number, first_column_number + 6)
+            line_outcome = self.numbers_outcome(line_numbers, 5)
+            for number in line_numbers:
+                wheel.add_outcome_to_wheel_bin(number, line_outcome)
 
     def generate_dozen_bets(self, wheel):
         """
          Generates the dozen bets outcomes and adds them to the appropriate bins of the wheel
         """
         for dozen in range(3):
-            dozen_outcome = Outcome(str(dozen + 1), 2)
+            dozen_outcome = self.outcome_registry.get_outcome("Dozen " + str(dozen + 1), 2)
             for number in range(12):
                 wheel.add_outcome_to_wheel_bin((12 * dozen) + number + 1, dozen_outcome)
 
@@ -180,7 +247,7 @@ class BinBuilder:
          Generates the column bets outcomes and adds them to the appropriate bins of the wheel
         """
         for column in range(3):
-            column_outcome = Outcome(str(column + 1), 2)
+            column_outcome = self.outcome_registry.get_outcome("Column " + str(column + 1), 2)
             for row in range(12):
                 wheel.add_outcome_to_wheel_bin((3 * row) + column + 1, column_outcome)
 
@@ -189,12 +256,12 @@ class BinBuilder:
         Generates the money bets outcomes and adds them to the appropriate bins of the wheel
 
         """
-        red_outcome = Outcome("Red", 1)
-        black_outcome = Outcome("Black", 1)
-        even_outcome = Outcome("Even", 1)
-        odd_outcome = Outcome("Odd", 1)
-        high_outcome = Outcome("High", 1)
-        low_outcome = Outcome("Low", 1)
+        red_outcome = self.outcome_registry.get_outcome("Red", 1)
+        black_outcome = self.outcome_registry.get_outcome("Black", 1)
+        even_outcome = self.outcome_registry.get_outcome("Even", 1)
+        odd_outcome = self.outcome_registry.get_outcome("Odd", 1)
+        high_outcome = self.outcome_registry.get_outcome("High", 1)
+        low_outcome = self.outcome_registry.get_outcome("Low", 1)
         for number in range(1, 37):
             if 1 <= number < 19:
                 wheel.add_outcome_to_wheel_bin(number, low_outcome)
@@ -206,20 +273,15 @@ class BinBuilder:
             else:
                 wheel.add_outcome_to_wheel_bin(number, odd_outcome)
 
-            if number in {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}:
+            if number in self.layout.red_numbers:
                 wheel.add_outcome_to_wheel_bin(number, red_outcome)
             else:
                 wheel.add_outcome_to_wheel_bin(number, black_outcome)
 
-    def generate_special_case_zero(self, wheel):
-        """
-        Creates an outcome from '0' and assigns it to bin 0 of the wheel
-        """
-        wheel.add_outcome_to_wheel_bin(0, Outcome('0', 35))
-
-    def generate_special_case_double_zero(self, wheel):
+    def generate_zero_bets(self, wheel):
         """
-        Creates an outcome from '00' and assigns it to bin 37 of the wheel
+        Creates an outcome from the name of every zero of the layout and assigns it to the zero's bin
 
         """
-        wheel.add_outcome_to_wheel_bin(37, Outcome('00', 35))
+        for zero, bin_number in zip(self.layout.zeros, self.layout.zero_bin_numbers):
+            wheel.add_outcome_to_wheel_bin(bin_number, self.outcome_registry.get_outcome(zero, 35))
@@ -0,0 +1,149 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Checkpoint module.
+
+This module saves the state of a long running simulation, the state of the wheel's random
+number generator, the number of spins drawn and the statistics accumulated so far, into a
+compact binary file, so that the simulation can resume exactly where it stopped. A file is
+written to a unique temporary file next to its destination and moved into place with
+os.replace, so a crash while writing leaves the previous checkpoint intact. A sha256 over
+the header fields and the body rejects a damaged checkpoint instead of restoring a corrupt
+state.
+
+File layout, all integers little endian:
+    header: magic b'OODC', format version (uint16), metric count (uint16), spins (uint64),
+            random state version (int32), has gauss_next (uint8), gauss_next (double),
+            sha256 of the preceding header fields and the body (32 bytes)
+    random state: the internal state of the Mersenne Twister (625 uint32)
+    metrics: for every metric its name length (uint16), name (utf-8),
+             count (uint64), mean (double) and sum of squared deviations (double)
+"""
+
+import os
+import sys
+import tempfile
+from array import array
+from hashlib import sha256
+from struct import Struct, error as StructError
+
+from ood_simulation import RunningStatistics
+
+MAGIC = b'OODC'
+FORMAT_VERSION = 2
+HEADER = Struct('<4sHHQi?d32s')
+CHECKSUM_OFFSET = HEADER.size - 32
+STATE_SIZE = 625
+NAME_LENGTH = Struct('<H')
+MOMENTS = Struct('<Qdd')
+
+
+def save_checkpoint(path, random_state, spins, statistics):
+    """Atomically writes a checkpoint file.
+
+    Parameters:
+        path (str): The path of the checkpoint file.
+        random_state (tuple): The state returned by Random.getstate.
+        spins (int): The number of spins drawn so far.
+        statistics (dict): The RunningStatistics of every metric, by name.
+
+    """
+    version, internal_state, gauss_next = random_state
+    state = array('I', internal_state)
+    if sys.byteorder == 'big':
+        state.byteswap()
+    chunks = [state.tobytes()]
+    for name, metric_statistics in statistics.items():
+        encoded_name = name.encode('utf-8')
+        chunks.append(NAME_LENGTH.pack(len(encoded_name)))
+        chunks.append(encoded_name)
+        chunks.append(MOMENTS.pack(*metric_statistics.moments()))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(statistics), spins, version,
+                         gauss_next is not None, gauss_next or 0.0, bytes(32))
+    body = b''.join(chunks)
+    checksum = sha256(header[:CHECKSUM_OFFSET] + body).digest()
+
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as checkpoint_file:
+            checkpoint_file.write(header[:CHECKSUM_OFFSET])
+            checkpoint_file.write(checksum)
+            checkpoint_file.write(body)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_checkpoint(path):
+    """Reads a checkpoint file written by save_checkpoint.
+
+    Parameter:
+        path (str): The path of the checkpoint file.
+
+    Returns:
+        The random state, the number of spins and the RunningStatistics of every metric by name.
+
+    Return type:
+        tuple
+
+    Raises:
+        ValueError: If the file is not a checkpoint of this format, is truncated or is corrupt.
+    """
+    with open(path, 'rb') as checkpoint_file:
+        data = checkpoint_file.read()
+    if len(data) < HEADER.size:
+        raise ValueError("%s is not a checkpoint file" % path)
+    (magic, version, metric_count, spins, state_version, has_gauss_next, gauss_next,
+     checksum) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("%s is not a checkpoint file" % path)
+    if version != FORMAT_VERSION:
+        raise ValueError("%s has unsupported format version %d" % (path, version))
+    if sha256(data[:CHECKSUM_OFFSET] + data[HEADER.size:]).digest() != checksum:
+        raise ValueError("%s is corrupt" % path)
+
+    try:
+        offset = HEADER.size
+        state = array('I')
+        state.frombytes(data[offset:offset + 4 * STATE_SIZE])
+        if len(state) != STATE_SIZE:
+            raise ValueError("%s is truncated" % path)
+        if sys.byteorder == 'big':
+            state.byteswap()
+        offset += 4 * STATE_SIZE
+
+        statistics = {}
+        for _ in range(metric_count):
+            name_length, = NAME_LENGTH.unpack_from(data, offset)
+            offset += NAME_LENGTH.size
+            name = data[offset:offset + name_length].decode('utf-8')
+            offset += name_length
+            statistics[name] = RunningStatistics.from_moments(*MOMENTS.unpack_from(data, offset))
+            offset += MOMENTS.size
+    except (StructError, UnicodeDecodeError) as error:
+        raise ValueError("%s is truncated or corrupt" % path) from error
+
+    random_state = (state_version, tuple(state), gauss_next if has_gauss_next else None)
+    return random_state, spins, statistics
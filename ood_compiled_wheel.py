@@ -0,0 +1,243 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Compiled Wheel module.
+
+This module saves the populated Bins of a Wheel into a compact binary file and loads
+them back with a single read, so that a worker process can start spinning without
+running the BinBuilder. Each file records a fingerprint of the BinBuilder and wheel layout
+sources and is rejected when either has changed since the file was written. It also records
+a fingerprint of the WheelLayout it holds, so that a file of one layout is never loaded
+when another layout is requested.
+The checksum covers the header fields before it as well as the payload, so a damaged count
+is detected like a damaged table.
+
+File layout, all integers little endian:
+    header: magic b'OODW', format version (uint16), bin count (uint16),
+            outcome count (uint32), builder fingerprint (32 bytes), layout fingerprint (32 bytes),
+            sha256 of the preceding header fields and the payload (32 bytes)
+    payload: outcome odds (int32 per outcome),
+             outcome name offsets (uint32 per outcome plus one), outcome names (utf-8),
+             bin offsets (uint32 per bin plus one), outcome indices of every bin (uint16)
+"""
+
+import os
+import sys
+import tempfile
+from array import array
+from functools import lru_cache
+from hashlib import sha256
+from struct import Struct
+
+import ood_bin_builder
+import ood_wheel_layout
+from ood_bin import Bin
+from ood_outcome import outcome_registry
+from ood_wheel import Wheel
+from ood_wheel_layout import AMERICAN
+
+MAGIC = b'OODW'
+FORMAT_VERSION = 3
+HEADER = Struct('<4sHHI32s32s32s')
+CHECKSUM_OFFSET = HEADER.size - 32
+
+
+@lru_cache(maxsize=None)
+def builder_fingerprint():
+    """Hashes the sources of the BinBuilder and wheel layout modules, once per process.
+
+    Returns:
+        The sha256 digest of ood_bin_builder.py and ood_wheel_layout.py.
+
+    Return type:
+        bytes
+    """
+    fingerprint = sha256()
+    for module in (ood_bin_builder, ood_wheel_layout):
+        with open(module.__file__, 'rb') as source:
+            fingerprint.update(source.read())
+    return fingerprint.digest()
+
+
+def layout_fingerprint(layout):
+    """Hashes the fields of a WheelLayout.
+
+    Parameter:
+        layout (WheelLayout): The layout.
+
+    Returns:
+        The sha256 digest of the layout's name, zeros, red numbers and bet families.
+
+    Return type:
+        bytes
+    """
+    fields = (layout.name, tuple(layout.zeros), tuple(sorted(layout.red_numbers)), tuple(layout.bet_families))
+    return sha256(repr(fields).encode('utf-8')).digest()
+
+
+def _little_endian(table):
+    """Returns the bytes of an array in little endian order."""
+    if sys.byteorder == 'big':
+        table = array(table.typecode, table)
+        table.byteswap()
+    return table.tobytes()
+
+
+def _read_table(typecode, payload, offset, count):
+    """Reads count items of the given typecode from payload, returning the array and the next offset.
+       Raises ValueError when the payload is too short."""
+    table = array(typecode)
+    end = offset + count * table.itemsize
+    if end > len(payload):
+        raise ValueError("table of %d items overruns the payload" % count)
+    table.frombytes(payload[offset:end])
+    if sys.byteorder == 'big':
+        table.byteswap()
+    return table, end
+
+
+def save_wheel(wheel, path, layout=AMERICAN):
+    """Writes the Bins of a populated Wheel to path.
+
+    Parameters:
+        wheel (Wheel): The Wheel whose Bins are saved.
+        path (str): The file to write. It is replaced atomically.
+        layout (WheelLayout): The layout the Bins were built from.
+
+    Raises:
+        ValueError: If the wheel does not have the layout's number of bins.
+    """
+    if len(wheel.bins) != layout.bin_count:
+        raise ValueError("a %s wheel has %d bins, not %d" % (layout.name, layout.bin_count, len(wheel.bins)))
+    outcomes = sorted({outcome for bin_ in wheel.bins for outcome in bin_}, key=lambda outcome: outcome.name)
+    indices = {outcome: index for index, outcome in enumerate(outcomes)}
+
+    names = [outcome.name.encode('utf-8') for outcome in outcomes]
+    name_offsets = array('I', [0])
+    for name in names:
+        name_offsets.append(name_offsets[-1] + len(name))
+    bin_offsets = array('I', [0])
+    bin_indices = array('H')
+    for bin_ in wheel.bins:
+        bin_indices.extend(sorted(indices[outcome] for outcome in bin_))
+        bin_offsets.append(len(bin_indices))
+
+    payload = b''.join((_little_endian(array('i', [outcome.odds for outcome in outcomes])),
+                        _little_endian(name_offsets), b''.join(names),
+                        _little_endian(bin_offsets), _little_endian(bin_indices)))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(wheel.bins), len(outcomes), builder_fingerprint(),
+                         layout_fingerprint(layout), bytes(32))
+    checksum = sha256(header[:CHECKSUM_OFFSET] + payload).digest()
+
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as compiled:
+            compiled.write(header[:CHECKSUM_OFFSET])
+            compiled.write(checksum)
+            compiled.write(payload)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_wheel(path, seed=None, bin_class=Bin, registry=None, layout=None):
+    """Reads a file written by save_wheel and returns a Wheel with the saved Bins.
+
+    Parameters:
+        path (str): The file to read.
+        seed (int or SeedSequence): The seed of the new Wheel.
+        bin_class (type): The Bin class of the new Wheel.
+        registry (OutcomeRegistry): The registry the Outcomes are interned in, defaults to the
+            module level outcome_registry of ood_outcome.
+        layout (WheelLayout): The layout the file must hold, any layout when None.
+
+    Returns:
+        The populated Wheel.
+
+    Return type:
+        Wheel
+
+    Raises:
+        ValueError: If the file is not a compiled wheel, is corrupt, was written by a
+            different version of the BinBuilder, or holds another layout.
+    """
+    with open(path, 'rb') as compiled:
+        data = compiled.read()
+    if len(data) < HEADER.size:
+        raise ValueError("%s is not a compiled wheel" % path)
+    magic, version, bin_count, outcome_count, fingerprint, saved_layout, checksum = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("%s is not a compiled wheel of format version %d" % (path, FORMAT_VERSION))
+    if fingerprint != builder_fingerprint():
+        raise ValueError("%s was compiled by a different BinBuilder" % path)
+    if layout is not None and saved_layout != layout_fingerprint(layout):
+        raise ValueError("%s does not hold the %s layout" % (path, layout.name))
+    payload = memoryview(data)[HEADER.size:]
+    if sha256(data[:CHECKSUM_OFFSET] + payload).digest() != checksum:
+        raise ValueError("%s is corrupt" % path)
+
+    try:
+        odds, offset = _read_table('i', payload, 0, outcome_count)
+        name_offsets, offset = _read_table('I', payload, offset, outcome_count + 1)
+        names = payload[offset:offset + name_offsets[-1]]
+        offset += name_offsets[-1]
+        bin_offsets, offset = _read_table('I', payload, offset, bin_count + 1)
+        bin_indices, offset = _read_table('H', payload, offset, bin_offsets[-1])
+    except ValueError as error:
+        raise ValueError("%s is corrupt: %s" % (path, error)) from error
+    if offset != len(payload) or (bin_indices and max(bin_indices) >= outcome_count):
+        raise ValueError("%s is corrupt: the tables do not match the payload" % path)
+
+    registry = outcome_registry if registry is None else registry
+    outcomes = [registry.get_outcome(str(names[name_offsets[index]:name_offsets[index + 1]], 'utf-8'), odds[index])
+                for index in range(outcome_count)]
+    wheel = Wheel(seed, bin_class, bin_count)
+    wheel.load_wheel_bins([[outcomes[index] for index in bin_indices[bin_offsets[bin_number]:bin_offsets[bin_number + 1]]]
+                           for bin_number in range(bin_count)])
+    return wheel
+
+
+def load_or_build_wheel(path, seed=None, bin_class=Bin, registry=None, layout=AMERICAN):
+    """Loads the Wheel compiled at path, building and saving it first when the file is
+       missing, corrupt or stale.
+
+    Parameters:
+        path (str): The compiled wheel file.
+        seed (int or SeedSequence): The seed of the new Wheel.
+        bin_class (type): The Bin class of the new Wheel.
+        registry (OutcomeRegistry): The registry the Outcomes are interned in.
+        layout (WheelLayout): The layout of the wheel. It is built, replacing the file, when the
+            file holds another layout.
+
+    Returns:
+        The populated Wheel.
+
+    Return type:
+        Wheel
+    """
+    try:
+        return load_wheel(path, seed, bin_class, registry, layout)
+    except (OSError, ValueError):
+        wheel = Wheel(seed, bin_class, layout.bin_count)
+        ood_bin_builder.BinBuilder(registry, layout).build_bins(wheel)
+        save_wheel(wheel, path, layout)
+        return wheel
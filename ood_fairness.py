@@ -0,0 +1,280 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Fairness module.
+
+This module contains the SpinStatistics class, which tests a stream of spins for
+uniformity and independence in constant memory. It keeps a histogram of the bins, the
+runs of high and low bins and the sums needed for the lag one serial correlation, all
+updated incrementally batch by batch, and reports at any time:
+    - the chi-square goodness of fit of the histogram to the uniform distribution,
+    - the Wald-Wolfowitz runs test on spins above and below the middle bin,
+    - the lag one serial correlation of the bin numbers.
+"""
+
+from math import erfc, exp, fabs, lgamma, log, sqrt
+from operator import mul
+
+_GAMMA_EPSILON = 1e-15
+_GAMMA_ITERATIONS = 10000
+
+
+def _lower_gamma_series(a, x):
+    """Regularized lower incomplete gamma function P(a, x) by its series, for x < a + 1."""
+    term = total = 1.0 / a
+    denominator = a
+    for _ in range(_GAMMA_ITERATIONS):
+        denominator += 1
+        term *= x / denominator
+        total += term
+        if fabs(term) < fabs(total) * _GAMMA_EPSILON:
+            break
+    return total * exp(-x + a * log(x) - lgamma(a))
+
+
+def _upper_gamma_fraction(a, x):
+    """Regularized upper incomplete gamma function Q(a, x) by its continued fraction, for x >= a + 1."""
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for iteration in range(1, _GAMMA_ITERATIONS):
+        an = -iteration * (iteration - a)
+        b += 2
+        d = an * d + b
+        d = tiny if fabs(d) < tiny else d
+        c = b + an / c
+        c = tiny if fabs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if fabs(delta - 1) < _GAMMA_EPSILON:
+            break
+    return exp(-x + a * log(x) - lgamma(a)) * h
+
+
+def chi_square_p_value(statistic, degrees_of_freedom):
+    """Computes the probability that a chi-square variable exceeds statistic.
+
+    Parameters:
+        statistic (float): The chi-square statistic.
+        degrees_of_freedom (int): The degrees of freedom.
+
+    Returns:
+        The upper tail probability.
+
+    Return type:
+        float
+    """
+    if statistic <= 0:
+        return 1.0
+    a = degrees_of_freedom / 2
+    x = statistic / 2
+    if x < a + 1:
+        return 1.0 - _lower_gamma_series(a, x)
+    return _upper_gamma_fraction(a, x)
+
+
+def normal_p_value(z):
+    """Computes the two sided probability that a standard normal variable exceeds |z|.
+
+    Parameter:
+        z (float): The standard score.
+
+    Return type:
+        float
+    """
+    return erfc(fabs(z) / sqrt(2))
+
+
+class SpinStatistics:
+    """
+    SpinStatistics accumulates the statistics of a stream of spins of a wheel with bin_count bins.
+
+    Fields:
+        bin_count: The number of bins of the wheel.
+        counts: The number of spins of every bin.
+        spins: The total number of spins.
+        runs: The number of runs of high and low spins.
+
+    """
+
+    def __init__(self, bin_count=38):
+        """Creates empty statistics.
+
+        Parameter:
+            bin_count (int): The number of bins of the wheel.
+
+        """
+        self.bin_count = bin_count
+        self.counts = [0] * bin_count
+        self.spins = 0
+        # Bins below the middle are low, bins above are high; with an odd number of bins the
+        # middle bin belongs to neither and is left out of the runs test.
+        self._high_low = b''.join(b'L' if 2 * bin_number + 1 < bin_count else
+                                  b'H' if 2 * bin_number + 1 > bin_count else b'-'
+                                  for bin_number in range(bin_count)).ljust(256, b'-')
+        self.high = 0
+        self.low = 0
+        self.runs = 0
+        self._last_high_low = b''
+        self._last_bin = None
+        self._sum = 0
+        self._sum_of_squares = 0
+        self._sum_of_products = 0
+
+    def update(self, bin_numbers):
+        """Adds a batch of spins.
+
+        Parameter:
+            bin_numbers (bytes-like of int): The numbers of the spun bins, in spin order.
+
+        """
+        spins = bytes(bin_numbers)
+        if not spins:
+            return
+        counts = self.counts
+        for bin_number in range(self.bin_count):
+            counts[bin_number] += spins.count(bin_number)
+        self.spins += len(spins)
+
+        high_low = spins.translate(self._high_low).replace(b'-', b'')
+        if high_low:
+            self.high += high_low.count(b'H')
+            self.low += high_low.count(b'L')
+            joined = self._last_high_low + high_low
+            self.runs += joined.count(b'HL') + joined.count(b'LH') + (not self._last_high_low)
+            self._last_high_low = high_low[-1:]
+
+        self._sum += sum(spins)
+        self._sum_of_squares += sum(map(mul, spins, spins))
+        self._sum_of_products += sum(map(mul, spins, spins[1:]))
+        if self._last_bin is not None:
+            self._sum_of_products += self._last_bin * spins[0]
+        self._last_bin = spins[-1]
+
+    def chi_square(self):
+        """Computes the chi-square goodness of fit of the histogram to the uniform distribution.
+
+        Returns:
+            The chi-square statistic and its p-value.
+
+        Return type:
+            tuple
+        """
+        if not self.spins:
+            return 0.0, 1.0
+        expected = self.spins / self.bin_count
+        statistic = sum((count - expected) ** 2 for count in self.counts) / expected
+        return statistic, chi_square_p_value(statistic, self.bin_count - 1)
+
+    def runs_test(self):
+        """Computes the Wald-Wolfowitz runs test of the high and low spins.
+
+        Returns:
+            The standard score of the number of runs and its p-value.
+
+        Return type:
+            tuple
+        """
+        high, low = self.high, self.low
+        total = high + low
+        if not high or not low or total < 2:
+            return 0.0, 1.0
+        expected = 2.0 * high * low / total + 1
+        variance = 2.0 * high * low * (2.0 * high * low - total) / (total * total * (total - 1))
+        if variance <= 0:
+            return 0.0, 1.0
+        z = (self.runs - expected) / sqrt(variance)
+        return z, normal_p_value(z)
+
+    def serial_correlation(self):
+        """Computes the lag one serial correlation of the bin numbers.
+
+        Returns:
+            The correlation coefficient and the p-value of its standard score.
+
+        Return type:
+            tuple
+        """
+        n = self.spins
+        if n < 3:
+            return 0.0, 1.0
+        mean = self._sum / n
+        variance = self._sum_of_squares / n - mean * mean
+        if variance <= 0:
+            return 0.0, 1.0
+        pairs = n - 1
+        covariance = self._sum_of_products / pairs - mean * mean
+        correlation = covariance / variance
+        return correlation, normal_p_value(correlation * sqrt(pairs))
+
+    def report(self):
+        """Reports all of the tests.
+
+        Returns:
+            The number of spins and the statistic and p-value of every test.
+
+        Return type:
+            dict
+        """
+        chi_square, chi_square_p = self.chi_square()
+        runs_z, runs_p = self.runs_test()
+        correlation, correlation_p = self.serial_correlation()
+        return {
+            'spins': self.spins,
+            'chi_square': chi_square,
+            'chi_square_p': chi_square_p,
+            'runs_z': runs_z,
+            'runs_p': runs_p,
+            'serial_correlation': correlation,
+            'serial_correlation_p': correlation_p,
+        }
+
+
+def monitor_wheel(wheel, spin_count, batch_size=1 << 16, report_every=None, callback=None):
+    """Spins a wheel spin_count times, feeding the spins through SpinStatistics batch by batch.
+
+    Parameters:
+        wheel (Wheel): The wheel, or any source with next_wheel_bins and bins.
+        spin_count (int): The number of spins.
+        batch_size (int): The number of spins drawn per batch.
+        report_every (int): Call callback with a report after about every report_every spins.
+        callback (callable): Receives the report dict, e.g. to print or export it.
+
+    Returns:
+        The statistics of all spins.
+
+    Return type:
+        SpinStatistics
+    """
+    statistics = SpinStatistics(len(wheel.bins))
+    next_report = report_every
+    remaining = spin_count
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        statistics.update(wheel.next_wheel_bins(count))
+        remaining -= count
+        if callback is not None and next_report is not None and statistics.spins >= next_report:
+            callback(statistics.report())
+            next_report += report_every
+    return statistics
@@ -0,0 +1,360 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The History module.
+
+This module records the spin results and bankroll trajectories of Sessions without keeping
+them all in memory. RingBuffer is a fixed capacity buffer backed by a typed array, holding
+bin numbers in one byte each and bankrolls in eight. P2Quantile estimates a quantile of a
+stream with the P-square algorithm of Jain and Chlamtac in constant space, and
+BankrollCurves keeps one P2Quantile per spin and quantile, so percentile bankroll curves
+over many sessions take memory proportional to the session length only.
+"""
+
+from array import array
+
+
+class RingBuffer:
+    """
+    RingBuffer keeps the last capacity values appended to it in a typed array.
+
+    Fields:
+        capacity: The largest number of values kept.
+        typecode: The array typecode of the values.
+
+    """
+
+    def __init__(self, typecode, capacity):
+        """Creates an empty buffer.
+
+        Parameters:
+            typecode (str): The array typecode of the values, e.g. 'B' for bin numbers or 'd' for bankrolls.
+            capacity (int): The largest number of values kept.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive, got %d" % capacity)
+        self.typecode = typecode
+        self.capacity = capacity
+        self._values = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        """The number of values kept.
+
+        Return type:
+            int
+
+        """
+        return self._length
+
+    def __getitem__(self, index):
+        """Returns the value at index, the oldest value kept being at index 0."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ring buffer index out of range")
+        return self._values[(self._start + index) % self.capacity]
+
+    @property
+    def full(self):
+        """Whether appending will drop the oldest value.
+
+        Return type:
+            bool
+
+        """
+        return self._length == self.capacity
+
+    def append(self, value):
+        """Appends one value, dropping the oldest one when full.
+
+        Parameter:
+            value: The value.
+
+        """
+        end = (self._start + self._length) % self.capacity
+        self._values[end] = value
+        if self._length < self.capacity:
+            self._length += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, values):
+        """Appends a batch of values with at most two slice copies.
+
+        Parameter:
+            values (array): The values, of the buffer's typecode.
+
+        """
+        if len(values) >= self.capacity:
+            self._values[:] = values[len(values) - self.capacity:]
+            self._start = 0
+            self._length = self.capacity
+            return
+        end = (self._start + self._length) % self.capacity
+        head = min(len(values), self.capacity - end)
+        self._values[end:end + head] = values[:head]
+        self._values[:len(values) - head] = values[head:]
+        dropped = max(self._length + len(values) - self.capacity, 0)
+        self._start = (self._start + dropped) % self.capacity
+        self._length += len(values) - dropped
+
+    def clear(self):
+        """Drops all values, keeping the storage."""
+        self._start = 0
+        self._length = 0
+
+    def values(self):
+        """Returns the values kept, oldest first.
+
+        Return type:
+            array
+        """
+        end = self._start + self._length
+        if end <= self.capacity:
+            return self._values[self._start:end]
+        return self._values[self._start:] + self._values[:end - self.capacity]
+
+
+class P2Quantile:
+    """
+    P2Quantile estimates one quantile of a stream of values with five markers.
+
+    Fields:
+        quantile: The quantile estimated, between 0 and 1.
+        count: The number of values added.
+
+    """
+
+    def __init__(self, quantile):
+        """Creates an estimator with no values.
+
+        Parameter:
+            quantile (float): The quantile estimated, between 0 and 1.
+
+        Raises:
+            ValueError: If quantile is not between 0 and 1.
+        """
+        if not 0 <= quantile <= 1:
+            raise ValueError("quantile must be between 0 and 1, got %r" % quantile)
+        self.quantile = quantile
+        self.count = 0
+        self._heights = array('d')
+        self._positions = array('d', [1, 2, 3, 4, 5])
+        # The desired position of marker i after n values is 1 + (n - 1) * increment i.
+        self._increments = (0, quantile / 2, quantile, (1 + quantile) / 2, 1)
+
+    def add(self, value):
+        """Adds one value to the stream.
+
+        Parameter:
+            value (float): The value.
+
+        """
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            if self.count == 5:
+                self._heights = array('d', sorted(heights))
+            return
+
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            marker = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            marker = 3
+        else:
+            marker = 0
+            while value >= heights[marker + 1]:
+                marker += 1
+        for index in range(marker + 1, 5):
+            positions[index] += 1
+
+        for index in (1, 2, 3):
+            offset = 1 + (self.count - 1) * self._increments[index] - positions[index]
+            if (offset >= 1 and positions[index + 1] - positions[index] > 1) or \
+                    (offset <= -1 and positions[index - 1] - positions[index] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = heights[index] + step * (heights[index + step] - heights[index]) / (
+                        positions[index + step] - positions[index])
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index, step):
+        """Returns the piecewise parabolic prediction of a marker height moved by step."""
+        heights, positions = self._heights, self._positions
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (positions[index] - positions[index - 1] + step) * (heights[index + 1] - heights[index]) /
+            (positions[index + 1] - positions[index]) +
+            (positions[index + 1] - positions[index] - step) * (heights[index] - heights[index - 1]) /
+            (positions[index] - positions[index - 1]))
+
+    @property
+    def value(self):
+        """The estimated quantile, exact while at most five values were added, and for the
+        quantiles 0 and 1, the smallest and largest values, which the outer markers track.
+
+        Return type:
+            float
+
+        Raises:
+            ValueError: If no value was added.
+
+        """
+        if self.count == 0:
+            raise ValueError("no values added")
+        if self.count <= 5:
+            ordered = sorted(self._heights)
+            return ordered[round(self.quantile * (len(ordered) - 1))]
+        if self.quantile == 0:
+            return self._heights[0]
+        if self.quantile == 1:
+            return self._heights[4]
+        return self._heights[2]
+
+
+class BankrollCurves:
+    """
+    BankrollCurves estimates quantiles of the bankroll after every spin over many sessions.
+    A session that stops early keeps its final bankroll for the remaining spins.
+
+    Fields:
+        quantiles: The quantiles estimated.
+        session_length: The number of spins covered.
+        sessions: The number of trajectories added.
+
+    """
+
+    def __init__(self, session_length, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """Creates one P2Quantile per spin and quantile.
+
+        Parameters:
+            session_length (int): The number of spins covered.
+            quantiles (sequence of float): The quantiles estimated.
+
+        """
+        self.quantiles = tuple(quantiles)
+        self.session_length = session_length
+        self.sessions = 0
+        self._estimators = [[P2Quantile(quantile) for quantile in self.quantiles] for _ in range(session_length)]
+
+    def add_trajectory(self, bankrolls):
+        """Adds the bankroll of one session after each of its spins.
+
+        Parameter:
+            bankrolls (sequence of float): The bankroll after every spin played, at most
+                session_length of them.
+
+        Raises:
+            ValueError: If the trajectory is empty or longer than session_length.
+        """
+        if not 0 < len(bankrolls) <= self.session_length:
+            raise ValueError("trajectory of %d spins, expected 1 to %d" % (len(bankrolls), self.session_length))
+        self.sessions += 1
+        final_bankroll = bankrolls[-1]
+        for spin, estimators in enumerate(self._estimators):
+            bankroll = bankrolls[spin] if spin < len(bankrolls) else final_bankroll
+            for estimator in estimators:
+                estimator.add(bankroll)
+
+    def curves(self):
+        """Returns the estimated bankroll after every spin, for every quantile.
+
+        Returns:
+            An array of session_length bankrolls per quantile.
+
+        Return type:
+            dict
+        """
+        return {quantile: array('d', [estimators[column].value for estimators in self._estimators])
+                for column, quantile in enumerate(self.quantiles)}
+
+
+class SessionHistory:
+    """
+    SessionHistory records the most recent spins of a Session and the bankroll after each.
+
+    Fields:
+        bin_numbers: A RingBuffer of the spun bin numbers.
+        bankrolls: A RingBuffer of the bankroll after each spin.
+
+    """
+
+    def __init__(self, capacity):
+        """Creates empty buffers.
+
+        Parameter:
+            capacity (int): The number of spins kept.
+
+        """
+        self.bin_numbers = RingBuffer('B', capacity)
+        self.bankrolls = RingBuffer('d', capacity)
+
+    def play(self, session, wheel, net_by_bin=None):
+        """Plays a session with Session.play, recording its spins and bankrolls.
+
+        Parameters:
+            session (Session): The session played.
+            wheel (Wheel): The wheel to spin.
+            net_by_bin (array of floats): The result of session.net_by_bin(wheel), computed when None.
+
+        Returns:
+            The final bankroll and the number of spins played.
+
+        Return type:
+            tuple
+        """
+        self.bin_numbers.clear()
+        self.bankrolls.clear()
+        return session.play(wheel, net_by_bin, self.bin_numbers, self.bankrolls)
+
+
+def bankroll_curves(wheel, session, session_count, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    """Plays session_count sessions and estimates percentile bankroll curves.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        session (Session): The session played.
+        session_count (int): The number of sessions.
+        quantiles (sequence of float): The quantiles estimated.
+
+    Returns:
+        The curves, starting with the bankroll after the first spin.
+
+    Return type:
+        BankrollCurves
+    """
+    curves = BankrollCurves(session.session_length, quantiles)
+    history = SessionHistory(session.session_length)
+    net_by_bin = session.net_by_bin(wheel)
+    for _ in range(session_count):
+        _, spins = history.play(session, wheel, net_by_bin)
+        curves.add_trajectory(history.bankrolls.values() if spins else array('d', [session.bankroll]))
+    return curves
@@ -0,0 +1,154 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Instrumentation module.
+
+This module contains the opt-in Instrumentation class, which counts spins per bin and
+times spinning and bin building. Instrumentation is off until enable() is called; while
+it is off, the Wheel and BinBuilder pay a single check of the module level
+instrumentation variable per call. snapshot() returns a copy of the current figures and
+can be scraped periodically.
+"""
+
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+
+class Instrumentation:
+    """
+    Instrumentation holds spin counters and timers.
+
+    Fields:
+        spin_counts: The number of spins that selected every bin number.
+        timers: The call count, total seconds and longest call in seconds of every timed operation.
+
+    """
+
+    def __init__(self):
+        """Creates empty counters and timers.
+
+        """
+        self.spin_counts = []
+        self.timers = {}
+        self._lock = Lock()
+
+    def count_spins(self, bin_numbers):
+        """Counts the given spins.
+
+        Parameter:
+            bin_numbers (iterable of int): The numbers of the selected bins.
+
+        """
+        with self._lock:
+            spin_counts = self.spin_counts
+            for bin_number in bin_numbers:
+                if bin_number >= len(spin_counts):
+                    spin_counts.extend([0] * (bin_number + 1 - len(spin_counts)))
+                spin_counts[bin_number] += 1
+
+    def record_time(self, name, seconds):
+        """Adds one call of the named operation.
+
+        Parameters:
+            name (str): The name of the operation.
+            seconds (float): The duration of the call.
+
+        """
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    @contextmanager
+    def timer(self, name):
+        """Times the body of a with statement as one call of the named operation.
+
+        Parameter:
+            name (str): The name of the operation.
+
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, perf_counter() - start)
+
+    def snapshot(self):
+        """Copies the current figures.
+
+        Returns:
+            A dict with the spin counts per bin number, the total number of spins, and the
+            count, total and max seconds of every timer.
+
+        Return type:
+            dict
+        """
+        with self._lock:
+            return {
+                'spin_counts': list(self.spin_counts),
+                'spins': sum(self.spin_counts),
+                'timers': {name: {'count': count, 'total': total, 'max': longest}
+                           for name, (count, total, longest) in self.timers.items()},
+            }
+
+
+instrumentation = None
+
+
+def enable():
+    """Turns instrumentation on, keeping the figures collected so far.
+
+    Returns:
+        The active Instrumentation.
+
+    Return type:
+        Instrumentation
+    """
+    global instrumentation
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    return instrumentation
+
+
+def disable():
+    """Turns instrumentation off and discards its figures.
+
+    """
+    global instrumentation
+    instrumentation = None
+
+
+def snapshot():
+    """Copies the current figures of the active Instrumentation.
+
+    Returns:
+        The snapshot of the active Instrumentation, None when instrumentation is off.
+
+    Return type:
+        dict
+    """
+    return None if instrumentation is None else instrumentation.snapshot()
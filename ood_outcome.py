@@ -25,6 +25,8 @@ This module contains the outcome class.
 The outcome class contains the name of the outcome as a String, and the odds that are
 paid as an integer. We will use these objects when placing a bet and also when defining
 the Roulette wheel.
+The OutcomeRegistry class holds one canonical Outcome per name, each with a dense integer id,
+so that wheels and bets can share Outcome instances.
 """
 
 
@@ -35,19 +37,24 @@ class Outcome:
     Fields:
        name: Holds the name of the Outcome.
        odds: Holds the payout odds for this Outcome.
+       outcome_id: Holds the dense integer id given by an OutcomeRegistry, or None.
 
     """
 
-    def __init__(self, name, odds):
-        """Sets the instance name and odds from the parameter name and odds.
+    __slots__ = ('name', 'odds', 'outcome_id')
+
+    def __init__(self, name, odds, outcome_id=None):
+        """Sets the instance name, odds and id from the parameter name, odds and outcome_id.
 
         Parameters:
             name (str): The name of this outcome.
             odds (int): The payout odds of this outcome.
+            outcome_id (int): The registry id of this outcome, None if it is not registered.
 
         """
         self.name = name
         self.odds = odds
+        self.outcome_id = outcome_id
 
     def win_amount(self, amount):
         """Multiplies this Outcome's odds by the given amount The product is returned.
@@ -114,3 +121,83 @@ class Outcome:
 
         """
         return "%s (%d:1)" % (self.name, self.odds)
+
+
+class OutcomeRegistry:
+    """
+    OutcomeRegistry interns Outcomes by name, handing out a single shared Outcome per name
+    with a dense integer id in the order the names were first registered.
+
+    Fields:
+        outcomes: The registered Outcomes, indexed by their outcome_id.
+
+    """
+
+    def __init__(self):
+        """Creates an empty registry.
+
+        """
+        self.outcomes = []
+        self._outcomes_by_name = {}
+
+    def get_outcome(self, name, odds):
+        """Returns the canonical Outcome with the given name, registering it first if needed.
+
+        Parameters:
+            name (str): The name of the outcome.
+            odds (int): The payout odds of the outcome.
+
+        Returns:
+            The registered Outcome.
+
+        Return type:
+            Outcome
+
+        Raises:
+            ValueError: If the name is already registered with different odds.
+
+        """
+        outcome = self._outcomes_by_name.get(name)
+        if outcome is None:
+            outcome = Outcome(name, odds, len(self.outcomes))
+            self.outcomes.append(outcome)
+            self._outcomes_by_name[name] = outcome
+        elif outcome.odds != odds:
+            raise ValueError("Outcome %s is registered with odds %d:1, not %d:1" % (name, outcome.odds, odds))
+        return outcome
+
+    def __getitem__(self, outcome_id):
+        """Returns the Outcome with the given id.
+
+        Parameter:
+            outcome_id (int): The id of the outcome.
+
+        Return type:
+            Outcome
+
+        """
+        return self.outcomes[outcome_id]
+
+    def __contains__(self, name):
+        """Checks whether an Outcome with the given name is registered.
+
+        Parameter:
+            name (str): The name of the outcome.
+
+        Return type:
+            bool
+
+        """
+        return name in self._outcomes_by_name
+
+    def __len__(self):
+        """The number of registered Outcomes.
+
+        Return type:
+            int
+
+        """
+        return len(self.outcomes)
+
+
+outcome_registry = OutcomeRegistry()
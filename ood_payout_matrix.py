@@ -0,0 +1,121 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Payout Matrix module.
+
+This module contains the PayoutMatrix class.
+Once the Bins of a wheel are populated, the net result of a unit bet on every Outcome
+for every Bin is fixed. The PayoutMatrix precomputes these results so that a whole
+vector of stakes can be settled against a spin with a single dot product.
+"""
+
+from array import array
+from operator import mul
+
+
+class PayoutMatrix:
+    """
+    PayoutMatrix holds one row per Bin and one column per Outcome of a wheel.
+    The entry for a Bin and an Outcome is the Outcome's odds when the Outcome is in
+    the Bin, and -1 otherwise, i.e. the net result of betting one unit on it.
+
+    Fields:
+        outcomes: The Outcomes of the wheel, one per column, ordered by name.
+        rows: The rows of the matrix, one array of floats per Bin.
+
+    """
+
+    def __init__(self, bins):
+        """Builds the matrix from the populated Bins of a wheel.
+
+        Parameter:
+            bins (list of Bin): The Bins of the wheel, indexed by bin number.
+
+        """
+        self.outcomes = sorted({outcome for bin_ in bins for outcome in bin_}, key=lambda outcome: outcome.name)
+        self._columns = {outcome: column for column, outcome in enumerate(self.outcomes)}
+        self.rows = []
+        for bin_ in bins:
+            row = array('d', [-1.0] * len(self.outcomes))
+            for outcome in bin_:
+                row[self._columns[outcome]] = outcome.odds
+            self.rows.append(row)
+
+    def column(self, outcome):
+        """Returns the column of the given Outcome.
+
+        Parameter:
+            outcome (Outcome): An Outcome of the wheel.
+
+        Return type:
+            int
+
+        """
+        return self._columns[outcome]
+
+    def stakes(self, bets):
+        """Builds a stake vector from (Outcome, amount) pairs.
+
+        Parameter:
+            bets (iterable of tuple): The Outcome and amount of every bet. Amounts bet on
+                the same Outcome are added up.
+
+        Returns:
+            The amount bet on every column.
+
+        Return type:
+            array of floats
+        """
+        stakes = array('d', bytes(8 * len(self.outcomes)))
+        for outcome, amount in bets:
+            stakes[self._columns[outcome]] += amount
+        return stakes
+
+    def settle(self, bin_number, stakes):
+        """Settles a stake vector against one spin.
+
+        Parameters:
+            bin_number (int): The number of the winning Bin.
+            stakes (sequence of float): The amount bet on every column.
+
+        Returns:
+            The net amount won by the stakes, negative when they lose.
+
+        Return type:
+            float
+        """
+        return sum(map(mul, self.rows[bin_number], stakes))
+
+    def settle_spins(self, bin_numbers, stakes):
+        """Settles the same stake vector against a batch of spins.
+
+        Parameters:
+            bin_numbers (iterable of int): The numbers of the winning Bins.
+            stakes (sequence of float): The amount bet on every column.
+
+        Returns:
+            The net amount won on every spin.
+
+        Return type:
+            array of floats
+        """
+        net_by_bin = [sum(map(mul, row, stakes)) for row in self.rows]
+        return array('d', [net_by_bin[bin_number] for bin_number in bin_numbers])
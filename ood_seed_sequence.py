@@ -0,0 +1,111 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Seed Sequence module.
+
+This module contains the SeedSequence class.
+A SeedSequence turns a seed into the state of a random number generator and can spawn
+statistically independent child sequences, so that every worker of a parallel run
+draws from its own reproducible stream.
+"""
+
+from hashlib import sha256
+from os import urandom
+from random import Random
+
+
+class SeedSequence:
+    """
+    SeedSequence derives random number generator states from a root entropy value and
+    a spawn key identifying its position in the tree of spawned sequences.
+
+    Fields:
+        entropy: The root entropy shared by this sequence and all of its descendants.
+        spawn_key: The path of child indices leading from the root to this sequence.
+        children_spawned: The number of children spawned from this sequence so far.
+    """
+
+    def __init__(self, entropy=None, spawn_key=()):
+        """Creates a new seed sequence.
+
+        Parameters:
+            entropy (int): The root entropy. When None, fresh entropy is read from the
+                operating system and stored in the entropy field so the run can be repeated.
+            spawn_key (tuple): The path of child indices of this sequence.
+
+        """
+        if entropy is None:
+            entropy = int.from_bytes(urandom(16), 'big')
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.children_spawned = 0
+
+    def spawn(self, count):
+        """Spawns count new child sequences. Calling spawn again yields further,
+           different children.
+
+        Parameters:
+            count (int): The number of children to spawn.
+
+        Returns:
+            The spawned child sequences.
+
+        Return type:
+            list of SeedSequence
+        """
+        children = [SeedSequence(self.entropy, self.spawn_key + (index,))
+                    for index in range(self.children_spawned, self.children_spawned + count)]
+        self.children_spawned += count
+        return children
+
+    def generate_state(self):
+        """Hashes the entropy and spawn key into a 256 bit generator state.
+
+        Returns:
+            The state for this sequence.
+
+        Return type:
+            int
+        """
+        key = repr((self.entropy, self.spawn_key)).encode('ascii')
+        return int.from_bytes(sha256(key).digest(), 'big')
+
+    def random(self):
+        """Creates a random number generator seeded from this sequence.
+
+        Returns:
+            A new random number generator.
+
+        Return type:
+            Random
+        """
+        return Random(self.generate_state())
+
+    def __repr__(self):
+        """Representation of this sequence that can be used to recreate it.
+
+        Returns:
+            String of the form 'SeedSequence(entropy, spawn_key)'
+
+        Return type:
+            str
+        """
+        return "SeedSequence(%d, %r)" % (self.entropy, self.spawn_key)
@@ -0,0 +1,274 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Sequential Simulation module.
+
+This module runs simulations on a Wheel until every requested metric is known precisely
+enough, instead of for a number of spins guessed up front. Each metric keeps a running
+mean and variance with Welford's method; after every batch the driver checks the width of
+each metric's confidence interval and stops once all of them are within the target width.
+
+Two kinds of metrics are provided:
+    SpinMetric: a value per bin, averaged over spins, e.g. the house edge of an Outcome.
+        All spin metrics are fed the same batch of spins.
+    SessionMetric: a value per played Session, e.g. whether the session was ruined.
+
+A run can be checkpointed every few batches and resumed after a crash or restart; a resumed
+run produces the same numbers as an uninterrupted one.
+"""
+
+import os
+from statistics import NormalDist
+
+from ood_checkpoint import load_checkpoint, save_checkpoint
+from ood_simulation import RunningStatistics
+
+
+class SpinMetric:
+    """
+    SpinMetric averages a value that depends only on the spun bin.
+
+    Fields:
+        name: The name of the metric.
+        values_by_bin: The value of the metric for every bin number.
+
+    """
+
+    def __init__(self, name, values_by_bin):
+        """Sets the instance name and values_by_bin from the parameters.
+
+        Parameters:
+            name (str): The name of the metric.
+            values_by_bin (sequence of float): The value of the metric for every bin number.
+
+        """
+        self.name = name
+        self.values_by_bin = list(values_by_bin)
+
+    def add_spins(self, statistics, bin_numbers):
+        """Adds the values of a batch of spins, using the batch histogram.
+
+        Parameters:
+            statistics (RunningStatistics): The statistics of the metric.
+            bin_numbers (bytes-like of int): The spun bin numbers.
+
+        """
+        spins = bytes(bin_numbers)
+        if not spins:
+            return
+        counts = [spins.count(bin_number) for bin_number in range(len(self.values_by_bin))]
+        mean = sum(count * value for count, value in zip(counts, self.values_by_bin)) / len(spins)
+        squared_deviations = sum(count * (value - mean) ** 2 for count, value in zip(counts, self.values_by_bin))
+        statistics.add_moments(len(spins), mean, squared_deviations)
+
+
+class SessionMetric:
+    """
+    SessionMetric averages a value computed from the result of a played Session.
+
+    Fields:
+        name: The name of the metric.
+        session: The Session played.
+        value: A function of the final bankroll and the number of spins played giving the
+            value of the metric.
+
+    """
+
+    def __init__(self, name, session, value):
+        """Sets the instance name, session and value from the parameters.
+
+        Parameters:
+            name (str): The name of the metric.
+            session (Session): The Session played.
+            value (callable): The value of the metric for a final bankroll and number of spins.
+
+        """
+        self.name = name
+        self.session = session
+        self.value = value
+
+    def add_sessions(self, statistics, wheel, session_count):
+        """Plays session_count sessions and adds their values.
+
+        Parameters:
+            statistics (RunningStatistics): The statistics of the metric.
+            wheel (Wheel): The wheel the sessions are played on.
+            session_count (int): The number of sessions.
+
+        Returns:
+            The number of spins played by the sessions.
+
+        Return type:
+            int
+        """
+        net_by_bin = self.session.net_by_bin(wheel)
+        total_spins = 0
+        for _ in range(session_count):
+            bankroll, spins = self.session.play(wheel, net_by_bin)
+            statistics.add(self.value(bankroll, spins))
+            total_spins += spins
+        return total_spins
+
+
+def house_edge_metric(wheel, outcome):
+    """Creates the metric of the house edge of an Outcome: the loss of a one unit bet per spin.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        outcome (Outcome): The Outcome bet on.
+
+    Return type:
+        SpinMetric
+    """
+    return SpinMetric('house edge ' + outcome.name,
+                      [-outcome.win_amount(1) if outcome in bin_ else 1 for bin_ in wheel.bins])
+
+
+def ruin_metric(session, name=None):
+    """Creates the metric of the probability that a Session ends unable to cover its bets.
+
+    Parameters:
+        session (Session): The Session played.
+        name (str): The name of the metric. When None, it is derived from the session, e.g.
+            'ruin probability Red 10 from 100 over 20 spins'.
+
+    Return type:
+        SessionMetric
+    """
+    if name is None:
+        name = 'ruin probability %s from %g over %d spins' % (
+            ', '.join('%s %g' % (outcome.name, amount) for outcome, amount in session.bets),
+            session.bankroll, session.session_length)
+    return SessionMetric(name, session, lambda bankroll, spins: float(session.is_ruined(bankroll)))
+
+
+class SequentialResult:
+    """
+    SequentialResult holds the outcome of run_until_precise.
+
+    Fields:
+        statistics: The RunningStatistics of every metric, by name.
+        half_widths: The half width of the confidence interval of every metric, by name.
+        spins: The number of spins used: the spins drawn for spin metrics plus the spins played by sessions.
+        converged: Whether every metric reached its target width.
+
+    """
+
+    def __init__(self, statistics, half_widths, spins, converged):
+        """Sets the fields from the parameters.
+
+        """
+        self.statistics = statistics
+        self.half_widths = half_widths
+        self.spins = spins
+        self.converged = converged
+
+    def __str__(self):
+        """Easy-to-read summary of the result
+
+        Returns:
+            One line per metric with its mean and confidence interval, and the spins used
+
+        Return type:
+            str
+
+        """
+        lines = ["%s: %.6f +/- %.6f" % (name, statistics.mean, self.half_widths[name])
+                 for name, statistics in self.statistics.items()]
+        lines.append("%d spins, %s" % (self.spins, 'converged' if self.converged else 'not converged'))
+        return "\n".join(lines)
+
+
+def run_until_precise(wheel, metrics, target_width, confidence=0.95, batch_size=10000, max_spins=10 ** 9,
+                      min_count=30, checkpoint_path=None, checkpoint_every=10):
+    """Simulates batches of spins and sessions until the confidence interval of every metric
+    is no wider than its target width.
+
+    Parameters:
+        wheel (Wheel): The populated wheel.
+        metrics (list): The SpinMetric and SessionMetric instances to estimate.
+        target_width (float or dict): The largest acceptable full width of the confidence
+            intervals, either for all metrics or by metric name.
+        confidence (float): The confidence level of the intervals.
+        batch_size (int): The number of spins per batch; session metrics play about as many
+            spins per batch.
+        max_spins (int): Stop after about this many spins even if not converged.
+        min_count (int): The smallest number of samples per metric before stopping.
+        checkpoint_path (str): If given, the run resumes from this checkpoint file when it
+            exists, saves it every checkpoint_every batches and when stopping unconverged,
+            and removes it once converged. Resuming needs the same wheel, metrics and batch size.
+        checkpoint_every (int): The number of batches between checkpoints.
+
+    Returns:
+        The statistics of every metric and the number of spins used.
+
+    Return type:
+        SequentialResult
+
+    Raises:
+        ValueError: If two metrics have the same name, or the checkpoint file was written for other metrics.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    statistics = {metric.name: RunningStatistics() for metric in metrics}
+    if len(statistics) != len(metrics):
+        names = [metric.name for metric in metrics]
+        raise ValueError("metric names must be unique, got %s more than once"
+                         % sorted({name for name in names if names.count(name) > 1}))
+    spins = 0
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        random_state, spins, saved_statistics = load_checkpoint(checkpoint_path)
+        if set(saved_statistics) != set(statistics):
+            raise ValueError("%s was written for the metrics %s" % (checkpoint_path, sorted(saved_statistics)))
+        wheel.random_number_generator.setstate(random_state)
+        statistics.update(saved_statistics)
+    spin_metrics = [metric for metric in metrics if isinstance(metric, SpinMetric)]
+    session_metrics = [metric for metric in metrics if isinstance(metric, SessionMetric)]
+
+    def target(name):
+        """
+        Helper function to return the target width of the metric with the given name
+
+        """
+        return target_width[name] if isinstance(target_width, dict) else target_width
+
+    batches = 0
+    while True:
+        if spin_metrics:
+            bin_numbers = wheel.next_wheel_bins(batch_size)
+            spins += batch_size
+            for metric in spin_metrics:
+                metric.add_spins(statistics[metric.name], bin_numbers)
+        for metric in session_metrics:
+            session_count = max(1, batch_size // metric.session.session_length)
+            spins += metric.add_sessions(statistics[metric.name], wheel, session_count)
+
+        half_widths = {name: z * metric_statistics.standard_error for name, metric_statistics in statistics.items()}
+        converged = all(metric_statistics.count >= min_count and 2 * half_widths[name] <= target(name)
+                        for name, metric_statistics in statistics.items())
+        batches += 1
+        if checkpoint_path is not None:
+            if converged:
+                if os.path.exists(checkpoint_path):
+                    os.remove(checkpoint_path)
+            elif spins >= max_spins or batches % checkpoint_every == 0:
+                save_checkpoint(checkpoint_path, wheel.random_number_generator.getstate(), spins, statistics)
+        if converged or spins >= max_spins:
+            return SequentialResult(statistics, half_widths, spins, converged)
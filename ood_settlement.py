@@ -0,0 +1,140 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Settlement module.
+
+This module contains the BetBatch class, which settles all of the bets of a round at once.
+Bets are grouped by Outcome as they are added, keyed by the Outcome's name, so each distinct
+Outcome is tested against the winning Bin only once. Every bet is then settled in a single
+pass by multiplying its amount by the result of its group.
+"""
+
+from array import array
+
+
+class BetBatch:
+    """
+    BetBatch holds the bets of one round in columns: the player, the Outcome group and the
+    amount of every bet.
+
+    Fields:
+        outcomes: The distinct Outcomes bet on, one per group.
+        players: The player of every bet.
+        groups: The group of every bet, an index into outcomes.
+        amounts: The amount of every bet.
+
+    """
+
+    def __init__(self):
+        """Creates an empty batch.
+
+        """
+        self.outcomes = []
+        self.players = []
+        self.groups = array('L')
+        self.amounts = array('d')
+        self._groups_by_name = {}
+
+    def add_bet(self, player, outcome, amount):
+        """Adds a bet to the batch.
+
+        Parameters:
+            player: The player placing the bet, any hashable value.
+            outcome (Outcome): The Outcome bet on.
+            amount (float): The amount bet.
+
+        """
+        group = self._groups_by_name.get(outcome.name)
+        if group is None:
+            group = self._groups_by_name[outcome.name] = len(self.outcomes)
+            self.outcomes.append(outcome)
+        self.players.append(player)
+        self.groups.append(group)
+        self.amounts.append(amount)
+
+    def add_bets(self, bets):
+        """Adds many bets to the batch.
+
+        Parameter:
+            bets (iterable of tuple): The player, Outcome and amount of every bet.
+
+        """
+        for player, outcome, amount in bets:
+            self.add_bet(player, outcome, amount)
+
+    def __len__(self):
+        """The number of bets in the batch.
+
+        Return type:
+            int
+
+        """
+        return len(self.amounts)
+
+    def bet_results(self, winning_bin):
+        """Settles every bet against the winning Bin.
+
+        Parameter:
+            winning_bin (Bin): The Bin selected by the spin.
+
+        Returns:
+            The net amount won by every bet, in the order the bets were added.
+
+        Return type:
+            array of floats
+        """
+        factors = [outcome.odds if outcome in winning_bin else -1 for outcome in self.outcomes]
+        return array('d', [amount * factors[group] for group, amount in zip(self.groups, self.amounts)])
+
+    def settle(self, winning_bin):
+        """Settles every bet against the winning Bin and totals the results per player.
+
+        Parameter:
+            winning_bin (Bin): The Bin selected by the spin.
+
+        Returns:
+            The net amount won by every player.
+
+        Return type:
+            dict
+        """
+        payouts = {}
+        for player, result in zip(self.players, self.bet_results(winning_bin)):
+            payouts[player] = payouts.get(player, 0.0) + result
+        return payouts
+
+
+def settle_bets(winning_bin, bets):
+    """Settles a batch of (player, Outcome, amount) bets against the winning Bin.
+
+    Parameters:
+        winning_bin (Bin): The Bin selected by the spin.
+        bets (iterable of tuple): The player, Outcome and amount of every bet.
+
+    Returns:
+        The net amount won by every player.
+
+    Return type:
+        dict
+    """
+    batch = BetBatch()
+    batch.add_bets(bets)
+    return batch.settle(winning_bin)
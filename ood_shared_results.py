@@ -0,0 +1,355 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Shared Results module.
+
+This module plays Sessions across worker processes that write their results straight
+into one block of shared memory instead of pickling them back to the parent.
+The block holds four tables, each with one row per worker so that workers never contend:
+    counters: sessions played, spins played and sessions ruined (uint64)
+    bin hits: the number of times every bin was spun while a session was in play (uint64)
+    payouts: the net amount won by the session's bets on every Outcome of the wheel's
+        PayoutMatrix (double)
+    bankroll histogram: the number of sessions ending in every bankroll bucket (uint64)
+The tables are sized from the wheel layout and its PayoutMatrix. The parent process merges
+the rows by reading them through memoryviews of the shared block, without copying it.
+"""
+
+import os
+from array import array
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+
+from ood_seed_sequence import SeedSequence
+from ood_simulation import chunk_wheel, session_chunks
+from ood_wheel import default_wheel
+from ood_wheel_layout import AMERICAN
+
+COUNTERS = ('sessions', 'spins', 'ruined')
+HIT_BUFFER_SIZE = 1 << 16
+
+
+class SharedResults:
+    """
+    SharedResults is a block of shared memory holding one row of result tables per worker.
+    Pickling a SharedResults and unpickling it in another process attaches to the same block.
+
+    Fields:
+        worker_count: The number of rows of every table.
+        bin_count: The number of columns of the bin hits table.
+        outcome_count: The number of columns of the payouts table.
+        bucket_count: The number of columns of the bankroll histogram.
+        shared_memory: The SharedMemory block.
+        counters, bin_hits, payouts, bankroll_histogram: Flat memoryviews of the tables, row after row.
+
+    """
+
+    def __init__(self, worker_count, bin_count, outcome_count, bucket_count, name=None):
+        """Creates a zeroed block, or attaches to the block called name.
+
+        Parameters:
+            worker_count (int): The number of workers.
+            bin_count (int): The number of bins of the wheel.
+            outcome_count (int): The number of Outcomes of the wheel.
+            bucket_count (int): The number of buckets of the bankroll histogram.
+            name (str): The name of an existing block to attach to.
+
+        """
+        self.worker_count = worker_count
+        self.bin_count = bin_count
+        self.outcome_count = outcome_count
+        self.bucket_count = bucket_count
+        widths = (len(COUNTERS), bin_count, outcome_count, bucket_count)
+        size = 8 * worker_count * sum(widths)
+        self.shared_memory = SharedMemory(name=name, create=name is None, size=size)
+        if name is None:
+            self.shared_memory.buf[:size] = bytes(size)
+
+        views = []
+        offset = 0
+        for width, typecode in zip(widths, 'QQdQ'):
+            views.append(self.shared_memory.buf[offset:offset + 8 * worker_count * width].cast(typecode))
+            offset += 8 * worker_count * width
+        self.counters, self.bin_hits, self.payouts, self.bankroll_histogram = views
+
+    def __reduce__(self):
+        """Pickles as an attachment to the same block."""
+        return type(self), (self.worker_count, self.bin_count, self.outcome_count, self.bucket_count,
+                            self.shared_memory.name)
+
+    def row(self, table, worker):
+        """Returns the row of one worker in a table, as a memoryview of the shared block.
+
+        Parameters:
+            table (memoryview): One of the tables.
+            worker (int): The index of the worker.
+
+        Return type:
+            memoryview
+        """
+        width = len(table) // self.worker_count
+        return table[worker * width:(worker + 1) * width]
+
+    def totals(self, table):
+        """Adds up the rows of a table, reading the shared block in place.
+
+        Parameter:
+            table (memoryview): One of the tables.
+
+        Returns:
+            The column sums.
+
+        Return type:
+            array
+        """
+        width = len(table) // self.worker_count
+        return array(table.format, [sum(table[column::width]) for column in range(width)])
+
+    def close(self):
+        """Releases the views and detaches from the block."""
+        for view in (self.counters, self.bin_hits, self.payouts, self.bankroll_histogram):
+            view.release()
+        self.shared_memory.close()
+
+    def unlink(self):
+        """Frees the block. Called once, by the process that created it."""
+        self.shared_memory.unlink()
+
+    def __enter__(self):
+        """Returns the shared tables, for use in a with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Releases the views and detaches from the block."""
+        self.close()
+
+
+class AggregatedResults:
+    """
+    AggregatedResults holds the merged tables of a run_shared_sessions run.
+
+    Fields:
+        sessions: The number of sessions played.
+        spins: The number of spins played.
+        ruined: The number of sessions ending with a bankroll no longer covering the bets.
+        bin_hits: The number of times every bin was spun, indexed by bin number.
+        payouts: The net amount won on every Outcome, by Outcome name.
+        bankroll_histogram: The number of sessions ending in every bankroll bucket.
+        bucket_edges: The lower edge of every bucket followed by the upper edge of the last one.
+
+    """
+
+    def __init__(self, counters, bin_hits, payouts, bankroll_histogram, bucket_edges):
+        """Sets the fields from the parameters.
+
+        """
+        self.sessions, self.spins, self.ruined = counters
+        self.bin_hits = bin_hits
+        self.payouts = payouts
+        self.bankroll_histogram = bankroll_histogram
+        self.bucket_edges = bucket_edges
+
+    @property
+    def ruin_probability(self):
+        """The fraction of sessions that ended with a bankroll no longer covering the bets.
+
+        Return type:
+            float
+
+        """
+        return self.ruined / self.sessions if self.sessions else 0.0
+
+
+class _HitCounter:
+    """
+    _HitCounter counts the bins spun by sessions, holding at most HIT_BUFFER_SIZE uncounted spins.
+
+    Fields:
+        counts: The number of times every bin was counted.
+        spins: The number of spins counted.
+
+    """
+
+    def __init__(self, bin_count):
+        """Creates a counter with zero counts.
+
+        Parameter:
+            bin_count (int): The number of bins of the wheel.
+
+        """
+        self.counts = [0] * bin_count
+        self.spins = 0
+        self._buffer = bytearray()
+
+    def extend(self, bin_numbers):
+        """Adds the spun bin numbers, counting the buffer once it is full.
+
+        Parameter:
+            bin_numbers (array of unsigned bytes): The bin numbers.
+
+        """
+        self._buffer += bin_numbers
+        if len(self._buffer) >= HIT_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Counts the buffered spins."""
+        buffer = self._buffer
+        for bin_number in range(len(self.counts)):
+            self.counts[bin_number] += buffer.count(bin_number)
+        self.spins += len(buffer)
+        self._buffer = bytearray()
+
+    def take(self):
+        """Counts the buffered spins and returns the counts, starting again from zero.
+
+        Returns:
+            The number of times every bin was spun and the number of spins.
+
+        Return type:
+            tuple
+        """
+        self.flush()
+        counts, spins = self.counts, self.spins
+        self.counts = [0] * len(counts)
+        self.spins = 0
+        return counts, spins
+
+
+def aggregate_sessions(results, worker, session, chunks, layout, bankroll_range):
+    """Plays chunks of sessions and adds their results to the worker's rows of the shared tables.
+    Each chunk is played on its own wheel, built by chunk_wheel as play_sessions does.
+
+    Parameters:
+        results (SharedResults): The shared tables.
+        worker (int): The index of the worker.
+        session (Session): The session played.
+        chunks (list of tuple): The session count and SeedSequence of every chunk.
+        layout (WheelLayout): The layout of the wheel.
+        bankroll_range (tuple): The lowest and highest bankroll covered by the histogram.
+
+    """
+    counters = results.row(results.counters, worker)
+    bin_hits = results.row(results.bin_hits, worker)
+    payouts = results.row(results.payouts, worker)
+    histogram = results.row(results.bankroll_histogram, worker)
+    low, high = bankroll_range
+    bucket_width = (high - low) / results.bucket_count
+    last_bucket = results.bucket_count - 1
+    hit_counter = _HitCounter(results.bin_count)
+
+    for session_count, seed_sequence in chunks:
+        wheel = chunk_wheel(seed_sequence, layout)
+        payout_matrix = wheel.payout_matrix()
+        stakes = payout_matrix.stakes(session.bets)
+        net_by_bin = session.net_by_bin(wheel)
+
+        ruined = 0
+        for _ in range(session_count):
+            bankroll, _ = session.play(wheel, net_by_bin, hit_counter)
+            ruined += session.is_ruined(bankroll)
+            histogram[min(max(int((bankroll - low) / bucket_width), 0), last_bucket)] += 1
+
+        hits, spins = hit_counter.take()
+        counters[0] += session_count
+        counters[1] += spins
+        counters[2] += ruined
+        for bin_number, count in enumerate(hits):
+            bin_hits[bin_number] += count
+        for column, stake in enumerate(stakes):
+            if stake:
+                payouts[column] += stake * sum(count * row[column] for count, row in zip(hits, payout_matrix.rows))
+
+    for view in (counters, bin_hits, payouts, histogram):
+        view.release()
+
+
+def _aggregate_in_worker(results, worker, *arguments):
+    """Runs aggregate_sessions in a worker process and detaches from the shared block."""
+    with results:
+        aggregate_sessions(results, worker, *arguments)
+
+
+def run_shared_sessions(session, session_count, seed=None, processes=None, layout=AMERICAN, chunk_size=1000,
+                        bucket_count=100, bankroll_range=None):
+    """Plays session_count independent sessions across worker processes aggregating into shared memory.
+
+    Parameters:
+        session (Session): The session played.
+        session_count (int): The number of sessions.
+        seed (int or SeedSequence): The seed of the run. When None, fresh entropy is used.
+        processes (int): The number of worker processes, the number of CPUs when None.
+            With one process the sessions are played in the calling process.
+        layout (WheelLayout): The layout of the wheel.
+        chunk_size (int): The number of sessions played on each spawned stream.
+        bucket_count (int): The number of buckets of the bankroll histogram.
+        bankroll_range (tuple): The lowest and highest bankroll covered by the histogram,
+            from zero to the largest reachable bankroll when None. Bankrolls outside the
+            range are counted in the first or last bucket.
+
+    Returns:
+        The merged results of all sessions.
+
+    Return type:
+        AggregatedResults
+
+    Raises:
+        ValueError: If processes or bucket_count is not positive, or bankroll_range is empty.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1 or bucket_count < 1:
+        raise ValueError("processes and bucket_count must be positive")
+    wheel = default_wheel(layout)
+    outcomes = wheel.payout_matrix().outcomes
+    if bankroll_range is None:
+        bankroll_range = (0, session.bankroll + max(max(session.net_by_bin(wheel)), 0) * session.session_length)
+    if not bankroll_range[0] < bankroll_range[1]:
+        raise ValueError("bankroll_range must have its lowest bankroll below its highest, got %r" % (bankroll_range,))
+
+    seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    chunks = session_chunks(session_count, seed_sequence, chunk_size)
+
+    results = SharedResults(processes, layout.bin_count, len(outcomes), bucket_count)
+    try:
+        if processes == 1:
+            aggregate_sessions(results, 0, session, chunks, layout, bankroll_range)
+        else:
+            workers = [Process(target=_aggregate_in_worker,
+                               args=(results, worker, session, chunks[worker::processes], layout, bankroll_range))
+                       for worker in range(processes)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            failed = [worker.exitcode for worker in workers if worker.exitcode]
+            if failed:
+                raise RuntimeError("worker processes exited with codes %s" % failed)
+
+        payouts = results.totals(results.payouts)
+        low, high = bankroll_range
+        bucket_edges = [low + (high - low) * bucket / bucket_count for bucket in range(bucket_count + 1)]
+        return AggregatedResults(results.totals(results.counters), results.totals(results.bin_hits),
+                                 {outcome.name: payout for outcome, payout in zip(outcomes, payouts)},
+                                 results.totals(results.bankroll_histogram), bucket_edges)
+    finally:
+        results.close()
+        results.unlink()
@@ -0,0 +1,460 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Simulation module.
+
+This module contains the Session, RunningStatistics and SessionStatistics classes and the
+run_sessions function.
+A Session describes a player sitting at a wheel with a bankroll and placing the same bets
+every spin. run_sessions plays many independent Sessions, spread over a pool of worker
+processes, and aggregates their results into SessionStatistics.
+Sessions are played in fixed size chunks, each drawing from its own stream spawned from
+the run's SeedSequence, so the result of a seeded run does not depend on the number of
+processes.
+"""
+
+from array import array
+from math import sqrt
+from multiprocessing import Pool
+
+from ood_bin_builder import BinBuilder
+from ood_seed_sequence import SeedSequence
+from ood_wheel import Wheel
+from ood_wheel_layout import AMERICAN
+
+SPIN_CHUNK_SIZE = 4096
+
+
+class Session:
+    """
+    Session contains the parameters of a player's session at the wheel.
+
+    Fields:
+        bankroll: Holds the amount the player starts with.
+        bets: Holds the (Outcome, amount) pairs placed on every spin.
+        session_length: Holds the maximum number of spins played.
+
+    """
+
+    def __init__(self, bankroll, bets, session_length):
+        """Sets the instance bankroll, bets and session_length from the parameters.
+
+        Parameters:
+            bankroll (float): The amount the player starts with.
+            bets (list of tuple): The Outcome and amount of every bet placed on each spin.
+            session_length (int): The maximum number of spins played.
+
+        """
+        self.bankroll = bankroll
+        self.bets = list(bets)
+        self.session_length = session_length
+
+    def net_by_bin(self, wheel):
+        """Settles the bets of one spin against every Bin of a populated wheel.
+
+        Parameter:
+            wheel (Wheel): The wheel the session is played on.
+
+        Returns:
+            The net amount won by the bets, indexed by bin number.
+
+        Return type:
+            array of floats
+        """
+        payout_matrix = wheel.payout_matrix()
+        return payout_matrix.settle_spins(range(len(wheel.bins)), payout_matrix.stakes(self.bets))
+
+    @property
+    def total_stake(self):
+        """The amount bet on every spin.
+
+        Return type:
+            float
+
+        """
+        return sum(amount for _, amount in self.bets)
+
+    def is_ruined(self, bankroll):
+        """Whether a bankroll no longer covers the bets, which ends the session.
+
+        Parameter:
+            bankroll (float): The bankroll.
+
+        Return type:
+            bool
+        """
+        return bankroll < self.total_stake
+
+    def play(self, wheel, net_by_bin=None, played_bins=None, bankrolls=None):
+        """Plays the session on a populated wheel. The session ends after session_length spins,
+        or earlier when the bankroll no longer covers the bets. Spins are drawn in chunks of at
+        most SPIN_CHUNK_SIZE, so a long session that is ruined early does not draw all its spins.
+
+        Parameters:
+            wheel (Wheel): The wheel to spin.
+            net_by_bin (array of floats): The result of net_by_bin(wheel), computed when None.
+                Pass it in when playing many sessions on the same wheel.
+            played_bins (bytearray, array of unsigned bytes or any object with an extend method):
+                When given, it is extended with the numbers of the Bins spun while the session was
+                in play, one chunk at a time.
+            bankrolls (array of floats): When given, it is extended with the bankroll after
+                every spin played.
+
+        Returns:
+            The final bankroll and the number of spins played.
+
+        Return type:
+            tuple
+        """
+        if net_by_bin is None:
+            net_by_bin = self.net_by_bin(wheel)
+        total_stake = self.total_stake
+
+        bankroll = self.bankroll
+        spins = 0
+        while spins < self.session_length and bankroll >= total_stake:
+            chunk_start = spins
+            bin_numbers = wheel.next_wheel_bins(min(self.session_length - spins, SPIN_CHUNK_SIZE))
+            if bankrolls is None:
+                for bin_number in bin_numbers:
+                    if bankroll < total_stake:
+                        break
+                    bankroll += net_by_bin[bin_number]
+                    spins += 1
+            else:
+                chunk_bankrolls = array('d')
+                for bin_number in bin_numbers:
+                    if bankroll < total_stake:
+                        break
+                    bankroll += net_by_bin[bin_number]
+                    chunk_bankrolls.append(bankroll)
+                spins += len(chunk_bankrolls)
+                bankrolls.extend(chunk_bankrolls)
+            if played_bins is not None:
+                played_bins.extend(bin_numbers[:spins - chunk_start])
+        return bankroll, spins
+
+
+class RunningStatistics:
+    """
+    RunningStatistics keeps the count, mean and variance of a stream of values with
+    Welford's method. Two RunningStatistics can be merged.
+
+    Fields:
+        count: The number of values.
+        mean: The mean of the values.
+
+    """
+
+    def __init__(self):
+        """Creates empty statistics.
+
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._squared_deviations = 0.0
+
+    def add(self, value):
+        """Adds one value.
+
+        Parameter:
+            value (float): The value.
+
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squared_deviations += delta * (value - self.mean)
+
+    @classmethod
+    def from_moments(cls, count, mean, squared_deviations):
+        """Creates statistics from the moments returned by moments.
+
+        Parameters:
+            count (int): The number of values.
+            mean (float): The mean of the values.
+            squared_deviations (float): The sum of the squared deviations from the mean.
+
+        Return type:
+            RunningStatistics
+        """
+        statistics = cls()
+        statistics.count = count
+        statistics.mean = mean
+        statistics._squared_deviations = squared_deviations
+        return statistics
+
+    def moments(self):
+        """Returns the count, mean and sum of the squared deviations from the mean.
+
+        Return type:
+            tuple
+        """
+        return self.count, self.mean, self._squared_deviations
+
+    def merge(self, other):
+        """Adds the values accumulated by other.
+
+        Parameter:
+            other (RunningStatistics): The statistics to merge into these.
+
+        """
+        self.add_moments(other.count, other.mean, other._squared_deviations)
+
+    def add_moments(self, count, mean, squared_deviations):
+        """Adds a batch of values given by its moments.
+
+        Parameters:
+            count (int): The number of values in the batch.
+            mean (float): The mean of the batch.
+            squared_deviations (float): The sum of the squared deviations from the batch mean.
+
+        """
+        total_count = self.count + count
+        if total_count == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * count / total_count
+        self._squared_deviations += squared_deviations + delta * delta * self.count * count / total_count
+        self.count = total_count
+
+    @property
+    def variance(self):
+        """The sample variance of the values.
+
+        Return type:
+            float
+
+        """
+        return self._squared_deviations / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def standard_error(self):
+        """The standard error of the mean.
+
+        Return type:
+            float
+
+        """
+        return sqrt(self.variance / self.count) if self.count else 0.0
+
+
+class SessionStatistics:
+    """
+    SessionStatistics accumulates the results of many sessions. The final bankroll is kept
+    in a RunningStatistics, and two SessionStatistics can be merged.
+
+    Fields:
+        bankroll: The RunningStatistics of the final bankroll.
+        ruined: The number of sessions that ended with a bankroll no longer covering the bets.
+        spins: The total number of spins played.
+
+    """
+
+    def __init__(self):
+        """Creates empty statistics.
+
+        """
+        self.bankroll = RunningStatistics()
+        self.ruined = 0
+        self.spins = 0
+
+    def add(self, bankroll, spins, ruined):
+        """Adds the result of one session.
+
+        Parameters:
+            bankroll (float): The final bankroll of the session.
+            spins (int): The number of spins played.
+            ruined (bool): Whether the final bankroll no longer covers the bets.
+
+        """
+        self.bankroll.add(bankroll)
+        self.ruined += ruined
+        self.spins += spins
+
+    def merge(self, other):
+        """Adds the sessions accumulated by other.
+
+        Parameter:
+            other (SessionStatistics): The statistics to merge into these.
+
+        """
+        self.bankroll.merge(other.bankroll)
+        self.ruined += other.ruined
+        self.spins += other.spins
+
+    @property
+    def count(self):
+        """The number of sessions.
+
+        Return type:
+            int
+
+        """
+        return self.bankroll.count
+
+    @property
+    def mean_bankroll(self):
+        """The mean final bankroll.
+
+        Return type:
+            float
+
+        """
+        return self.bankroll.mean
+
+    @property
+    def bankroll_variance(self):
+        """The sample variance of the final bankroll.
+
+        Return type:
+            float
+
+        """
+        return self.bankroll.variance
+
+    @property
+    def bankroll_standard_error(self):
+        """The standard error of the mean final bankroll.
+
+        Return type:
+            float
+
+        """
+        return self.bankroll.standard_error
+
+    @property
+    def ruin_probability(self):
+        """The fraction of sessions that ended with a bankroll no longer covering the bets.
+
+        Return type:
+            float
+
+        """
+        return self.ruined / self.count if self.count else 0.0
+
+    def __str__(self):
+        """Easy-to-read summary of these statistics
+
+        Returns:
+            String with the session count, mean bankroll, its standard error and the ruin probability
+
+        Return type:
+            str
+
+        """
+        return "%d sessions: bankroll %.2f +/- %.2f, ruin %.4f" % (
+            self.count, self.mean_bankroll, self.bankroll_standard_error, self.ruin_probability)
+
+
+def session_chunks(session_count, seed_sequence, chunk_size):
+    """Splits session_count sessions into chunks, each played on its own spawned stream.
+
+    Parameters:
+        session_count (int): The number of sessions.
+        seed_sequence (SeedSequence): The seed of the run.
+        chunk_size (int): The largest number of sessions of a chunk.
+
+    Returns:
+        The session count and SeedSequence of every chunk.
+
+    Return type:
+        list of tuple
+    """
+    chunk_counts = [min(chunk_size, session_count - start) for start in range(0, session_count, chunk_size)]
+    return list(zip(chunk_counts, seed_sequence.spawn(len(chunk_counts))))
+
+
+def chunk_wheel(seed_sequence, layout=AMERICAN):
+    """Builds the wheel the sessions of a chunk are played on.
+
+    Parameters:
+        seed_sequence (SeedSequence): The seed of the chunk.
+        layout (WheelLayout): The layout of the wheel.
+
+    Return type:
+        Wheel
+    """
+    wheel = Wheel(seed_sequence, bin_count=layout.bin_count)
+    BinBuilder(layout=layout).build_bins(wheel)
+    return wheel
+
+
+def play_sessions(session, session_count, seed_sequence, layout=AMERICAN):
+    """Plays session_count sessions on one wheel seeded from seed_sequence.
+
+    Parameters:
+        session (Session): The session played.
+        session_count (int): The number of sessions.
+        seed_sequence (SeedSequence): The seed of the wheel.
+        layout (WheelLayout): The layout of the wheel.
+
+    Returns:
+        The statistics of the sessions.
+
+    Return type:
+        SessionStatistics
+    """
+    wheel = chunk_wheel(seed_sequence, layout)
+    net_by_bin = session.net_by_bin(wheel)
+    statistics = SessionStatistics()
+    for _ in range(session_count):
+        bankroll, spins = session.play(wheel, net_by_bin)
+        statistics.add(bankroll, spins, session.is_ruined(bankroll))
+    return statistics
+
+
+def _play_chunk(arguments):
+    """Unpacks the arguments of play_sessions for Pool.map."""
+    return play_sessions(*arguments)
+
+
+def run_sessions(session, session_count, seed=None, processes=None, layout=AMERICAN, chunk_size=1000):
+    """Plays session_count independent sessions across a pool of worker processes.
+
+    Parameters:
+        session (Session): The session played.
+        session_count (int): The number of sessions.
+        seed (int or SeedSequence): The seed of the run. When None, fresh entropy is used.
+        processes (int): The number of worker processes, the number of CPUs when None.
+            With one process the sessions are played in the calling process.
+        layout (WheelLayout): The layout of the wheel.
+        chunk_size (int): The number of sessions played on each spawned stream.
+
+    Returns:
+        The aggregated statistics of all sessions.
+
+    Return type:
+        SessionStatistics
+    """
+    seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    chunks = [(session, count, chunk_seed_sequence, layout)
+              for count, chunk_seed_sequence in session_chunks(session_count, seed_sequence, chunk_size)]
+    if processes == 1:
+        results = [_play_chunk(chunk) for chunk in chunks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(_play_chunk, chunks)
+
+    statistics = SessionStatistics()
+    for result in results:
+        statistics.merge(result)
+    return statistics
@@ -0,0 +1,318 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Spin Log module.
+
+This module contains the SpinRecorder and SpinReplay classes.
+A SpinRecorder wraps a Wheel and appends every spin to a binary log as a fixed width
+record: sequence number (uint64), RNG stream id (uint32) and bin number (uint8), padded
+to 16 bytes, little endian. Records are buffered and written in bulk. Recording does not
+change the spins: the wheel draws exactly as it would unrecorded. A recorder reopening a
+log continues the sequence numbers of its stream.
+A SpinReplay memory-maps a log and serves the recorded spins back through the same
+next_wheel_bin and next_wheel_bins methods as a Wheel, so settlement can be re-run
+deterministically.
+"""
+
+import mmap
+import os
+import sys
+from array import array
+from struct import Struct
+
+RECORD = Struct('<QIB3x')
+BIN_OFFSET = 12
+SCAN_RECORDS = 4096
+
+
+def next_sequence(path, stream_id):
+    """Returns the sequence number following the last record of a stream in a log, scanning
+    the log backwards from its end.
+
+    Parameters:
+        path (str): The log file.
+        stream_id (int): The stream.
+
+    Returns:
+        One more than the last sequence number of the stream, zero when the log is missing
+        or holds no record of the stream.
+
+    Return type:
+        int
+    """
+    try:
+        log = open(path, 'rb')
+    except FileNotFoundError:
+        return 0
+    with log:
+        end = log.seek(0, os.SEEK_END) // RECORD.size * RECORD.size
+        while end > 0:
+            start = max(end - SCAN_RECORDS * RECORD.size, 0)
+            log.seek(start)
+            records = list(RECORD.iter_unpack(log.read(end - start)))
+            for sequence, record_stream_id, _ in reversed(records):
+                if record_stream_id == stream_id:
+                    return sequence + 1
+            end = start
+    return 0
+
+
+class SpinRecorder:
+    """
+    SpinRecorder spins a Wheel and records every spin in an append-only log.
+
+    Fields:
+        wheel: The Wheel being spun.
+        bins: The Bins of the wheel.
+        stream_id: The id written in every record, e.g. the worker or table number.
+        sequence: The sequence number of the next spin.
+
+    """
+
+    def __init__(self, wheel, path, stream_id=0, first_sequence=None, buffer_size=1 << 16):
+        """Opens the log at path for appending.
+
+        Parameters:
+            wheel (Wheel): The Wheel to spin.
+            path (str): The log file, created if it does not exist.
+            stream_id (int): The id written in every record.
+            first_sequence (int): The sequence number of the first recorded spin. When None,
+                the sequence continues from the last record of stream_id in the log.
+            buffer_size (int): The number of bytes buffered before they are written.
+
+        """
+        self.wheel = wheel
+        self.bins = wheel.bins
+        self.stream_id = stream_id
+        self.sequence = next_sequence(path, stream_id) if first_sequence is None else first_sequence
+        self._bin_numbers = {}
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._log = open(path, 'ab')
+
+    def _append(self, bin_numbers):
+        """Buffers one record per bin number, writing the buffer when it is full."""
+        count = len(bin_numbers)
+        sequence = self.sequence
+        if sys.byteorder == 'little':
+            records = bytearray(count * RECORD.size)
+            memoryview(records).cast('Q')[0::2] = array('Q', range(sequence, sequence + count))
+            memoryview(records).cast('I')[2::4] = array('I', [self.stream_id]) * count
+            records[BIN_OFFSET::RECORD.size] = bytes(bin_numbers)
+        else:
+            pack = RECORD.pack
+            records = b''.join([pack(sequence + index, self.stream_id, bin_number)
+                                for index, bin_number in enumerate(bin_numbers)])
+        self._buffer += records
+        self.sequence = sequence + count
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def next_wheel_bin(self):
+        """Spins the wheel once with its next_wheel_bin and records the spin.
+
+        Returns:
+            The selected Bin.
+
+        Return type:
+            Bin
+        """
+        bin_ = self.wheel.next_wheel_bin()
+        bin_number = self._bin_numbers.get(id(bin_))
+        if bin_number is None or self.bins[bin_number] is not bin_:
+            self._bin_numbers = {id(wheel_bin): number for number, wheel_bin in enumerate(self.bins)}
+            bin_number = self._bin_numbers[id(bin_)]
+        self._append((bin_number,))
+        return bin_
+
+    def next_wheel_bins(self, count):
+        """Spins the wheel count times and records the spins.
+
+        Parameters:
+            count (int): The number of spins.
+
+        Returns:
+            The numbers of the selected Bins.
+
+        Return type:
+            array of unsigned bytes
+        """
+        bin_numbers = self.wheel.next_wheel_bins(count)
+        self._append(bin_numbers)
+        return bin_numbers
+
+    def get_wheel_bin(self, bin_number):
+        """Returns the given Bin of the wheel.
+
+        Parameters:
+            bin_number (int): The bin number.
+
+        Return type:
+            Bin
+        """
+        return self.bins[bin_number]
+
+    def flush(self):
+        """Writes the buffered records to the log.
+
+        """
+        self._log.write(self._buffer)
+        self._log.flush()
+        self._buffer = bytearray()
+
+    def close(self):
+        """Writes the buffered records and closes the log.
+
+        """
+        if not self._log.closed:
+            self.flush()
+            self._log.close()
+
+    def __enter__(self):
+        """Returns the recorder, for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Writes the buffered records and closes the log."""
+        self.close()
+
+
+class SpinReplay:
+    """
+    SpinReplay serves the spins of a log, in order, as a source of spins for the Bins of a Wheel.
+
+    Fields:
+        bins: The Bins of the wheel the spins are replayed on.
+        position: The index of the next record served.
+
+    """
+
+    def __init__(self, wheel, path, stream_id=None):
+        """Memory-maps the log at path.
+
+        Parameters:
+            wheel (Wheel): The Wheel, with the same Bins as the recorded one.
+            path (str): The log file.
+            stream_id (int): Only replay the records of this stream, all records when None.
+
+        """
+        self.bins = wheel.bins
+        self.position = 0
+        with open(path, 'rb') as log:
+            size = log.seek(0, 2)
+            self._log = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        record_count = len(self._log) // RECORD.size
+        if stream_id is None:
+            self._bin_numbers = None
+            self._record_count = record_count
+        else:
+            self._bin_numbers = array('B', (bin_number for _, record_stream_id, bin_number in self.records()
+                                            if record_stream_id == stream_id))
+            self._record_count = len(self._bin_numbers)
+
+    def __len__(self):
+        """The number of spins that can be replayed.
+
+        Return type:
+            int
+
+        """
+        return self._record_count
+
+    def records(self):
+        """Iterates over every record of the log.
+
+        The records are unpacked from the memory-mapped log SCAN_RECORDS at a time, so the
+        log is never copied as a whole.
+
+        Returns:
+            The sequence number, stream id and bin number of every record.
+
+        Return type:
+            iterator of tuple
+        """
+        end = (len(self._log) // RECORD.size) * RECORD.size
+        block_size = SCAN_RECORDS * RECORD.size
+        for start in range(0, end, block_size):
+            yield from RECORD.iter_unpack(self._log[start:min(start + block_size, end)])
+
+    def next_wheel_bins(self, count):
+        """Returns the next count recorded spins.
+
+        Parameters:
+            count (int): The number of spins.
+
+        Returns:
+            The numbers of the recorded Bins.
+
+        Return type:
+            array of unsigned bytes
+
+        Raises:
+            EOFError: If fewer than count spins are left.
+        """
+        start = self.position
+        if start + count > self._record_count:
+            raise EOFError("Only %d recorded spins are left" % (self._record_count - start))
+        self.position = start + count
+        if self._bin_numbers is not None:
+            return self._bin_numbers[start:start + count]
+        return array('B', self._log[start * RECORD.size + BIN_OFFSET:(start + count) * RECORD.size:RECORD.size])
+
+    def next_wheel_bin(self):
+        """Returns the Bin of the next recorded spin.
+
+        Returns:
+            The recorded Bin.
+
+        Return type:
+            Bin
+
+        Raises:
+            EOFError: If all spins have been replayed.
+        """
+        return self.bins[self.next_wheel_bins(1)[0]]
+
+    def get_wheel_bin(self, bin_number):
+        """Returns the given Bin of the wheel.
+
+        Parameters:
+            bin_number (int): The bin number.
+
+        Return type:
+            Bin
+        """
+        return self.bins[bin_number]
+
+    def close(self):
+        """Unmaps the log.
+
+        """
+        if isinstance(self._log, mmap.mmap):
+            self._log.close()
+
+    def __enter__(self):
+        """Returns the replay, for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Unmaps the log."""
+        self.close()
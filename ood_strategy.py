@@ -0,0 +1,225 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Strategy module.
+
+This module contains the betting strategies and the StrategyEvaluator class.
+The StrategyEvaluator plays a betting strategy for thousands of players at once. The
+state of every player (bankroll, current stake and streak) is kept in arrays, one
+entry per player, and each spin advances all of the players in a single step over
+those arrays.
+"""
+
+from array import array
+
+
+class FlatBetting:
+    """
+    FlatBetting stakes the base stake on every spin.
+
+    """
+
+    def reset(self, player_count, base_stake):
+        """Prepares the strategy for player_count players.
+
+        Parameters:
+            player_count (int): The number of players.
+            base_stake (float): The stake of the first bet.
+
+        """
+        self.base_stake = base_stake
+
+    def next_stakes(self, stakes, won):
+        """Computes the stakes of the next spin.
+
+        Parameters:
+            stakes (array of floats): The stakes of the last spin.
+            won (bytes): 1 for every player whose last bet won, 0 otherwise.
+
+        Returns:
+            The stakes of the next spin, before table and bankroll limits.
+
+        Return type:
+            array of floats
+        """
+        return array('d', [self.base_stake]) * len(stakes)
+
+
+class Martingale(FlatBetting):
+    """
+    Martingale doubles the stake after every loss and returns to the base stake after a win.
+
+    """
+
+    def next_stakes(self, stakes, won):
+        """Computes the stakes of the next spin.
+
+        Parameters:
+            stakes (array of floats): The stakes of the last spin.
+            won (bytes): 1 for every player whose last bet won, 0 otherwise.
+
+        Returns:
+            The stakes of the next spin, before table and bankroll limits.
+
+        Return type:
+            array of floats
+        """
+        base_stake = self.base_stake
+        return array('d', [base_stake if player_won else 2 * stake for stake, player_won in zip(stakes, won)])
+
+
+class Fibonacci(FlatBetting):
+    """
+    Fibonacci stakes the base stake times a Fibonacci number, moving one step up the
+    sequence after a loss and two steps down after a win.
+
+    Fields:
+        levels: The position of every player in the Fibonacci sequence.
+
+    """
+
+    def reset(self, player_count, base_stake):
+        """Prepares the strategy for player_count players.
+
+        Parameters:
+            player_count (int): The number of players.
+            base_stake (float): The stake of the first bet.
+
+        """
+        self.base_stake = base_stake
+        self.levels = array('l', bytes(player_count * array('l').itemsize))
+        self._stakes_by_level = [base_stake, base_stake]
+
+    def next_stakes(self, stakes, won):
+        """Computes the stakes of the next spin.
+
+        Parameters:
+            stakes (array of floats): The stakes of the last spin.
+            won (bytes): 1 for every player whose last bet won, 0 otherwise.
+
+        Returns:
+            The stakes of the next spin, before table and bankroll limits.
+
+        Return type:
+            array of floats
+        """
+        self.levels = levels = array('l', [max(level - 2, 0) if player_won else level + 1
+                                           for level, player_won in zip(self.levels, won)])
+        stakes_by_level = self._stakes_by_level
+        highest_level = max(levels, default=0)
+        while len(stakes_by_level) <= highest_level:
+            stakes_by_level.append(stakes_by_level[-1] + stakes_by_level[-2])
+        return array('d', [stakes_by_level[level] for level in levels])
+
+
+class StrategyEvaluator:
+    """
+    StrategyEvaluator plays a betting strategy on one Outcome for many players, each
+    spinning their own wheel.
+
+    Fields:
+        bankrolls: The bankroll of every player.
+        stakes: The stake of every player on the next spin, 0 for players out of the game.
+        streaks: The current streak of every player, positive for wins and negative for losses.
+        spins: The number of spins played so far.
+
+    """
+
+    def __init__(self, wheel, outcome, strategy, player_count, bankroll, base_stake, table_limit=None):
+        """Creates the evaluator with every player holding bankroll and staking base_stake.
+
+        Parameters:
+            wheel (Wheel): The populated wheel spun by every player.
+            outcome (Outcome): The Outcome bet on, e.g. Red or a dozen.
+            strategy (FlatBetting): The betting strategy.
+            player_count (int): The number of players.
+            bankroll (float): The starting bankroll of every player.
+            base_stake (float): The first stake, and the smallest stake a player may place.
+            table_limit (float): The largest stake allowed, None for no limit.
+
+        """
+        self.wheel = wheel
+        self.odds = outcome.odds
+        winning_bins = bytearray(len(wheel.bins))
+        for bin_number in wheel.get_outcome_bins(outcome):
+            winning_bins[bin_number] = 1
+        self.winning_bins = bytes(winning_bins)
+        self.strategy = strategy
+        self.base_stake = base_stake
+        self.table_limit = table_limit
+        self.bankrolls = array('d', [bankroll]) * player_count
+        self.stakes = array('d', [base_stake if bankroll >= base_stake else 0.0]) * player_count
+        self.streaks = array('l', bytes(player_count * array('l').itemsize))
+        self.spins = 0
+        strategy.reset(player_count, base_stake)
+
+    def step(self):
+        """Spins one wheel per player and settles every player's bet, then computes the
+        stakes of the next spin. Players who cannot cover the base stake drop out.
+
+        """
+        winning_bins = self.winning_bins
+        won = bytes([winning_bins[bin_number] for bin_number in self.wheel.next_wheel_bins(len(self.stakes))])
+        odds = self.odds
+        self.bankrolls = bankrolls = array('d', [bankroll + odds * stake if player_won else bankroll - stake
+                                                 for bankroll, stake, player_won in zip(self.bankrolls, self.stakes, won)])
+        self.streaks = array('l', [streak if not stake else
+                                   (streak + 1 if streak > 0 else 1) if player_won else (streak - 1 if streak < 0 else -1)
+                                   for streak, stake, player_won in zip(self.streaks, self.stakes, won)])
+
+        stakes = self.strategy.next_stakes(self.stakes, won)
+        if self.table_limit is not None:
+            table_limit = self.table_limit
+            stakes = [stake if stake < table_limit else table_limit for stake in stakes]
+        base_stake = self.base_stake
+        self.stakes = array('d', [0.0 if old_stake == 0 or bankroll < base_stake else min(stake, bankroll)
+                                  for old_stake, stake, bankroll in zip(self.stakes, stakes, bankrolls)])
+        self.spins += 1
+
+    def run(self, spin_count):
+        """Advances all of the players by spin_count spins.
+
+        Parameter:
+            spin_count (int): The number of spins.
+
+        """
+        for _ in range(spin_count):
+            self.step()
+
+    @property
+    def active_players(self):
+        """The number of players still in the game.
+
+        Return type:
+            int
+
+        """
+        return len(self.stakes) - self.stakes.count(0.0)
+
+    @property
+    def mean_bankroll(self):
+        """The mean bankroll over all players.
+
+        Return type:
+            float
+
+        """
+        return sum(self.bankrolls) / len(self.bankrolls) if self.bankrolls else 0.0
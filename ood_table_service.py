@@ -0,0 +1,229 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Table Service module.
+
+This module contains the Table and TableService classes and the load_test client.
+A TableService runs many virtual tables on one asyncio event loop. Every table has its
+own Wheel, spawned from a single built wheel so all tables share one immutable layout.
+Players place bets on a table and await the result; every round_interval the service
+closes betting on all tables, spins each table once and settles its bets as a batch.
+"""
+
+import asyncio
+
+from ood_bin_builder import BinBuilder
+from ood_settlement import BetBatch
+from ood_wheel import Wheel
+from ood_wheel_layout import AMERICAN
+
+
+class Table:
+    """
+    Table collects the bets of one round and settles them against a spin of its Wheel.
+
+    Fields:
+        table_id: The number of the table.
+        wheel: The Wheel of the table.
+        rounds: The number of rounds played.
+
+    """
+
+    def __init__(self, table_id, wheel):
+        """Creates a table with no bets.
+
+        Parameters:
+            table_id (int): The number of the table.
+            wheel (Wheel): The populated Wheel of the table.
+
+        """
+        self.table_id = table_id
+        self.wheel = wheel
+        self.rounds = 0
+        self._bets = BetBatch()
+        self._futures = []
+
+    def place_bet(self, player, outcome, amount):
+        """Places a bet on the next round.
+
+        Parameters:
+            player: The player placing the bet.
+            outcome (Outcome): The Outcome bet on.
+            amount (float): The amount bet.
+
+        Returns:
+            A future resolved with the net amount won by the bet once the round is played.
+
+        Return type:
+            asyncio.Future
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._bets.add_bet(player, outcome, amount)
+        self._futures.append(future)
+        return future
+
+    def play_round(self):
+        """Closes betting, spins the wheel, settles the bets as one batch and resolves the
+        future of every bet.
+
+        Returns:
+            The winning Bin.
+
+        Return type:
+            Bin
+        """
+        bets, futures = self._bets, self._futures
+        self._bets, self._futures = BetBatch(), []
+        winning_bin = self.wheel.next_wheel_bin()
+        for future, result in zip(futures, bets.bet_results(winning_bin)):
+            if not future.done():
+                future.set_result(result)
+        self.rounds += 1
+        return winning_bin
+
+    def cancel_bets(self):
+        """Cancels the bets placed on a round that will not be played.
+
+        """
+        futures = self._futures
+        self._bets, self._futures = BetBatch(), []
+        for future in futures:
+            future.cancel()
+
+
+class TableService:
+    """
+    TableService plays rounds on many tables from one event loop.
+
+    Fields:
+        tables: The tables, indexed by table_id.
+        round_interval: The number of seconds between rounds.
+        rounds: The number of rounds played.
+        total_latency: The sum over all rounds of the seconds from the round's deadline
+            until every table was settled.
+        max_latency: The longest such latency.
+
+    """
+
+    def __init__(self, table_count, round_interval=0.1, seed=None, layout=AMERICAN, registry=None):
+        """Builds one Wheel with the given layout and spawns a Wheel for every table.
+
+        Parameters:
+            table_count (int): The number of tables.
+            round_interval (float): The number of seconds between rounds.
+            seed (int or SeedSequence): The seed of the service, fresh entropy when None.
+            layout (WheelLayout): The layout of the wheels.
+            registry (OutcomeRegistry): The registry the Outcomes are taken from.
+
+        """
+        wheel = Wheel(seed, bin_count=layout.bin_count)
+        BinBuilder(registry, layout).build_bins(wheel)
+        self.tables = [Table(table_id, table_wheel) for table_id, table_wheel in enumerate(wheel.spawn(table_count))]
+        self.round_interval = round_interval
+        self.rounds = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def place_bet(self, table_id, player, outcome, amount):
+        """Places a bet on the next round of a table.
+
+        Parameters:
+            table_id (int): The number of the table.
+            player: The player placing the bet.
+            outcome (Outcome): The Outcome bet on.
+            amount (float): The amount bet.
+
+        Returns:
+            A future resolved with the net amount won by the bet.
+
+        Return type:
+            asyncio.Future
+        """
+        return self.tables[table_id].place_bet(player, outcome, amount)
+
+    async def run(self, round_count):
+        """Plays round_count rounds on every table, one every round_interval seconds.
+        Bets still open afterwards are cancelled.
+
+        Parameter:
+            round_count (int): The number of rounds.
+
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        try:
+            for _ in range(round_count):
+                deadline += self.round_interval
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+                for table in self.tables:
+                    table.play_round()
+                latency = loop.time() - deadline
+                self.rounds += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+        finally:
+            for table in self.tables:
+                table.cancel_bets()
+
+    @property
+    def mean_latency(self):
+        """The mean number of seconds from a round's deadline until every table was settled.
+
+        Return type:
+            float
+
+        """
+        return self.total_latency / self.rounds if self.rounds else 0.0
+
+
+async def _play(service, table_id, player, outcome, amount, round_count):
+    """Bets amount on outcome at one table every round, returning the player's net result."""
+    net = 0.0
+    try:
+        for _ in range(round_count):
+            net += await service.place_bet(table_id, player, outcome, amount)
+    except asyncio.CancelledError:
+        pass
+    return net
+
+
+async def load_test(service, outcome_name, players_per_table, round_count, amount=1):
+    """Runs the service with players_per_table players betting on every table every round.
+
+    Parameters:
+        service (TableService): The service under test.
+        outcome_name (str): The name of the Outcome every player bets on, e.g. 'Red'.
+        players_per_table (int): The number of players at every table.
+        round_count (int): The number of rounds played.
+        amount (float): The amount of every bet.
+
+    Returns:
+        The net result of every player, by table and player number.
+
+    Return type:
+        dict
+    """
+    outcome = service.tables[0].wheel.get_outcome(outcome_name)
+    players = [(table.table_id, player) for table in service.tables for player in range(players_per_table)]
+    results = await asyncio.gather(service.run(round_count),
+                                   *[_play(service, table_id, player, outcome, amount, round_count)
+                                     for table_id, player in players])
+    return dict(zip(players, results[1:]))
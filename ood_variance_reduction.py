@@ -0,0 +1,189 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Variance Reduction module.
+
+This module compares Sessions, i.e. betting strategies, on the same wheel with fewer spins
+than independent runs need. Every replicate plays each Session once and the spins fed to
+the Sessions are chosen by a mode:
+    INDEPENDENT: every Session spins its own stream; the baseline.
+    COMMON: common random numbers, every Session of a replicate sees the same spins, so
+        the noise of the spins largely cancels out of the differences between Sessions.
+    ANTITHETIC: common random numbers, with replicates in pairs where the second replicate
+        spins bin_count - 1 - k wherever the first spun k. Effective for bets that are
+        monotone in the bin number, such as Low/High or the dozens.
+    STRATIFIED: common random numbers, with replicates in blocks of bin_count where every
+        bin is spun exactly once at each spin position of the block.
+Antithetic pairs and stratified blocks are not made of independent replicates, so the
+statistics record one mean per pair or block; their standard errors remain valid.
+"""
+
+from array import array
+
+from ood_simulation import RunningStatistics
+
+INDEPENDENT = 'independent'
+COMMON = 'common'
+ANTITHETIC = 'antithetic'
+STRATIFIED = 'stratified'
+MODES = (INDEPENDENT, COMMON, ANTITHETIC, STRATIFIED)
+
+
+class _Spins:
+    """A source of spins serving a prepared sequence of bin numbers to Session.play."""
+
+    def __init__(self, bin_numbers):
+        """Sets the prepared spins, served from the first one.
+
+        Parameter:
+            bin_numbers (array of unsigned bytes): The spins to serve, in order.
+
+        """
+        self.bin_numbers = bin_numbers
+        self.position = 0
+
+    def next_wheel_bins(self, count):
+        """Serves the next count prepared spins, fewer when the spins run out.
+
+        Parameter:
+            count (int): The number of spins.
+
+        Returns:
+            The next bin numbers.
+
+        Return type:
+            array of unsigned bytes
+        """
+        bin_numbers = self.bin_numbers[self.position:self.position + count]
+        self.position += count
+        return bin_numbers
+
+
+class ComparisonResult:
+    """
+    ComparisonResult holds the outcome of compare_sessions.
+
+    Fields:
+        mode: The mode of the comparison.
+        bankrolls: The RunningStatistics of the final bankroll of every Session.
+        differences: The RunningStatistics of the final bankroll of every Session minus that
+            of the first Session, within the same replicate.
+        spins: The number of spins used: drawn for the shared sequences, or played by the Sessions in
+            INDEPENDENT mode.
+
+    """
+
+    def __init__(self, mode, session_count):
+        """Creates an empty result for session_count Sessions.
+
+        Parameters:
+            mode (str): The mode of the comparison.
+            session_count (int): The number of Sessions compared.
+
+        """
+        self.mode = mode
+        self.bankrolls = [RunningStatistics() for _ in range(session_count)]
+        self.differences = [RunningStatistics() for _ in range(session_count)]
+        self.spins = 0
+
+    def add(self, bankrolls):
+        """Adds the final bankrolls of one replicate, or the mean bankrolls of an antithetic pair
+        or a stratified block.
+
+        Parameter:
+            bankrolls (list of float): The final bankroll of every Session.
+
+        """
+        for statistics, bankroll in zip(self.bankrolls, bankrolls):
+            statistics.add(bankroll)
+        for statistics, bankroll in zip(self.differences, bankrolls):
+            statistics.add(bankroll - bankrolls[0])
+
+
+def _stratified_block(wheel, bin_count, length):
+    """Draws bin_count spin sequences of the given length in which every bin appears once per position."""
+    random_number_generator = wheel.random_number_generator
+    columns = []
+    for _ in range(length):
+        column = list(range(bin_count))
+        random_number_generator.shuffle(column)
+        columns.append(column)
+    return [array('B', [column[row] for column in columns]) for row in range(bin_count)]
+
+
+def compare_sessions(wheel, sessions, replicate_count, mode=COMMON):
+    """Plays every Session replicate_count times with the spins chosen by mode.
+
+    Parameters:
+        wheel (Wheel): The populated wheel providing the spins.
+        sessions (list of Session): The Sessions compared.
+        replicate_count (int): The number of times every Session is played. It is rounded up
+            to an even number in ANTITHETIC mode and to a multiple of the number of bins in
+            STRATIFIED mode.
+        mode (str): One of MODES.
+
+    Returns:
+        The statistics of the final bankrolls and of their differences.
+
+    Return type:
+        ComparisonResult
+
+    Raises:
+        ValueError: If mode is not one of MODES.
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown variance reduction mode %r" % mode)
+    bin_count = len(wheel.bins)
+    length = max(session.session_length for session in sessions)
+    net_by_bin = [session.net_by_bin(wheel) for session in sessions]
+    result = ComparisonResult(mode, len(sessions))
+
+    def play(spins):
+        """
+        Helper function to play every Session on the same prepared spins, returning the final bankrolls
+
+        """
+        return [session.play(_Spins(spins), nets)[0] for session, nets in zip(sessions, net_by_bin)]
+
+    if mode == INDEPENDENT:
+        for _ in range(replicate_count):
+            outcomes = [session.play(wheel, nets) for session, nets in zip(sessions, net_by_bin)]
+            result.add([bankroll for bankroll, _ in outcomes])
+            result.spins += sum(spins for _, spins in outcomes)
+    elif mode == COMMON:
+        for _ in range(replicate_count):
+            result.add(play(wheel.next_wheel_bins(length)))
+        result.spins = length * replicate_count
+    elif mode == ANTITHETIC:
+        reflection = bytes(range(bin_count - 1, -1, -1)).ljust(256, b'\0')
+        for _ in range((replicate_count + 1) // 2):
+            spins = wheel.next_wheel_bins(length)
+            first = play(spins)
+            second = play(array('B', spins.tobytes().translate(reflection)))
+            result.add([(first_bankroll + second_bankroll) / 2
+                        for first_bankroll, second_bankroll in zip(first, second)])
+        result.spins = length * ((replicate_count + 1) // 2)
+    else:
+        for _ in range(-(-replicate_count // bin_count)):
+            block = [play(spins) for spins in _stratified_block(wheel, bin_count, length)]
+            result.add([sum(bankrolls) / bin_count for bankrolls in zip(*block)])
+            result.spins += length * bin_count
+    return result
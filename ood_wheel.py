@@ -24,42 +24,150 @@ The Wheel module.
 This module contains the Wheel class
 The wheel has two responsibilities: it is a container for the Bins
 and it picks one Bin at random.
+The ConcurrentWheel class is a Wheel that can be shared between threads.
+The default_wheel function returns a shared, frozen wheel per layout, built on first use.
 """
 
-from os import urandom
-from random import Random
+from array import array
+from threading import Lock, local
+from time import perf_counter
+
+import ood_instrumentation
 from ood_bin import Bin
+from ood_payout_matrix import PayoutMatrix
+from ood_seed_sequence import SeedSequence
+
+
+class _DerivedTables:
+    """
+    _DerivedTables holds the tables computed from the Bins of a wheel. It is shared by a
+    wheel and the wheels spawned from it, which share its Bins, so that a change to the Bins
+    through any of them invalidates the tables of all of them.
+
+    Fields:
+        payout_matrix: The PayoutMatrix of the Bins, or None until computed.
+        outcomes_by_name: The Outcomes in the Bins by name, or None until computed.
+        bins_by_outcome: The bin numbers containing every Outcome, or None until computed.
+    """
+
+    def __init__(self):
+        """Creates empty tables."""
+        self.clear()
+
+    def clear(self):
+        """Drops the tables after the Bins have changed."""
+        self.payout_matrix = None
+        self.outcomes_by_name = None
+        self.bins_by_outcome = None
 
 
 class Wheel:
     """
-    Wheel contains the 38 individual bins on a Roulette wheel, plus a random number generator.
+    Wheel contains the individual bins on a Roulette wheel, 38 by default, plus a random number generator.
     It can select a Bin at random, simulating a spin of the Roulette wheel.
 
     Fields:
         bins: Contains the individual Bin instances.
-        rng:  A random number generator to use to select a Bin from the bins collection.
+        bin_class: The Bin class, Bin or BitsetBin, used for the bins.
+        seed_sequence: The SeedSequence the random number generator was seeded from.
+        random_number_generator: A random number generator to use to select a Bin from the bins collection.
     """
 
-    def __init__(self):
-        """Creates a new wheel with 38 empty Bins.
+    def __init__(self, seed=None, bin_class=Bin, bin_count=38):
+        """Creates a new wheel with bin_count empty Bins.
            It will also create a new random number generator instance.
 
+        Parameters:
+            seed(int or SeedSequence) – the seed of the random number generator. When None,
+            the wheel is seeded from fresh operating system entropy.
+            bin_class(type) – the Bin class used for the bins, Bin or BitsetBin.
+            bin_count(int) – the number of bins, 38 for an American wheel.
         """
-        self.bins = [Bin() for _ in range(38)]
-        self.random_number_generator = Random()
+        self.bin_class = bin_class
+        self.bins = [bin_class() for _ in range(bin_count)]
+        self.seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+        self.random_number_generator = self.seed_sequence.random()
+        self._derived_tables = _DerivedTables()
+
+    def spawn(self, count):
+        """Creates count wheels sharing the Bins of this wheel, each with an independent
+           random number generator spawned from this wheel's seed sequence. A change to the
+           Bins through any of the wheels is seen by all of them.
+
+        Parameters:
+            count(int) – the number of wheels to create, typically one per worker.
+
+        Returns:
+            The new wheels.
+
+        Return type:
+            list of Wheel
+        """
+        wheels = []
+        for seed_sequence in self._spawn_seed_sequences(count):
+            wheel = type(self)(seed_sequence, self.bin_class, len(self.bins))
+            wheel.bins = self.bins
+            wheel._derived_tables = self._derived_tables
+            wheels.append(wheel)
+        return wheels
+
+    def _spawn_seed_sequences(self, count):
+        """Spawns count child seed sequences from the seed sequence of this wheel."""
+        return self.seed_sequence.spawn(count)
 
     def add_outcome_to_wheel_bin(self, bin_number, outcome):
         """Adds the given Outcome to the Bin with the given number.
 
         Parameters:
-            bin_number(int) – bin number, in the range zero to 37 inclusive.
+            bin_number(int) – bin number, in the range zero to the number of bins - 1.
             outcome(Outcome) – The Outcome to add to this Bin
+
+        Raises:
+            ValueError: If the wheel is frozen.
         """
-        self.bins[bin_number] |= Bin({outcome})
+        self._check_not_frozen()
+        self.bins[bin_number] = self.bin_class(self.bins[bin_number] | {outcome})
+        self._clear_derived_tables()
+
+    def load_wheel_bins(self, bin_outcomes):
+        """Replaces all Bins at once, freezing each collection of Outcomes into a Bin exactly once.
+
+        Parameters:
+            bin_outcomes(list of iterable of Outcome) – the Outcomes of every Bin, indexed by bin number.
+
+        Raises:
+            ValueError: If the wheel is frozen.
+        """
+        self._check_not_frozen()
+        self.bins[:] = [self.bin_class(outcomes) for outcomes in bin_outcomes]
+        self._clear_derived_tables()
+
+    @property
+    def frozen(self):
+        """Whether the Bins of this wheel can no longer be changed.
+
+        Return type:
+            bool
+        """
+        return isinstance(self.bins, tuple)
+
+    def freeze(self):
+        """Makes the Bins of this wheel, and of the wheels spawned from it afterwards, immutable.
+
+        """
+        self.bins = tuple(self.bins)
+
+    def _check_not_frozen(self):
+        """Raises a ValueError if the wheel is frozen."""
+        if self.frozen:
+            raise ValueError("The Bins of a frozen wheel cannot be changed")
+
+    def _clear_derived_tables(self):
+        """Drops the tables computed from the Bins, for every wheel sharing them, after the Bins have changed."""
+        self._derived_tables.clear()
 
     def next_wheel_bin(self):
-        """Generates a random number between  0 and 37, and returns the randomly selected Bin.
+        """Generates a random number between 0 and the number of bins - 1, and returns the randomly selected Bin.
 
         Returns:
             A Bin selected at random from the wheel.
@@ -67,14 +175,43 @@ class Wheel:
         Return type:
              Bin
         """
-        self.random_number_generator.seed(urandom(20))
-        return self.random_number_generator.choice(self.bins)
+        instrumentation = ood_instrumentation.instrumentation
+        if instrumentation is None:
+            return self.random_number_generator.choice(self.bins)
+        start = perf_counter()
+        bin_number = self.random_number_generator.choice(range(len(self.bins)))
+        instrumentation.record_time('next_wheel_bin', perf_counter() - start)
+        instrumentation.count_spins((bin_number,))
+        return self.bins[bin_number]
+
+    def next_wheel_bins(self, count):
+        """Spins the wheel count times and returns the numbers of the selected Bins.
+           All spins are drawn from a single stream of the random number generator,
+           which is not reseeded between spins.
+
+        Parameters:
+            count(int) – the number of spins.
+
+        Returns:
+            The bin numbers selected at random, in the order they were spun.
+
+        Return type:
+            array of unsigned bytes
+        """
+        instrumentation = ood_instrumentation.instrumentation
+        if instrumentation is None:
+            return array('B', self.random_number_generator.choices(range(len(self.bins)), k=count))
+        start = perf_counter()
+        bin_numbers = array('B', self.random_number_generator.choices(range(len(self.bins)), k=count))
+        instrumentation.record_time('next_wheel_bins', perf_counter() - start)
+        instrumentation.count_spins(bin_numbers)
+        return bin_numbers
 
     def get_wheel_bin(self, bin_number):
         """Returns the given Bin from the internal collection.
 
         Parameters:
-            bin_number(int) – bin number, in the range zero to 37 inclusive.
+            bin_number(int) – bin number, in the range zero to the number of bins - 1.
 
         Returns:
             The requested Bin.
@@ -83,3 +220,149 @@ class Wheel:
             Bin
         """
         return self.bins[bin_number]
+
+    def payout_matrix(self):
+        """Returns the payout matrix of the populated Bins, computing it on first use.
+
+        Returns:
+            The net result of a unit bet on every Outcome for every Bin.
+
+        Return type:
+            PayoutMatrix
+        """
+        derived_tables = self._derived_tables
+        if derived_tables.payout_matrix is None:
+            derived_tables.payout_matrix = PayoutMatrix(self.bins)
+        return derived_tables.payout_matrix
+
+    def _build_outcome_indexes(self):
+        """Builds the name and reverse indexes of the Outcomes in the Bins."""
+        bins_by_outcome = {}
+        for bin_number, bin_ in enumerate(self.bins):
+            for outcome in bin_:
+                bins_by_outcome.setdefault(outcome, []).append(bin_number)
+        self._derived_tables.bins_by_outcome = {outcome: tuple(bin_numbers)
+                                                for outcome, bin_numbers in bins_by_outcome.items()}
+        self._derived_tables.outcomes_by_name = {outcome.name: outcome for outcome in bins_by_outcome}
+
+    def get_outcome(self, name):
+        """Returns the Outcome with the given name from the populated Bins.
+
+        Parameters:
+            name(str) – the name of the Outcome, e.g. 'Red' or '{1 - 2 - 4 - 5}'.
+
+        Returns:
+            The Outcome.
+
+        Return type:
+            Outcome
+
+        Raises:
+            KeyError: If no Bin contains an Outcome with that name.
+        """
+        if self._derived_tables.outcomes_by_name is None:
+            self._build_outcome_indexes()
+        return self._derived_tables.outcomes_by_name[name]
+
+    def get_outcome_bins(self, outcome):
+        """Returns the numbers of the Bins that contain the given Outcome.
+
+        Parameters:
+            outcome(Outcome) – the Outcome.
+
+        Returns:
+            The bin numbers in increasing order, empty if no Bin contains the Outcome.
+
+        Return type:
+            tuple of int
+        """
+        if self._derived_tables.bins_by_outcome is None:
+            self._build_outcome_indexes()
+        return self._derived_tables.bins_by_outcome.get(outcome, ())
+
+
+class ConcurrentWheel(Wheel):
+    """
+    ConcurrentWheel is a Wheel whose random number generator is per thread. Every thread
+    spinning the wheel draws from its own generator, spawned from the wheel's seed sequence
+    the first time the thread spins, so threads share the immutable Bins without locking.
+    The thread that creates the wheel uses the generator of the seed sequence itself.
+
+    Fields:
+        random_number_generator: The random number generator of the calling thread.
+    """
+
+    def __init__(self, seed=None, bin_class=Bin, bin_count=38):
+        """Creates a new wheel with bin_count empty Bins.
+
+        Parameters:
+            seed(int or SeedSequence) – the seed from which the generators of all threads are derived.
+            bin_class(type) – the Bin class used for the bins, Bin or BitsetBin.
+            bin_count(int) – the number of bins, 38 for an American wheel.
+        """
+        self._thread_state = local()
+        self._spawn_lock = Lock()
+        super().__init__(seed, bin_class, bin_count)
+
+    @property
+    def random_number_generator(self):
+        """The random number generator of the calling thread, created on its first use.
+
+        Return type:
+            Random
+        """
+        try:
+            return self._thread_state.random_number_generator
+        except AttributeError:
+            seed_sequence = self._spawn_seed_sequences(1)[0]
+            self._thread_state.random_number_generator = seed_sequence.random()
+            return self._thread_state.random_number_generator
+
+    @random_number_generator.setter
+    def random_number_generator(self, random_number_generator):
+        """Replaces the random number generator of the calling thread.
+
+        Parameters:
+            random_number_generator(Random) – the new generator.
+        """
+        self._thread_state.random_number_generator = random_number_generator
+
+    def _spawn_seed_sequences(self, count):
+        """Spawns count child seed sequences under the lock also taken by threads spinning for
+           the first time, so that no two generators get the same spawn key."""
+        with self._spawn_lock:
+            return self.seed_sequence.spawn(count)
+
+
+_default_wheels = {}
+_default_wheels_lock = Lock()
+
+
+def default_wheel(layout=None):
+    """Returns the shared default wheel of a layout, building it the first time it is requested.
+       The wheel is a frozen ConcurrentWheel, so threads can spin it directly; call spawn() on it
+       for wheels with their own, seedable streams.
+
+    Parameters:
+        layout(WheelLayout) – the layout of the wheel, the American layout when None.
+
+    Returns:
+        The populated, frozen wheel.
+
+    Return type:
+        ConcurrentWheel
+    """
+    from ood_bin_builder import BinBuilder
+    from ood_wheel_layout import AMERICAN
+
+    layout = AMERICAN if layout is None else layout
+    wheel = _default_wheels.get(layout)
+    if wheel is None:
+        with _default_wheels_lock:
+            wheel = _default_wheels.get(layout)
+            if wheel is None:
+                wheel = ConcurrentWheel(bin_count=layout.bin_count)
+                BinBuilder(layout=layout).build_bins(wheel)
+                wheel.freeze()
+                _default_wheels[layout] = wheel
+    return wheel
@@ -0,0 +1,75 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+The Wheel Layout module.
+
+This module contains the WheelLayout class and the layouts of the common table variants.
+A layout describes a wheel as data: the numbers 1 to 36 laid out in 12 rows of 3
+columns, the zero pockets, the red numbers and the families of bets offered.
+The BinBuilder compiles a layout into the Bins of a Wheel.
+"""
+
+from collections import namedtuple
+
+ALL_BET_FAMILIES = ('straight', 'split', 'street', 'corner', 'line', 'dozen', 'column', 'money', 'zero')
+
+RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+
+
+class WheelLayout(namedtuple('WheelLayout', ['name', 'zeros', 'red_numbers', 'bet_families'])):
+    """
+    WheelLayout is an immutable, hashable description of a Roulette table variant.
+
+    Fields:
+        name: Holds the name of the layout.
+        zeros: Holds the names of the zero pockets. The first zero is bin 0, the others
+            follow the numbers, starting at bin 37.
+        red_numbers: Holds the numbers coloured red.
+        bet_families: Holds the names of the families of bets offered, from ALL_BET_FAMILIES.
+
+    """
+
+    __slots__ = ()
+
+    @property
+    def bin_count(self):
+        """The number of bins of the wheel: 36 numbers plus the zeros.
+
+        Return type:
+            int
+
+        """
+        return 36 + len(self.zeros)
+
+    @property
+    def zero_bin_numbers(self):
+        """The bin numbers of the zeros, in the order of the zeros field.
+
+        Return type:
+            tuple of int
+
+        """
+        return (0,) + tuple(range(37, 36 + len(self.zeros)))
+
+
+AMERICAN = WheelLayout('American', ('0', '00'), RED_NUMBERS, ALL_BET_FAMILIES)
+EUROPEAN = WheelLayout('European', ('0',), RED_NUMBERS, ALL_BET_FAMILIES)
+TRIPLE_ZERO = WheelLayout('Triple zero', ('0', '00', '000'), RED_NUMBERS, ALL_BET_FAMILIES)
@@ -0,0 +1,161 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Benchmark module for the core hot paths
+
+Times building the bins of a wheel, spinning, looking up bins, Bin membership tests and
+Outcome hashing and equality. Results are given in nanoseconds per operation and can be
+saved as a JSON baseline, or compared with a saved baseline to flag regressions.
+
+Usage, from the test directory with the package on PYTHONPATH:
+    python ood_benchmark.py --save baseline.json
+    python ood_benchmark.py --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+import timeit
+
+from ood_bin import BitsetBin
+from ood_bin_builder import BinBuilder, compile_layout
+from ood_outcome import Outcome, outcome_registry
+from ood_wheel import Wheel
+
+
+def _build_bins_uncached():
+    """Builds a wheel after clearing the compiled layout cache."""
+    compile_layout.cache_clear()
+    BinBuilder().build_bins(Wheel())
+
+
+def benchmarks():
+    """Creates the benchmarked operations.
+
+    Returns:
+        The name, operation and number of calls per run of every benchmark.
+
+    Return type:
+        list of tuple
+    """
+    wheel = Wheel(1)
+    BinBuilder().build_bins(wheel)
+    bitset_wheel = Wheel(1, BitsetBin)
+    BinBuilder().build_bins(bitset_wheel)
+    red = outcome_registry.get_outcome('Red', 1)
+    black = outcome_registry.get_outcome('Black', 1)
+    other_red = Outcome('Red', 1)
+    bin_ = wheel.get_wheel_bin(5)
+    bitset_bin = bitset_wheel.get_wheel_bin(5)
+    outcome_names = [outcome.name for outcome in outcome_registry.outcomes]
+
+    return [
+        ('build_bins', _build_bins_uncached, 20),
+        ('build_bins_cached', lambda: BinBuilder().build_bins(Wheel()), 200),
+        ('next_wheel_bin', wheel.next_wheel_bin, 100000),
+        ('next_wheel_bins_per_spin', lambda: wheel.next_wheel_bins(100000), 1, 100000),
+        ('get_wheel_bin', lambda: wheel.get_wheel_bin(17), 100000),
+        ('bin_contains', lambda: red in bin_, 100000),
+        ('bitset_bin_wins', lambda: bitset_bin.wins(17), 100000),
+        ('outcome_hash', lambda: hash(red), 100000),
+        ('outcome_equal', lambda: red == other_red, 100000),
+        ('outcome_not_equal', lambda: red != black, 100000),
+        ('outcome_set_of_all', lambda: {Outcome(name, 1) for name in outcome_names}, 100, len(outcome_names)),
+    ]
+
+
+def run_benchmarks(repeat=5):
+    """Times every benchmark, keeping the best of repeat runs.
+
+    Parameter:
+        repeat (int): The number of timed runs of every benchmark.
+
+    Returns:
+        The nanoseconds per operation of every benchmark.
+
+    Return type:
+        dict
+    """
+    results = {}
+    for benchmark in benchmarks():
+        name, operation, number = benchmark[:3]
+        operations_per_call = benchmark[3] if len(benchmark) > 3 else 1
+        best = min(timeit.repeat(operation, number=number, repeat=repeat))
+        results[name] = best * 1e9 / (number * operations_per_call)
+    return results
+
+
+def compare(baseline, results, threshold):
+    """Finds the benchmarks that are slower than the baseline by more than threshold.
+
+    Parameters:
+        baseline (dict): The nanoseconds per operation of the baseline.
+        results (dict): The nanoseconds per operation of the current run.
+        threshold (float): The allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        The name, baseline and current time of every regression.
+
+    Return type:
+        list of tuple
+    """
+    return [(name, baseline[name], results[name]) for name in sorted(results)
+            if name in baseline and results[name] > baseline[name] * (1 + threshold)]
+
+
+def main(arguments=None):
+    """Runs the benchmarks from the command line.
+
+    Returns:
+        The exit status: 1 when a regression is found, 0 otherwise.
+
+    Return type:
+        int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--save', metavar='FILE', help='save the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results with a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown (default 0.2)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs of every benchmark (default 5)')
+    options = parser.parse_args(arguments)
+
+    results = run_benchmarks(options.repeat)
+    baseline = {}
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    for name, nanoseconds in results.items():
+        if name in baseline:
+            print("%-26s %12.1f ns %+8.1f%%" % (name, nanoseconds, 100 * (nanoseconds / baseline[name] - 1)))
+        else:
+            print("%-26s %12.1f ns" % (name, nanoseconds))
+    if options.save:
+        with open(options.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+    regressions = compare(baseline, results, options.threshold)
+    for name, baseline_nanoseconds, nanoseconds in regressions:
+        print("REGRESSION %s: %.1f ns -> %.1f ns" % (name, baseline_nanoseconds, nanoseconds))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the analytics functions
+
+"""
+
+import unittest
+from fractions import Fraction
+
+from ood_analytics import (bankroll_distribution, expected_value, house_edge, ruin_probability,
+                           spin_distribution, variance)
+from ood_bin_builder import BinBuilder
+from ood_outcome import outcome_registry
+from ood_simulation import Session, run_sessions
+from ood_wheel import Wheel
+from ood_wheel_layout import EUROPEAN
+
+
+class TestAnalytics(unittest.TestCase):
+    """
+    Test class for the analytics functions.
+    This unit test class compares the computed odds with the known odds of an American wheel.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestAnalytics class
+
+        """
+        self.wheel = Wheel()
+        BinBuilder().build_bins(self.wheel)
+        self.red = outcome_registry.get_outcome('Red', 1)
+        self.straight_17 = outcome_registry.get_outcome('17', 35)
+
+    def test_house_edge(self):
+        """
+        Tests the house edge of American and European wheels
+
+        """
+        self.assertEqual(Fraction(1, 19), house_edge(self.wheel, self.red))
+        self.assertEqual(Fraction(1, 19), house_edge(self.wheel, self.straight_17))
+        european_wheel = Wheel(bin_count=EUROPEAN.bin_count)
+        BinBuilder(layout=EUROPEAN).build_bins(european_wheel)
+        self.assertEqual(Fraction(1, 37), house_edge(european_wheel, self.red))
+
+    def test_spin_distribution(self):
+        """
+        Tests the distribution, expected value and variance of a combined bet
+
+        """
+        bets = [(self.red, 10), (self.straight_17, 1)]
+        self.assertEqual({9: Fraction(18, 38), -11: Fraction(19, 38), 25: Fraction(1, 38)},
+                         spin_distribution(self.wheel, bets))
+        self.assertEqual(Fraction(-11, 19), expected_value(self.wheel, bets))
+        self.assertEqual(Fraction(18 * 20, 38 * 38) * 400, variance(self.wheel, [(self.red, 10)]))
+
+    def test_bankroll_distribution(self):
+        """
+        Tests the bankroll distribution of two spins, with a player stopping once broke
+
+        """
+        win = Fraction(18, 38)
+        lose = Fraction(20, 38)
+        self.assertEqual({4: win * win, 2: 2 * win * lose, 0: lose * lose},
+                         bankroll_distribution(self.wheel, [(self.red, 1)], 2, 2))
+        self.assertEqual({3: win * win, 1: win * lose, 0: lose},
+                         bankroll_distribution(self.wheel, [(self.red, 1)], 1, 2))
+        self.assertEqual(lose, ruin_probability(self.wheel, [(self.red, 1)], 1, 2))
+        self.assertEqual(1, sum(bankroll_distribution(self.wheel, [(self.red, 5)], 50, 30).values()))
+
+    def test_matches_simulation(self):
+        """
+        Tests that the exact ruin probability agrees with a simulation
+
+        """
+        exact_ruin = ruin_probability(self.wheel, [(self.red, 10)], 50, 40, exact=False)
+        statistics = run_sessions(Session(50, [(self.red, 10)], 40), 4000, seed=11, processes=1)
+        self.assertAlmostEqual(exact_ruin, statistics.ruin_probability, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,8 +25,8 @@ Test module for the bin class
 
 import unittest
 
-from ood_bin import Bin
-from ood_outcome import Outcome
+from ood_bin import Bin, BitsetBin
+from ood_outcome import Outcome, OutcomeRegistry
 
 
 class TestBin(unittest.TestCase):
@@ -57,5 +57,52 @@ class TestBin(unittest.TestCase):
         self.assertEqual(bin1, bin2)
 
 
+class TestBitsetBin(unittest.TestCase):
+    """
+    Test class for the BitsetBin class.
+    This unit test class establishes that a BitsetBin behaves like a Bin and answers
+    bit tests for the ids of its Outcomes.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestBitsetBin class
+
+        """
+        registry = OutcomeRegistry()
+        self.outcome_1 = registry.get_outcome('Red', 17)
+        self.outcome_2 = registry.get_outcome('00-0-1-2-3', 6)
+        self.outcome_3 = registry.get_outcome('00', 35)
+        self.bin = BitsetBin({self.outcome_1, self.outcome_3})
+
+    def test_set_interface(self):
+        """
+        Tests that membership, equality and iteration match a Bin with the same Outcomes
+
+        """
+        self.assertIn(self.outcome_1, self.bin)
+        self.assertNotIn(self.outcome_2, self.bin)
+        self.assertEqual(Bin({self.outcome_1, self.outcome_3}), self.bin)
+        self.assertEqual({self.outcome_1, self.outcome_3}, set(self.bin))
+
+    def test_wins(self):
+        """
+        Tests that the bit test agrees with membership
+
+        """
+        self.assertEqual(0b101, self.bin.mask)
+        self.assertTrue(self.bin.wins(self.outcome_1.outcome_id))
+        self.assertFalse(self.bin.wins(self.outcome_2.outcome_id))
+        self.assertFalse(BitsetBin().wins(0))
+
+    def test_unregistered_outcome(self):
+        """
+        Tests that an Outcome without an id cannot be put in a BitsetBin
+
+        """
+        self.assertRaises(ValueError, BitsetBin, {Outcome('Red', 17)})
+
+
 if __name__ == '__main__':
     unittest.main()
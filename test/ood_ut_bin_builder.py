@@ -17,3 +17,149 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
+
+"""
+Test module for the BinBuilder class
+
+"""
+
+import unittest
+
+from ood_bin_builder import BinBuilder, compile_layout
+from ood_outcome import OutcomeRegistry
+from ood_wheel import Wheel
+from ood_wheel_layout import EUROPEAN, TRIPLE_ZERO, WheelLayout
+
+
+class TestBinBuilder(unittest.TestCase):
+    """
+    Test class for the BinBuilder class.
+    This unit test class builds the bins of a Wheel and checks the Outcomes of a few of them.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestBinBuilder class
+
+        """
+        self.registry = OutcomeRegistry()
+        self.wheel = Wheel()
+        BinBuilder(self.registry).build_bins(self.wheel)
+
+    def test_zero_bins(self):
+        """
+        Tests that the zero and double zero bins contain only their straight bet
+
+        """
+        self.assertEqual({'0'}, {outcome.name for outcome in self.wheel.get_wheel_bin(0)})
+        self.assertEqual({'00'}, {outcome.name for outcome in self.wheel.get_wheel_bin(37)})
+
+    def test_bin_five(self):
+        """
+        Tests that bin 5 contains all of the outcomes that win on 5
+
+        """
+        expected_names = {'5', '{2 - 5}', '{4 - 5}', '{5 - 6}', '{5 - 8}', '{4 - 5 - 6}',
+                          '{1 - 2 - 4 - 5}', '{2 - 3 - 5 - 6}', '{4 - 5 - 7 - 8}', '{5 - 6 - 8 - 9}',
+                          '{1 - 2 - 3 - 4 - 5 - 6}', '{4 - 5 - 6 - 7 - 8 - 9}',
+                          'Dozen 1', 'Column 2', 'Red', 'Odd', 'Low'}
+        self.assertEqual(expected_names, {outcome.name for outcome in self.wheel.get_wheel_bin(5)})
+
+    def test_outcomes_are_shared(self):
+        """
+        Tests that bins winning on the same bet share one registered Outcome instance
+
+        """
+        corner_outcomes = [outcome for number in (1, 2, 4, 5) for outcome in self.wheel.get_wheel_bin(number)
+                           if outcome.name == '{1 - 2 - 4 - 5}']
+        self.assertEqual(4, len(corner_outcomes))
+        self.assertTrue(all(outcome is corner_outcomes[0] for outcome in corner_outcomes))
+        self.assertIs(corner_outcomes[0], self.registry[corner_outcomes[0].outcome_id])
+
+    def test_bulk_build_matches_incremental_build(self):
+        """
+        Tests that build_bins gives the same Bins as adding every Outcome to the Wheel one at a time
+
+        """
+        bin_builder = BinBuilder(self.registry)
+        wheel = Wheel()
+        for generate in (bin_builder.generate_straight_bets, bin_builder.generate_split_bets,
+                         bin_builder.generate_street_bets, bin_builder.generate_corner_bets,
+                         bin_builder.generate_line_bets, bin_builder.generate_dozen_bets,
+                         bin_builder.generate_column_bets, bin_builder.generate_money_bets,
+                         bin_builder.generate_zero_bets):
+            generate(wheel)
+        self.assertEqual(wheel.bins, self.wheel.bins)
+
+    def test_wrong_bin_count(self):
+        """
+        Tests that a wheel without the bin count of the layout cannot be built
+
+        """
+        self.assertRaises(ValueError, BinBuilder(self.registry, EUROPEAN).build_bins, Wheel())
+
+
+class TestWheelLayouts(unittest.TestCase):
+    """
+    Test class for building the Bins of other layouts than the American wheel.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestWheelLayouts class
+
+        """
+        self.registry = OutcomeRegistry()
+
+    def build_wheel(self, layout):
+        """
+        Builds a Wheel with the given layout
+
+        """
+        wheel = Wheel(bin_count=layout.bin_count)
+        BinBuilder(self.registry, layout).build_bins(wheel)
+        return wheel
+
+    def test_european_wheel(self):
+        """
+        Tests that the European wheel has 37 bins and a single zero
+
+        """
+        wheel = self.build_wheel(EUROPEAN)
+        self.assertEqual(37, len(wheel.bins))
+        self.assertEqual({'0'}, {outcome.name for outcome in wheel.get_wheel_bin(0)})
+        self.assertNotIn('00', self.registry)
+
+    def test_triple_zero_wheel(self):
+        """
+        Tests that the triple zero wheel has 39 bins with the extra zeros after the numbers
+
+        """
+        wheel = self.build_wheel(TRIPLE_ZERO)
+        self.assertEqual(39, len(wheel.bins))
+        self.assertEqual({'00'}, {outcome.name for outcome in wheel.get_wheel_bin(37)})
+        self.assertEqual({'000'}, {outcome.name for outcome in wheel.get_wheel_bin(38)})
+
+    def test_bet_families(self):
+        """
+        Tests that only the bet families of the layout are generated
+
+        """
+        layout = WheelLayout('Even money only', ('0',), EUROPEAN.red_numbers, ('money',))
+        wheel = self.build_wheel(layout)
+        self.assertEqual({'Red', 'Odd', 'Low'}, {outcome.name for outcome in wheel.get_wheel_bin(1)})
+        self.assertEqual(frozenset(), wheel.get_wheel_bin(0))
+
+    def test_layout_is_compiled_once(self):
+        """
+        Tests that wheels built from the same layout share the compiled bin tables
+
+        """
+        self.assertEqual(self.build_wheel(EUROPEAN).bins, self.build_wheel(EUROPEAN).bins)
+        self.assertIs(compile_layout(EUROPEAN, self.registry), compile_layout(EUROPEAN, self.registry))
+
+
+if __name__ == '__main__':
+    unittest.main()
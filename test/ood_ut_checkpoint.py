@@ -0,0 +1,196 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the checkpoint files and resumed sequential simulations
+
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from ood_checkpoint import HEADER, load_checkpoint, save_checkpoint
+from ood_sequential import SpinMetric, house_edge_metric, ruin_metric, run_until_precise
+from ood_simulation import RunningStatistics, Session
+from ood_wheel import default_wheel
+
+
+class CrashingMetric(SpinMetric):
+    """
+    A SpinMetric that raises after a number of batches, standing in for a restarted machine.
+
+    """
+
+    def __init__(self, name, values_by_bin, batches):
+        """Sets the number of batches added before raising."""
+        super().__init__(name, values_by_bin)
+        self.batches = batches
+
+    def add_spins(self, statistics, bin_numbers):
+        """Raises KeyboardInterrupt once the batches are used up."""
+        if self.batches == 0:
+            raise KeyboardInterrupt
+        self.batches -= 1
+        super().add_spins(statistics, bin_numbers)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Test class for the checkpoint files.
+    This unit test class checkpoints sequential simulations of Red and a Red session.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestCheckpoint class
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.ckpt')
+        self.wheel = default_wheel().spawn(1)[0]
+        self.red = self.wheel.get_outcome('Red')
+        self.session = Session(100, [(self.red, 10)], 20)
+
+    def tearDown(self):
+        """
+        tear down function for the TestCheckpoint class
+
+        """
+        self.directory.cleanup()
+
+    def new_wheel(self, seed):
+        """Returns a fresh wheel seeded with seed."""
+        wheel = default_wheel().spawn(1)[0]
+        wheel.random_number_generator.seed(seed)
+        return wheel
+
+    def test_round_trip(self):
+        """
+        Tests that a checkpoint restores the random state, spins and statistics exactly
+
+        """
+        generator = random.Random(23)
+        generator.gauss(0, 1)
+        statistics = {'a': RunningStatistics(), 'b é': RunningStatistics()}
+        for _ in range(100):
+            statistics['a'].add(generator.random())
+        save_checkpoint(self.path, generator.getstate(), 12345, statistics)
+        self.assertEqual(['run.ckpt'], os.listdir(self.directory.name))
+
+        random_state, spins, loaded = load_checkpoint(self.path)
+        self.assertEqual(random_state, generator.getstate())
+        self.assertEqual(spins, 12345)
+        self.assertEqual({name: value.moments() for name, value in loaded.items()},
+                         {name: value.moments() for name, value in statistics.items()})
+
+    def test_corrupt_files(self):
+        """
+        Tests that files that are not checkpoints or are truncated are rejected
+
+        """
+        with open(self.path, 'wb') as checkpoint_file:
+            checkpoint_file.write(b'not a checkpoint file at all, not even close to one')
+        self.assertRaises(ValueError, load_checkpoint, self.path)
+
+        save_checkpoint(self.path, random.Random(1).getstate(), 1, {'a': RunningStatistics()})
+        with open(self.path, 'rb') as checkpoint_file:
+            data = checkpoint_file.read()
+        with open(self.path, 'wb') as checkpoint_file:
+            checkpoint_file.write(data[:-4])
+        self.assertRaises(ValueError, load_checkpoint, self.path)
+
+        for offset in (12, HEADER.size + 100, len(data) - 3):
+            damaged = bytearray(data)
+            damaged[offset] ^= 1
+            with open(self.path, 'wb') as checkpoint_file:
+                checkpoint_file.write(damaged)
+            self.assertRaises(ValueError, load_checkpoint, self.path)
+
+    def test_failed_write_keeps_checkpoint(self):
+        """
+        Tests that a failed write leaves the previous checkpoint and no temporary file
+
+        """
+        save_checkpoint(self.path, random.Random(1).getstate(), 1, {'a': RunningStatistics()})
+        with mock.patch('ood_checkpoint.os.replace', side_effect=OSError):
+            self.assertRaises(OSError, save_checkpoint, self.path, random.Random(2).getstate(), 2,
+                              {'a': RunningStatistics()})
+        self.assertEqual(['run.ckpt'], os.listdir(self.directory.name))
+        self.assertEqual(1, load_checkpoint(self.path)[1])
+
+    def test_resume_after_crash(self):
+        """
+        Tests that a run resumed after a crash gives the same numbers as an uninterrupted run,
+        and that the checkpoint is removed once the run converges
+
+        """
+        targets = {'house edge Red': 0.02, 'ruin probability': 0.05}
+        uninterrupted = run_until_precise(self.new_wheel(23), [house_edge_metric(self.wheel, self.red),
+                                                               ruin_metric(self.session, 'ruin probability')],
+                                          targets, batch_size=1000)
+
+        values_by_bin = house_edge_metric(self.wheel, self.red).values_by_bin
+        crashing = [CrashingMetric('house edge Red', values_by_bin, 7), ruin_metric(self.session, 'ruin probability')]
+        with self.assertRaises(KeyboardInterrupt):
+            run_until_precise(self.new_wheel(23), crashing, targets, batch_size=1000,
+                              checkpoint_path=self.path, checkpoint_every=3)
+        self.assertTrue(6 * 1000 < load_checkpoint(self.path)[1] <= 6 * 2000)
+
+        resumed = run_until_precise(self.new_wheel(99), [house_edge_metric(self.wheel, self.red),
+                                                         ruin_metric(self.session, 'ruin probability')],
+                                    targets, batch_size=1000, checkpoint_path=self.path, checkpoint_every=3)
+        self.assertTrue(resumed.converged)
+        self.assertEqual(resumed.spins, uninterrupted.spins)
+        self.assertEqual({name: value.moments() for name, value in resumed.statistics.items()},
+                         {name: value.moments() for name, value in uninterrupted.statistics.items()})
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_extend_unconverged_run(self):
+        """
+        Tests that a run stopped at max_spins can be extended from its checkpoint
+
+        """
+        metrics = [house_edge_metric(self.wheel, self.red)]
+        uninterrupted = run_until_precise(self.new_wheel(5), metrics, 0.01, batch_size=1000)
+        stopped = run_until_precise(self.new_wheel(5), metrics, 0.01, batch_size=1000, max_spins=5000,
+                                    checkpoint_path=self.path)
+        self.assertFalse(stopped.converged)
+        extended = run_until_precise(self.new_wheel(6), metrics, 0.01, batch_size=1000, checkpoint_path=self.path)
+        self.assertEqual(extended.spins, uninterrupted.spins)
+        self.assertEqual(extended.statistics['house edge Red'].moments(),
+                         uninterrupted.statistics['house edge Red'].moments())
+
+    def test_other_metrics_rejected(self):
+        """
+        Tests that a checkpoint cannot be resumed with other metrics
+
+        """
+        run_until_precise(self.new_wheel(5), [house_edge_metric(self.wheel, self.red)], 0.01, batch_size=1000,
+                          max_spins=2000, checkpoint_path=self.path)
+        self.assertRaises(ValueError, run_until_precise, self.new_wheel(5), [ruin_metric(self.session, 'ruin probability')], 0.01,
+                          checkpoint_path=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
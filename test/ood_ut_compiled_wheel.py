@@ -0,0 +1,139 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the compiled wheel functions
+
+"""
+
+import os
+import tempfile
+import unittest
+
+from ood_bin import BitsetBin
+from ood_bin_builder import BinBuilder
+from ood_compiled_wheel import HEADER, load_or_build_wheel, load_wheel, save_wheel
+from ood_outcome import OutcomeRegistry
+from ood_wheel import Wheel
+from ood_wheel_layout import EUROPEAN
+
+
+class TestCompiledWheel(unittest.TestCase):
+    """
+    Test class for the compiled wheel functions.
+    This unit test class saves a built Wheel, loads it back and checks that damaged files are rejected.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestCompiledWheel class
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'american.wheel')
+        self.registry = OutcomeRegistry()
+        self.wheel = Wheel()
+        BinBuilder(self.registry).build_bins(self.wheel)
+
+    def tearDown(self):
+        """
+        tear down function for the TestCompiledWheel class
+
+        """
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Tests that a loaded wheel has the same Bins, sharing the registry's Outcomes
+
+        """
+        save_wheel(self.wheel, self.path)
+        loaded_wheel = load_wheel(self.path, seed=1, bin_class=BitsetBin, registry=self.registry)
+        self.assertEqual(self.wheel.bins, loaded_wheel.bins)
+        self.assertIsInstance(loaded_wheel.get_wheel_bin(5), BitsetBin)
+        red_outcome = self.registry.get_outcome('Red', 1)
+        self.assertTrue(any(outcome is red_outcome for outcome in loaded_wheel.get_wheel_bin(1)))
+
+    def test_corrupt_file(self):
+        """
+        Tests that a file with a damaged payload is rejected
+
+        """
+        save_wheel(self.wheel, self.path)
+        with open(self.path, 'r+b') as compiled:
+            compiled.seek(HEADER.size + 1)
+            compiled.write(b'\xff')
+        self.assertRaises(ValueError, load_wheel, self.path, registry=self.registry)
+
+    def test_damaged_header(self):
+        """
+        Tests that damaged counts in the header are rejected, also by the build fallback
+
+        """
+        for field_offset, value in ((6, b'\x28\x00'), (8, b'\xf4\x01\x00\x00')):
+            save_wheel(self.wheel, self.path)
+            with open(self.path, 'r+b') as compiled:
+                compiled.seek(field_offset)
+                compiled.write(value)
+            self.assertRaises(ValueError, load_wheel, self.path, registry=self.registry)
+            self.assertEqual(self.wheel.bins, load_or_build_wheel(self.path, registry=self.registry).bins)
+
+    def test_no_temporary_files_left(self):
+        """
+        Tests that saving leaves only the compiled file in its directory
+
+        """
+        save_wheel(self.wheel, self.path)
+        save_wheel(self.wheel, self.path)
+        self.assertEqual(['american.wheel'], os.listdir(self.directory.name))
+
+    def test_load_or_build(self):
+        """
+        Tests that a missing file is built and saved, and loaded on the next call
+
+        """
+        built_wheel = load_or_build_wheel(self.path, registry=self.registry)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(self.wheel.bins, built_wheel.bins)
+        self.assertEqual(self.wheel.bins, load_or_build_wheel(self.path, registry=self.registry).bins)
+
+    def test_other_layout(self):
+        """
+        Tests that a wheel of another layout keeps its number of bins through a round trip
+
+        """
+        load_or_build_wheel(self.path, registry=self.registry, layout=EUROPEAN)
+        self.assertEqual(37, len(load_wheel(self.path, registry=self.registry).bins))
+
+    def test_layout_mismatch(self):
+        """
+        Tests that a file of one layout is rebuilt when another layout is requested from the same path
+
+        """
+        self.assertEqual(38, len(load_or_build_wheel(self.path, registry=self.registry).bins))
+        self.assertRaises(ValueError, load_wheel, self.path, registry=self.registry, layout=EUROPEAN)
+        self.assertEqual(37, len(load_or_build_wheel(self.path, registry=self.registry, layout=EUROPEAN).bins))
+        self.assertEqual(37, len(load_wheel(self.path, registry=self.registry, layout=EUROPEAN).bins))
+        self.assertRaises(ValueError, save_wheel, self.wheel, self.path, EUROPEAN)
+
+
+if __name__ == '__main__':
+    unittest.main()
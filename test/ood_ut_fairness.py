@@ -0,0 +1,120 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the fairness tests
+
+"""
+
+import unittest
+from array import array
+
+from ood_fairness import SpinStatistics, chi_square_p_value, monitor_wheel, normal_p_value
+from ood_wheel import Wheel
+
+
+class TestPValues(unittest.TestCase):
+    """
+    Test class for the p-value functions
+
+    """
+
+    def test_chi_square_p_value(self):
+        """
+        Tests the chi-square upper tail against tabulated critical values
+
+        """
+        self.assertAlmostEqual(0.05, chi_square_p_value(3.841459, 1), places=6)
+        self.assertAlmostEqual(0.01, chi_square_p_value(59.892500, 37), places=6)
+        self.assertEqual(1.0, chi_square_p_value(0, 37))
+
+    def test_normal_p_value(self):
+        """
+        Tests the two sided normal tail
+
+        """
+        self.assertAlmostEqual(0.05, normal_p_value(1.959964), places=6)
+
+
+class TestSpinStatistics(unittest.TestCase):
+    """
+    Test class for the SpinStatistics class.
+
+    """
+
+    def test_batches_match_single_pass(self):
+        """
+        Tests that statistics updated in batches equal statistics updated in one pass
+
+        """
+        spins = Wheel(8).next_wheel_bins(1000)
+        single_pass = SpinStatistics()
+        single_pass.update(spins)
+        batched = SpinStatistics()
+        for start in range(0, 1000, 7):
+            batched.update(spins[start:start + 7])
+        self.assertEqual(single_pass.report(), batched.report())
+        self.assertEqual([spins.count(bin_number) for bin_number in range(38)], batched.counts)
+
+    def test_runs(self):
+        """
+        Tests the run count, leaving out the middle bin of an odd wheel
+
+        """
+        statistics = SpinStatistics(37)
+        statistics.update(array('B', [0, 1, 30, 18, 31, 2]))
+        statistics.update(array('B', [3, 36]))
+        self.assertEqual((3, 4, 4), (statistics.high, statistics.low, statistics.runs))
+
+    def test_fair_wheel_passes(self):
+        """
+        Tests that a seeded wheel is not rejected
+
+        """
+        report = monitor_wheel(Wheel(8), 100000, batch_size=4096).report()
+        self.assertEqual(100000, report['spins'])
+        self.assertGreater(report['chi_square_p'], 0.001)
+        self.assertGreater(report['runs_p'], 0.001)
+        self.assertGreater(report['serial_correlation_p'], 0.001)
+
+    def test_sequential_spins_fail(self):
+        """
+        Tests that a wheel stepping through the bins in order fails the independence tests
+
+        """
+        statistics = SpinStatistics()
+        statistics.update(array('B', list(range(38)) * 100))
+        report = statistics.report()
+        self.assertEqual(0, report['chi_square'])
+        self.assertLess(report['runs_p'], 1e-6)
+        self.assertLess(report['serial_correlation_p'], 1e-6)
+
+    def test_periodic_reports(self):
+        """
+        Tests that the callback receives a report after every report_every spins
+
+        """
+        reports = []
+        monitor_wheel(Wheel(8), 1000, batch_size=100, report_every=250, callback=reports.append)
+        self.assertEqual([300, 500, 800, 1000], [report['spins'] for report in reports])
+
+
+if __name__ == '__main__':
+    unittest.main()
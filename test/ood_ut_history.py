@@ -0,0 +1,225 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the ring buffers and streaming quantiles
+
+"""
+
+import random
+import unittest
+from array import array
+
+from ood_history import BankrollCurves, P2Quantile, RingBuffer, SessionHistory, bankroll_curves
+from ood_simulation import Session
+from ood_wheel import default_wheel
+
+
+class TestRingBuffer(unittest.TestCase):
+    """
+    Test class for the RingBuffer class.
+    This unit test class fills a buffer of five bin numbers.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestRingBuffer class
+
+        """
+        self.buffer = RingBuffer('B', 5)
+
+    def test_append(self):
+        """
+        Tests that appending past capacity drops the oldest values
+
+        """
+        for value in range(3):
+            self.buffer.append(value)
+        self.assertEqual(list(self.buffer.values()), [0, 1, 2])
+        self.assertFalse(self.buffer.full)
+        for value in range(3, 7):
+            self.buffer.append(value)
+        self.assertTrue(self.buffer.full)
+        self.assertEqual(list(self.buffer.values()), [2, 3, 4, 5, 6])
+        self.assertEqual((self.buffer[0], self.buffer[-1]), (2, 6))
+        self.assertRaises(IndexError, self.buffer.__getitem__, 5)
+
+    def test_extend(self):
+        """
+        Tests that extending matches appending one value at a time
+
+        """
+        appended = RingBuffer('B', 5)
+        for batch in ([1, 2], [3, 4, 5], [6], [], list(range(7, 20)), [20, 21]):
+            self.buffer.extend(array('B', batch))
+            for value in batch:
+                appended.append(value)
+            self.assertEqual(self.buffer.values(), appended.values())
+        self.assertEqual(self.buffer.values().typecode, 'B')
+
+    def test_capacity(self):
+        """
+        Tests that a buffer needs a positive capacity
+
+        """
+        self.assertRaises(ValueError, RingBuffer, 'd', 0)
+
+
+class TestP2Quantile(unittest.TestCase):
+    """
+    Test class for the P2Quantile class.
+    This unit test class estimates quantiles of normal and uniform streams.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestP2Quantile class
+
+        """
+        generator = random.Random(25)
+        self.normal = [generator.gauss(0, 1) for _ in range(20000)]
+        self.uniform = [generator.random() for _ in range(20000)]
+
+    def test_estimates(self):
+        """
+        Tests that the estimates are close to the exact quantiles
+
+        """
+        for values in (self.normal, self.uniform):
+            ordered = sorted(values)
+            for quantile in (0.05, 0.5, 0.95):
+                estimator = P2Quantile(quantile)
+                for value in values:
+                    estimator.add(value)
+                self.assertEqual(estimator.count, len(values))
+                self.assertAlmostEqual(estimator.value, ordered[int(quantile * len(values))], delta=0.02)
+
+    def test_extremes(self):
+        """
+        Tests that the quantiles 0 and 1 are the exact smallest and largest values
+
+        """
+        for quantile, expected in ((0, min(self.normal)), (1, max(self.normal))):
+            estimator = P2Quantile(quantile)
+            for value in self.normal:
+                estimator.add(value)
+            self.assertEqual(expected, estimator.value)
+
+    def test_few_values(self):
+        """
+        Tests the exact answers before five values and the errors
+
+        """
+        estimator = P2Quantile(0.5)
+        self.assertRaises(ValueError, lambda: estimator.value)
+        for value in (3, 1, 2):
+            estimator.add(value)
+        self.assertEqual(estimator.value, 2)
+        high = P2Quantile(0.95)
+        for value in (1, 2, 3, 4, 5):
+            high.add(value)
+        self.assertEqual(high.value, 5)
+        self.assertRaises(ValueError, P2Quantile, 1.5)
+
+
+class TestBankrollCurves(unittest.TestCase):
+    """
+    Test class for the BankrollCurves class, SessionHistory and bankroll_curves.
+    This unit test class plays sessions betting 10 on Red.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestBankrollCurves class
+
+        """
+        self.wheel = default_wheel().spawn(1)[0]
+        self.wheel.random_number_generator.seed(25)
+        self.session = Session(100, [(self.wheel.get_outcome('Red'), 10)], 40)
+
+    def new_wheel(self):
+        """Returns a wheel spinning the same Bins as the seeded wheel of setUp."""
+        wheel = default_wheel().spawn(1)[0]
+        wheel.random_number_generator.seed(25)
+        return wheel
+
+    def test_history(self):
+        """
+        Tests that the history holds the spins and bankrolls of the last session played
+
+        """
+        history = SessionHistory(40)
+        bankroll, spins = history.play(self.session, self.wheel)
+        self.assertEqual(len(history.bin_numbers), spins)
+        self.assertEqual(history.bankrolls[-1], bankroll)
+        self.assertEqual(history.bin_numbers.values().typecode, 'B')
+        red = self.wheel.get_outcome('Red')
+        for spin in range(1, spins):
+            change = 10 if red in self.wheel.get_wheel_bin(history.bin_numbers[spin]) else -10
+            self.assertEqual(history.bankrolls[spin] - history.bankrolls[spin - 1], change)
+        self.assertEqual((bankroll, spins), Session(100, [(self.wheel.get_outcome('Red'), 10)], 40).play(
+            self.new_wheel(), played_bins=bytearray()))
+
+    def test_history_matches_session(self):
+        """
+        Tests that a history of fewer spins than the session keeps the last ones played
+
+        """
+        history = SessionHistory(10)
+        bin_numbers, bankrolls = bytearray(), array('d')
+        expected = Session(10 ** 4, [(self.wheel.get_outcome('Red'), 1)], 5000).play(self.new_wheel(), None,
+                                                                                     bin_numbers, bankrolls)
+        self.assertEqual(expected, history.play(Session(10 ** 4, [(self.wheel.get_outcome('Red'), 1)], 5000),
+                                                self.new_wheel()))
+        self.assertEqual(list(bin_numbers[-10:]), list(history.bin_numbers.values()))
+        self.assertEqual(bankrolls[-10:], history.bankrolls.values())
+
+    def test_padding(self):
+        """
+        Tests that a short trajectory keeps its final bankroll
+
+        """
+        curves = BankrollCurves(4, (0.5,))
+        for _ in range(3):
+            curves.add_trajectory(array('d', [1, 2]))
+        self.assertEqual(list(curves.curves()[0.5]), [1, 2, 2, 2])
+        self.assertRaises(ValueError, curves.add_trajectory, array('d', range(5)))
+
+    def test_bankroll_curves(self):
+        """
+        Tests that the percentile curves are ordered and spread out over the session
+
+        """
+        curves = bankroll_curves(self.wheel, self.session, 1000, (0.05, 0.5, 0.95))
+        self.assertEqual(curves.sessions, 1000)
+        low, median, high = (curves.curves()[quantile] for quantile in (0.05, 0.5, 0.95))
+        self.assertEqual(len(median), 40)
+        for spin in range(40):
+            self.assertLessEqual(low[spin], median[spin] + 1e-9)
+            self.assertLessEqual(median[spin], high[spin] + 1e-9)
+        self.assertGreater(high[-1] - low[-1], high[0] - low[0])
+        self.assertLess(median[-1], 110)
+
+
+if __name__ == '__main__':
+    unittest.main()
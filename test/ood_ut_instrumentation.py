@@ -0,0 +1,96 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the instrumentation layer
+
+"""
+
+import unittest
+
+import ood_instrumentation
+from ood_bin_builder import BinBuilder, compile_layout
+from ood_outcome import OutcomeRegistry
+from ood_wheel import Wheel
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Test class for the Instrumentation class and its hooks in Wheel and BinBuilder.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestInstrumentation class
+
+        """
+        self.wheel = Wheel(5)
+        BinBuilder().build_bins(self.wheel)
+
+    def tearDown(self):
+        """
+        tear down function for the TestInstrumentation class
+
+        """
+        ood_instrumentation.disable()
+
+    def test_disabled(self):
+        """
+        Tests that nothing is recorded while instrumentation is off
+
+        """
+        self.wheel.next_wheel_bin()
+        self.assertIsNone(ood_instrumentation.snapshot())
+
+    def test_spin_counts(self):
+        """
+        Tests that single and batch spins are counted per bin without changing the spins
+
+        """
+        reference_wheel = Wheel(5)
+        expected_bin_numbers = [reference_wheel.random_number_generator.choice(range(38)) for _ in range(3)]
+        ood_instrumentation.enable()
+        self.assertEqual([self.wheel.bins[bin_number] for bin_number in expected_bin_numbers],
+                         [self.wheel.next_wheel_bin() for _ in range(3)])
+        bin_numbers = self.wheel.next_wheel_bins(100)
+        snapshot = ood_instrumentation.snapshot()
+        self.assertEqual(103, snapshot['spins'])
+        self.assertEqual(bin_numbers.count(7) + expected_bin_numbers.count(7), snapshot['spin_counts'][7])
+        self.assertEqual(3, snapshot['timers']['next_wheel_bin']['count'])
+        self.assertEqual(1, snapshot['timers']['next_wheel_bins']['count'])
+
+    def test_build_timers(self):
+        """
+        Tests that build_bins and every generate method of a compiled layout are timed
+
+        """
+        instrumentation = ood_instrumentation.enable()
+        registry = OutcomeRegistry()
+        BinBuilder(registry).build_bins(Wheel())
+        timers = instrumentation.snapshot()['timers']
+        self.assertEqual(1, timers['build_bins']['count'])
+        self.assertIn('generate_money_bets', timers)
+        self.assertGreaterEqual(timers['build_bins']['total'], timers['generate_money_bets']['total'])
+        compile_layout.cache_clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,7 +25,7 @@ Test module for the Outcome class
 
 import unittest
 
-from ood_outcome import Outcome
+from ood_outcome import Outcome, OutcomeRegistry
 
 
 class TestOutcomeMethods(unittest.TestCase):
@@ -82,5 +82,54 @@ class TestOutcomeMethods(unittest.TestCase):
         self.assertTrue(str(self.outcome) == expected_string)
 
 
+class TestOutcomeRegistry(unittest.TestCase):
+    """
+    Test class for the OutcomeRegistry class methods
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestOutcomeRegistry class
+
+        """
+        self.registry = OutcomeRegistry()
+
+    def test_get_outcome_is_interned(self):
+        """
+        Tests that the registry returns the same Outcome instance for the same name
+
+        """
+        red_outcome = self.registry.get_outcome('Red', 1)
+        self.assertIs(red_outcome, self.registry.get_outcome('Red', 1))
+        self.assertIn('Red', self.registry)
+
+    def test_outcome_ids_are_dense(self):
+        """
+        Tests that registered Outcomes get consecutive ids starting at zero
+
+        """
+        names = ['Red', 'Black', '00']
+        outcomes = [self.registry.get_outcome(name, 1) for name in names]
+        self.assertEqual([0, 1, 2], [outcome.outcome_id for outcome in outcomes])
+        self.assertIs(outcomes[1], self.registry[1])
+        self.assertEqual(3, len(self.registry))
+
+    def test_conflicting_odds(self):
+        """
+        Tests that registering a known name with different odds raises a ValueError
+
+        """
+        self.registry.get_outcome('Red', 1)
+        self.assertRaises(ValueError, self.registry.get_outcome, 'Red', 2)
+
+    def test_outcome_has_no_instance_dict(self):
+        """
+        Tests that Outcome instances are slotted
+
+        """
+        self.assertFalse(hasattr(self.registry.get_outcome('Red', 1), '__dict__'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the PayoutMatrix class
+
+"""
+
+import unittest
+
+from ood_bin_builder import BinBuilder
+from ood_outcome import OutcomeRegistry
+from ood_wheel import Wheel
+
+
+class TestPayoutMatrix(unittest.TestCase):
+    """
+    Test class for the PayoutMatrix class.
+    This unit test class builds a Wheel and settles stakes against its payout matrix.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestPayoutMatrix class
+
+        """
+        self.registry = OutcomeRegistry()
+        self.wheel = Wheel()
+        BinBuilder(self.registry).build_bins(self.wheel)
+        self.matrix = self.wheel.payout_matrix()
+        self.red = self.registry.get_outcome('Red', 1)
+        self.straight_5 = self.registry.get_outcome('5', 35)
+
+    def test_shape(self):
+        """
+        Tests that the matrix has one row per bin and one column per outcome
+
+        """
+        self.assertEqual(38, len(self.matrix.rows))
+        self.assertEqual(len(self.registry), len(self.matrix.outcomes))
+        self.assertTrue(all(len(row) == len(self.registry) for row in self.matrix.rows))
+
+    def test_entries_match_win_amount(self):
+        """
+        Tests that every entry is the unit win amount of a winning outcome or -1
+
+        """
+        for bin_number, bin_ in enumerate(self.wheel.bins):
+            for outcome in self.matrix.outcomes:
+                expected = outcome.win_amount(1) if outcome in bin_ else -1
+                self.assertEqual(expected, self.matrix.rows[bin_number][self.matrix.column(outcome)])
+
+    def test_settle(self):
+        """
+        Tests that a stake vector is settled against one spin and a batch of spins
+
+        """
+        stakes = self.matrix.stakes([(self.red, 10), (self.straight_5, 1)])
+        self.assertEqual(45, self.matrix.settle(5, stakes))
+        self.assertEqual(9, self.matrix.settle(1, stakes))
+        self.assertEqual(-11, self.matrix.settle(0, stakes))
+        self.assertEqual([45, 9, -11], list(self.matrix.settle_spins([5, 1, 0], stakes)))
+
+    def test_cache_is_reset(self):
+        """
+        Tests that adding an outcome to the wheel rebuilds the matrix
+
+        """
+        self.assertIs(self.matrix, self.wheel.payout_matrix())
+        self.wheel.add_outcome_to_wheel_bin(0, self.red)
+        self.assertEqual(1, self.wheel.payout_matrix().settle(0, self.matrix.stakes([(self.red, 1)])))
+
+
+if __name__ == '__main__':
+    unittest.main()
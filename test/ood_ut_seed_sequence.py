@@ -0,0 +1,83 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the SeedSequence class
+
+"""
+
+import unittest
+
+from ood_seed_sequence import SeedSequence
+
+
+class TestSeedSequence(unittest.TestCase):
+    """
+    Test class for the SeedSequence class methods
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestSeedSequence class
+
+        """
+        self.seed_sequence = SeedSequence(1234)
+
+    def test_same_seed_same_stream(self):
+        """
+        Tests that two sequences with the same entropy produce the same random numbers
+
+        """
+        other_sequence = SeedSequence(1234)
+        self.assertEqual(self.seed_sequence.random().random(), other_sequence.random().random())
+
+    def test_spawn_children_are_independent(self):
+        """
+        Tests that spawned children have distinct spawn keys and states
+
+        """
+        children = self.seed_sequence.spawn(3) + self.seed_sequence.spawn(1)
+        self.assertEqual([(0,), (1,), (2,), (3,)], [child.spawn_key for child in children])
+        states = {child.generate_state() for child in children}
+        states.add(self.seed_sequence.generate_state())
+        self.assertEqual(5, len(states))
+
+    def test_spawn_is_repeatable(self):
+        """
+        Tests that spawning from equal sequences yields equal children
+
+        """
+        first = [child.generate_state() for child in SeedSequence(1234).spawn(4)]
+        second = [child.generate_state() for child in SeedSequence(1234).spawn(4)]
+        self.assertEqual(first, second)
+
+    def test_entropy_is_recorded(self):
+        """
+        Tests that a sequence created without a seed records its entropy so it can be recreated
+
+        """
+        seed_sequence = SeedSequence()
+        other_sequence = SeedSequence(seed_sequence.entropy)
+        self.assertEqual(seed_sequence.generate_state(), other_sequence.generate_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the sequential simulation
+
+"""
+
+import unittest
+
+from ood_sequential import SpinMetric, house_edge_metric, ruin_metric, run_until_precise
+from ood_simulation import RunningStatistics, Session
+from ood_wheel import default_wheel
+
+
+class TestRunUntilPrecise(unittest.TestCase):
+    """
+    Test class for the run_until_precise function.
+    This unit test class estimates the house edge of Red and 17 and the ruin probability of a Red session.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestRunUntilPrecise class
+
+        """
+        self.wheel = default_wheel().spawn(1)[0]
+        self.wheel.random_number_generator.seed(22)
+        self.red = self.wheel.get_outcome('Red')
+
+    def test_spin_metric_matches_welford(self):
+        """
+        Tests that adding a batch through its histogram matches adding every value
+
+        """
+        metric = house_edge_metric(self.wheel, self.red)
+        bin_numbers = self.wheel.next_wheel_bins(1000)
+        batched, single = RunningStatistics(), RunningStatistics()
+        metric.add_spins(batched, bin_numbers)
+        for bin_number in bin_numbers:
+            single.add(metric.values_by_bin[bin_number])
+        self.assertEqual(batched.count, single.count)
+        self.assertAlmostEqual(batched.mean, single.mean)
+        self.assertAlmostEqual(batched.variance, single.variance)
+
+    def test_house_edge_converges(self):
+        """
+        Tests that the estimate of the house edge meets its target width and covers 2/38
+
+        """
+        result = run_until_precise(self.wheel, [house_edge_metric(self.wheel, self.red)], 0.01)
+        self.assertTrue(result.converged)
+        half_width = result.half_widths['house edge Red']
+        self.assertLessEqual(2 * half_width, 0.01)
+        self.assertLess(abs(result.statistics['house edge Red'].mean - 2 / 38), 2 * half_width)
+        self.assertEqual(result.spins % 10000, 0)
+
+    def test_wider_target_stops_sooner(self):
+        """
+        Tests that a looser target uses fewer spins, and that a straight bet needs more spins than Red
+
+        """
+        loose = run_until_precise(self.wheel, [house_edge_metric(self.wheel, self.red)], 0.04, batch_size=1000)
+        tight = run_until_precise(self.wheel, [house_edge_metric(self.wheel, self.red)], 0.01, batch_size=1000)
+        straight = run_until_precise(self.wheel, [house_edge_metric(self.wheel, self.wheel.get_outcome('17'))], 0.04,
+                                     batch_size=1000)
+        self.assertLess(loose.spins, tight.spins)
+        self.assertLess(loose.spins, straight.spins)
+
+    def test_ruin_probability(self):
+        """
+        Tests the ruin metric with a per metric target width
+
+        """
+        session = Session(100, [(self.red, 10)], 20)
+        name = 'ruin probability Red 10 from 100 over 20 spins'
+        metrics = [house_edge_metric(self.wheel, self.red), ruin_metric(session)]
+        result = run_until_precise(self.wheel, metrics, {'house edge Red': 0.05, name: 0.05})
+        self.assertTrue(result.converged)
+        ruin = result.statistics[name]
+        self.assertTrue(0 < ruin.mean < 1)
+        self.assertLessEqual(2 * result.half_widths[name], 0.05)
+
+    def test_ruin_metrics_of_two_sessions(self):
+        """
+        Tests that the ruin metrics of two sessions are kept apart, and that duplicate names are rejected
+
+        """
+        safe = Session(1000, [(self.red, 1)], 20)
+        risky = Session(10, [(self.wheel.get_outcome('0'), 10)], 20)
+        result = run_until_precise(self.wheel, [ruin_metric(safe), ruin_metric(risky)], 0.05)
+        means = sorted(statistics.mean for statistics in result.statistics.values())
+        self.assertEqual(2, len(means))
+        self.assertEqual(0, means[0])
+        self.assertGreater(means[1], 0.9)
+        self.assertRaises(ValueError, run_until_precise, self.wheel, [ruin_metric(safe), ruin_metric(safe)], 0.05)
+
+    def test_spins_played_by_sessions(self):
+        """
+        Tests that sessions count the spins they played, not their length
+
+        """
+        session = Session(10, [(self.wheel.get_outcome('0'), 10)], 100000)
+        result = run_until_precise(self.wheel, [ruin_metric(session)], 1, min_count=30)
+        self.assertEqual(30, result.statistics[ruin_metric(session).name].count)
+        self.assertLess(result.spins, 30 * 1000)
+
+    def test_max_spins(self):
+        """
+        Tests that the driver stops unconverged at max_spins
+
+        """
+        metric = SpinMetric('constant one', [0] * 37 + [1])
+        result = run_until_precise(self.wheel, [metric], 1e-9, batch_size=100, max_spins=500)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.spins, 500)
+        self.assertIn('not converged', str(result))
+
+
+if __name__ == '__main__':
+    unittest.main()
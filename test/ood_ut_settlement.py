@@ -0,0 +1,80 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the BetBatch class and the settle_bets function
+
+"""
+
+import unittest
+
+from ood_bin import Bin
+from ood_outcome import Outcome, OutcomeRegistry
+from ood_settlement import BetBatch, settle_bets
+
+
+class TestSettlement(unittest.TestCase):
+    """
+    Test class for the settlement engine.
+    This unit test class settles a batch of bets against a Bin.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestSettlement class
+
+        """
+        registry = OutcomeRegistry()
+        self.red = registry.get_outcome('Red', 1)
+        self.black = registry.get_outcome('Black', 1)
+        self.straight_5 = registry.get_outcome('5', 35)
+        self.winning_bin = Bin({self.red, self.straight_5})
+
+    def test_settle_bets(self):
+        """
+        Tests that the payouts of every player are totalled over their bets
+
+        """
+        bets = [('ann', self.red, 10), ('bob', self.black, 10), ('ann', self.straight_5, 1),
+                ('bob', self.red, 2), ('cid', self.black, 4)]
+        self.assertEqual({'ann': 45, 'bob': -8, 'cid': -4}, settle_bets(self.winning_bin, bets))
+
+    def test_bets_are_grouped_by_outcome(self):
+        """
+        Tests that bets on equal Outcomes share one group and are settled in order
+
+        """
+        batch = BetBatch()
+        batch.add_bets([('ann', self.red, 10), ('bob', Outcome('Red', 1), 3), ('cid', self.black, 4)])
+        self.assertEqual(3, len(batch))
+        self.assertEqual([self.red, self.black], batch.outcomes)
+        self.assertEqual([10, 3, -4], list(batch.bet_results(self.winning_bin)))
+
+    def test_empty_batch(self):
+        """
+        Tests that an empty batch settles to no payouts
+
+        """
+        self.assertEqual({}, BetBatch().settle(self.winning_bin))
+
+
+if __name__ == '__main__':
+    unittest.main()
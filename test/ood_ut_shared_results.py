@@ -0,0 +1,153 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the shared memory aggregation of sessions
+
+"""
+
+import pickle
+import unittest
+
+from ood_shared_results import SharedResults, run_shared_sessions
+from ood_simulation import Session, run_sessions
+from ood_wheel import default_wheel
+from ood_wheel_layout import EUROPEAN
+
+
+class TestSharedResults(unittest.TestCase):
+    """
+    Test class for the SharedResults class.
+    This unit test class writes rows of two workers and merges them.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestSharedResults class
+
+        """
+        self.results = SharedResults(2, 38, 5, 4)
+
+    def tearDown(self):
+        """
+        tear down function for the TestSharedResults class
+
+        """
+        self.results.close()
+        self.results.unlink()
+
+    def test_rows_and_totals(self):
+        """
+        Tests that worker rows are views of the shared tables and that totals add them up
+
+        """
+        self.assertEqual(list(self.results.totals(self.results.bin_hits)), [0] * 38)
+        self.results.row(self.results.bin_hits, 0)[3] += 2
+        self.results.row(self.results.bin_hits, 1)[3] += 5
+        self.results.row(self.results.payouts, 1)[4] -= 1.5
+        self.assertEqual(self.results.totals(self.results.bin_hits)[3], 7)
+        self.assertEqual(list(self.results.totals(self.results.payouts)), [0, 0, 0, 0, -1.5])
+
+    def test_pickle_attaches(self):
+        """
+        Tests that an unpickled SharedResults sees the writes of the original
+
+        """
+        attached = pickle.loads(pickle.dumps(self.results))
+        attached.row(attached.bankroll_histogram, 1)[2] = 9
+        self.assertEqual(self.results.totals(self.results.bankroll_histogram)[2], 9)
+        attached.close()
+
+
+class TestRunSharedSessions(unittest.TestCase):
+    """
+    Test class for the run_shared_sessions function.
+    This unit test class plays sessions betting on Red and 17.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestRunSharedSessions class
+
+        """
+        wheel = default_wheel()
+        self.session = Session(100, [(wheel.get_outcome('Red'), 10), (wheel.get_outcome('17'), 1)], 30)
+
+    def test_matches_run_sessions(self):
+        """
+        Tests that the shared tables agree with run_sessions for the same seed
+
+        """
+        results = run_shared_sessions(self.session, 500, seed=24, processes=1, chunk_size=100)
+        statistics = run_sessions(self.session, 500, seed=24, processes=1, chunk_size=100)
+        self.assertEqual(results.sessions, 500)
+        self.assertEqual(results.spins, statistics.spins)
+        self.assertEqual(results.ruined, statistics.ruined)
+        self.assertEqual(results.ruin_probability, statistics.ruin_probability)
+        self.assertEqual(sum(results.bin_hits), results.spins)
+        self.assertEqual(sum(results.bankroll_histogram), 500)
+        self.assertAlmostEqual(100 + (results.payouts['Red'] + results.payouts['17']) / 500, statistics.mean_bankroll)
+        self.assertEqual(results.payouts['Black'], 0)
+
+    def test_long_sessions(self):
+        """
+        Tests that the bins of sessions longer than the hit buffer are all counted
+
+        """
+        session = Session(10 ** 6, [(default_wheel().get_outcome('Red'), 1)], 70000)
+        results = run_shared_sessions(session, 2, seed=3, processes=1)
+        self.assertEqual(140000, results.spins)
+        self.assertEqual(140000, sum(results.bin_hits))
+        statistics = run_sessions(session, 2, seed=3, processes=1)
+        self.assertAlmostEqual(10 ** 6 + results.payouts['Red'] / 2, statistics.mean_bankroll)
+
+    def test_processes(self):
+        """
+        Tests that two worker processes merge to the same tables as one process
+
+        """
+        one = run_shared_sessions(self.session, 400, seed=7, processes=1, chunk_size=50)
+        two = run_shared_sessions(self.session, 400, seed=7, processes=2, chunk_size=50)
+        all_cpus = run_shared_sessions(self.session, 400, seed=7, chunk_size=50)
+        self.assertEqual(list(one.bin_hits), list(two.bin_hits))
+        self.assertEqual(list(one.bin_hits), list(all_cpus.bin_hits))
+        self.assertEqual(list(one.bankroll_histogram), list(two.bankroll_histogram))
+        for name, payout in one.payouts.items():
+            self.assertAlmostEqual(payout, two.payouts[name])
+
+    def test_layout_sizes(self):
+        """
+        Tests that the tables are sized from the layout and the histogram from bucket_count
+
+        """
+        results = run_shared_sessions(self.session, 50, seed=1, processes=1, layout=EUROPEAN, bucket_count=10,
+                                      bankroll_range=(0, 200))
+        self.assertEqual(len(results.bin_hits), 37)
+        self.assertEqual(len(results.bankroll_histogram), 10)
+        self.assertEqual(results.bucket_edges[0], 0)
+        self.assertEqual(results.bucket_edges[-1], 200)
+        self.assertRaises(ValueError, run_shared_sessions, self.session, 10, None, 0)
+        self.assertRaises(ValueError, run_shared_sessions, self.session, 10, None, 1, bankroll_range=(100, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
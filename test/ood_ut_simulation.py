@@ -0,0 +1,145 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the simulation engine
+
+"""
+
+import unittest
+
+from ood_bin_builder import BinBuilder
+from ood_outcome import outcome_registry
+from ood_simulation import SPIN_CHUNK_SIZE, Session, SessionStatistics, run_sessions
+from ood_wheel import Wheel
+
+
+class TestSession(unittest.TestCase):
+    """
+    Test class for the Session class.
+    This unit test class plays sessions on a seeded, built Wheel.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestSession class
+
+        """
+        self.wheel = Wheel(1)
+        BinBuilder().build_bins(self.wheel)
+        self.red = outcome_registry.get_outcome('Red', 1)
+
+    def test_play(self):
+        """
+        Tests that a session's final bankroll follows the spins of the wheel
+
+        """
+        spins = Wheel(1).next_wheel_bins(20)
+        expected_bankroll = 100 + sum(10 if self.red in self.wheel.get_wheel_bin(bin_number) else -10
+                                      for bin_number in spins)
+        self.assertEqual((expected_bankroll, 20), Session(100, [(self.red, 10)], 20).play(self.wheel))
+
+    def test_play_until_ruined(self):
+        """
+        Tests that a session stops when the bankroll no longer covers the bets
+
+        """
+        bankroll, spins = Session(10, [(self.red, 10)], 1000).play(self.wheel)
+        self.assertLess(bankroll, 10)
+        self.assertLess(spins, 1000)
+
+    def test_played_bins(self):
+        """
+        Tests that play reports the Bins spun while the session was in play
+
+        """
+        played_bins = bytearray()
+        bankroll, spins = Session(30, [(self.red, 10)], 100).play(self.wheel, played_bins=played_bins)
+        self.assertEqual(spins, len(played_bins))
+        self.assertEqual(bytes(Wheel(1).next_wheel_bins(spins)), played_bins)
+        self.assertTrue(Session(30, [(self.red, 10)], 100).is_ruined(bankroll) or spins == 100)
+
+    def test_long_session_draws_in_chunks(self):
+        """
+        Tests that a long session follows the same spins across chunks and stops drawing once ruined
+
+        """
+        spins = Wheel(1).next_wheel_bins(10000)
+        expected_bankroll = 10 ** 6 + sum(1 if self.red in self.wheel.get_wheel_bin(bin_number) else -1
+                                          for bin_number in spins)
+        self.assertEqual((expected_bankroll, 10000), Session(10 ** 6, [(self.red, 1)], 10000).play(self.wheel))
+
+        wheel = Wheel(2)
+        BinBuilder().build_bins(wheel)
+        bankroll, spins = Session(10, [(self.red, 10)], 10 ** 6).play(wheel)
+        self.assertLess(spins, SPIN_CHUNK_SIZE)
+        reference = Wheel(2)
+        reference.next_wheel_bins(SPIN_CHUNK_SIZE)
+        self.assertEqual(reference.next_wheel_bins(10), wheel.next_wheel_bins(10))
+
+
+class TestSessionStatistics(unittest.TestCase):
+    """
+    Test class for the SessionStatistics class.
+
+    """
+
+    def test_merge(self):
+        """
+        Tests that merged statistics equal statistics accumulated in one pass
+
+        """
+        results = [(120.0, 10, False), (0.0, 4, True), (95.0, 10, False), (130.0, 10, False), (5.0, 7, True)]
+        combined = SessionStatistics()
+        first = SessionStatistics()
+        second = SessionStatistics()
+        for index, result in enumerate(results):
+            combined.add(*result)
+            (first if index < 2 else second).add(*result)
+        first.merge(second)
+        self.assertEqual(combined.count, first.count)
+        self.assertAlmostEqual(70.0, first.mean_bankroll)
+        self.assertAlmostEqual(combined.bankroll_variance, first.bankroll_variance)
+        self.assertEqual(0.4, first.ruin_probability)
+        self.assertEqual(41, first.spins)
+
+
+class TestRunSessions(unittest.TestCase):
+    """
+    Test class for the run_sessions function.
+
+    """
+
+    def test_repeatable_across_process_counts(self):
+        """
+        Tests that a seeded run gives the same statistics in one process and in a pool
+
+        """
+        session = Session(100, [(outcome_registry.get_outcome('Red', 1), 10)], 50)
+        in_process = run_sessions(session, 250, seed=7, processes=1, chunk_size=100)
+        pooled = run_sessions(session, 250, seed=7, processes=2, chunk_size=100)
+        self.assertEqual(250, in_process.count)
+        self.assertEqual((in_process.mean_bankroll, in_process.bankroll_variance, in_process.ruined),
+                         (pooled.mean_bankroll, pooled.bankroll_variance, pooled.ruined))
+
+
+if __name__ == '__main__':
+    unittest.main()
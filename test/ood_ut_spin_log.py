@@ -0,0 +1,139 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the SpinRecorder and SpinReplay classes
+
+"""
+
+import os
+import tempfile
+import unittest
+
+from ood_bin_builder import BinBuilder
+from ood_spin_log import RECORD, SpinRecorder, SpinReplay
+from ood_wheel import Wheel
+
+
+class TestSpinLog(unittest.TestCase):
+    """
+    Test class for the spin log.
+    This unit test class records spins of a seeded Wheel and replays them.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestSpinLog class
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'spins.log')
+        self.wheel = Wheel(9)
+        BinBuilder().build_bins(self.wheel)
+
+    def tearDown(self):
+        """
+        tear down function for the TestSpinLog class
+
+        """
+        self.directory.cleanup()
+
+    def test_record_and_replay(self):
+        """
+        Tests that replayed spins match the recorded spins
+
+        """
+        with SpinRecorder(self.wheel, self.path, stream_id=4, buffer_size=64) as recorder:
+            recorded_bins = [recorder.next_wheel_bin() for _ in range(3)]
+            recorded_numbers = recorder.next_wheel_bins(50)
+        self.assertEqual(53 * RECORD.size, os.path.getsize(self.path))
+
+        with SpinReplay(self.wheel, self.path) as replay:
+            self.assertEqual(53, len(replay))
+            self.assertEqual(recorded_bins, [replay.next_wheel_bin() for _ in range(3)])
+            self.assertEqual(recorded_numbers, replay.next_wheel_bins(50))
+            self.assertRaises(EOFError, replay.next_wheel_bin)
+            records = list(replay.records())
+        self.assertEqual((0, 4), records[0][:2])
+        self.assertEqual((52, 4, recorded_numbers[-1]), records[-1])
+
+    def test_append_and_filter_streams(self):
+        """
+        Tests that two streams appended to one log can be replayed separately
+
+        """
+        first_wheel, second_wheel = self.wheel.spawn(2)
+        with SpinRecorder(first_wheel, self.path, stream_id=1) as recorder:
+            first_numbers = recorder.next_wheel_bins(20)
+        with SpinRecorder(second_wheel, self.path, stream_id=2) as recorder:
+            second_numbers = recorder.next_wheel_bins(30)
+        with SpinReplay(self.wheel, self.path, stream_id=2) as replay:
+            self.assertEqual(second_numbers, replay.next_wheel_bins(30))
+        with SpinReplay(self.wheel, self.path) as replay:
+            self.assertEqual(first_numbers + second_numbers, replay.next_wheel_bins(50))
+
+    def test_recording_keeps_spins(self):
+        """
+        Tests that a recorded wheel spins the same Bins as an unrecorded one
+
+        """
+        unrecorded = Wheel(5)
+        recorded = Wheel(5)
+        BinBuilder().build_bins(unrecorded)
+        BinBuilder().build_bins(recorded)
+        expected_bins = [unrecorded.next_wheel_bin() for _ in range(20)]
+        with SpinRecorder(recorded, self.path) as recorder:
+            self.assertEqual(expected_bins, [recorder.next_wheel_bin() for _ in range(20)])
+        with SpinReplay(self.wheel, self.path) as replay:
+            self.assertEqual(expected_bins, [replay.next_wheel_bin() for _ in range(20)])
+
+    def test_reopen_continues_sequence(self):
+        """
+        Tests that reopening a log continues the sequence numbers of every stream
+
+        """
+        first_wheel, second_wheel = self.wheel.spawn(2)
+        with SpinRecorder(first_wheel, self.path, stream_id=1) as recorder:
+            recorder.next_wheel_bins(5000)
+        with SpinRecorder(second_wheel, self.path, stream_id=2) as recorder:
+            recorder.next_wheel_bins(3)
+        with SpinRecorder(first_wheel, self.path, stream_id=1) as recorder:
+            self.assertEqual(5000, recorder.sequence)
+            recorder.next_wheel_bin()
+        with SpinRecorder(second_wheel, self.path, stream_id=2) as recorder:
+            self.assertEqual(3, recorder.sequence)
+        with SpinReplay(self.wheel, self.path) as replay:
+            sequences = [sequence for sequence, stream_id, _ in replay.records() if stream_id == 1]
+        self.assertEqual(list(range(5001)), sequences)
+
+    def test_empty_log(self):
+        """
+        Tests that an empty log replays no spins
+
+        """
+        open(self.path, 'wb').close()
+        with SpinReplay(self.wheel, self.path) as replay:
+            self.assertEqual(0, len(replay))
+            self.assertRaises(EOFError, replay.next_wheel_bins, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
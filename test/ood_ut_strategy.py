@@ -0,0 +1,120 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the betting strategies and the StrategyEvaluator class
+
+"""
+
+import unittest
+from array import array
+
+from ood_bin_builder import BinBuilder
+from ood_outcome import outcome_registry
+from ood_strategy import Fibonacci, FlatBetting, Martingale, StrategyEvaluator
+from ood_wheel import Wheel
+
+
+class TestStrategies(unittest.TestCase):
+    """
+    Test class for the next_stakes methods of the betting strategies
+
+    """
+
+    def test_flat_betting(self):
+        """
+        Tests that flat betting always stakes the base stake
+
+        """
+        strategy = FlatBetting()
+        strategy.reset(2, 5)
+        self.assertEqual(array('d', [5, 5]), strategy.next_stakes(array('d', [5, 5]), bytes([0, 1])))
+
+    def test_martingale(self):
+        """
+        Tests that Martingale doubles after a loss and resets after a win
+
+        """
+        strategy = Martingale()
+        strategy.reset(2, 5)
+        self.assertEqual(array('d', [40, 5]), strategy.next_stakes(array('d', [20, 20]), bytes([0, 1])))
+
+    def test_fibonacci(self):
+        """
+        Tests that Fibonacci climbs the sequence on losses and drops two steps on a win
+
+        """
+        strategy = Fibonacci()
+        strategy.reset(1, 1)
+        stakes = array('d', [1])
+        observed = []
+        for player_won in (0, 0, 0, 0, 1, 1):
+            stakes = strategy.next_stakes(stakes, bytes([player_won]))
+            observed.append(stakes[0])
+        self.assertEqual([1, 2, 3, 5, 2, 1], observed)
+
+
+class TestStrategyEvaluator(unittest.TestCase):
+    """
+    Test class for the StrategyEvaluator class.
+    This unit test class plays strategies on Red for several players on a seeded Wheel.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestStrategyEvaluator class
+
+        """
+        self.wheel = Wheel(3)
+        BinBuilder().build_bins(self.wheel)
+        self.red = outcome_registry.get_outcome('Red', 1)
+
+    def test_flat_betting_follows_spins(self):
+        """
+        Tests that every player's bankroll follows their own spins
+
+        """
+        spins = Wheel(3).next_wheel_bins(3 * 4)
+        evaluator = StrategyEvaluator(self.wheel, self.red, FlatBetting(), 4, 100, 10)
+        evaluator.run(3)
+        for player in range(4):
+            expected_bankroll = 100 + sum(10 if self.red in self.wheel.get_wheel_bin(spins[4 * spin + player]) else -10
+                                          for spin in range(3))
+            self.assertEqual(expected_bankroll, evaluator.bankrolls[player])
+            self.assertIn(evaluator.streaks[player], (-3, -2, -1, 1, 2, 3))
+        self.assertEqual(3, evaluator.spins)
+
+    def test_limits(self):
+        """
+        Tests that stakes respect the table limit and that broke players drop out
+
+        """
+        evaluator = StrategyEvaluator(self.wheel, self.red, Martingale(), 500, 100, 10, table_limit=40)
+        evaluator.run(50)
+        self.assertTrue(all(stake <= 40 for stake in evaluator.stakes))
+        self.assertTrue(all(bankroll >= 10 or stake == 0
+                            for bankroll, stake in zip(evaluator.bankrolls, evaluator.stakes)))
+        self.assertLess(evaluator.active_players, 500)
+        self.assertTrue(all(bankroll >= 0 for bankroll in evaluator.bankrolls))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the Table and TableService classes
+
+"""
+
+import asyncio
+import unittest
+
+from ood_table_service import TableService, load_test
+
+
+class TestTableService(unittest.TestCase):
+    """
+    Test class for the TableService class.
+    This unit test class plays a few rounds on several tables from one event loop.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestTableService class
+
+        """
+        self.service = TableService(20, round_interval=0.001, seed=3)
+
+    def test_load_test(self):
+        """
+        Tests that every player is settled once per round at every table
+
+        """
+        results = asyncio.run(load_test(self.service, 'Red', 3, 10))
+        self.assertEqual(60, len(results))
+        self.assertTrue(all(abs(net) <= 10 and net % 2 == 0 for net in results.values()))
+        self.assertEqual(10, self.service.rounds)
+        self.assertTrue(all(table.rounds == 10 for table in self.service.tables))
+        self.assertGreaterEqual(self.service.max_latency, self.service.mean_latency)
+
+    def test_bets_are_settled_against_the_spin(self):
+        """
+        Tests that a bet resolves to its win amount when its Outcome is in the winning Bin
+
+        """
+        async def play_one_round():
+            table = self.service.tables[0]
+            outcome = table.wheel.get_outcome('Red')
+            future = table.place_bet('player', outcome, 5)
+            winning_bin = table.play_round()
+            return await future, outcome in winning_bin
+
+        net, won = asyncio.run(play_one_round())
+        self.assertEqual(5 if won else -5, net)
+
+    def test_open_bets_are_cancelled(self):
+        """
+        Tests that bets left open when the service stops are cancelled
+
+        """
+        async def bet_after_last_round():
+            await self.service.run(1)
+            future = self.service.place_bet(1, 'player', self.service.tables[1].wheel.get_outcome('Red'), 1)
+            await self.service.run(0)
+            return future
+
+        self.assertTrue(asyncio.run(bet_after_last_round()).cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
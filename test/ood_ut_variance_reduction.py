@@ -0,0 +1,105 @@
+#  Copyright (c) 2019 Benjamin Ezepue
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""
+Test module for the variance reduction modes
+
+"""
+
+import unittest
+
+from ood_simulation import Session
+from ood_variance_reduction import ANTITHETIC, COMMON, INDEPENDENT, STRATIFIED, compare_sessions
+from ood_wheel import default_wheel
+
+
+class TestCompareSessions(unittest.TestCase):
+    """
+    Test class for the compare_sessions function.
+    This unit test class compares sessions betting on Low, Red and the first dozen.
+
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestCompareSessions class
+
+        """
+        self.wheel = default_wheel().spawn(1)[0]
+        self.wheel.random_number_generator.seed(21)
+        self.low_session = Session(1000, [(self.wheel.get_outcome('Low'), 10)], 50)
+        self.red_session = Session(1000, [(self.wheel.get_outcome('Red'), 10)], 50)
+        self.dozen_session = Session(1000, [(self.wheel.get_outcome('Dozen 1'), 10)], 50)
+
+    def test_unknown_mode(self):
+        """
+        Tests that an unknown mode is rejected
+
+        """
+        self.assertRaises(ValueError, compare_sessions, self.wheel, [self.low_session], 10, 'quasi')
+
+    def test_common_random_numbers(self):
+        """
+        Tests that identical sessions fed the same spins never differ, using half the spins
+
+        """
+        result = compare_sessions(self.wheel, [self.red_session, self.red_session], 100, COMMON)
+        self.assertEqual(0, result.differences[1].variance)
+        self.assertEqual(50 * 100, result.spins)
+        independent = compare_sessions(self.wheel, [self.red_session, self.red_session], 100, INDEPENDENT)
+        self.assertGreater(independent.differences[1].variance, 0)
+        self.assertEqual(2 * 50 * 100, independent.spins)
+
+    def test_independent_counts_spins_played(self):
+        """
+        Tests that independent replicates count the spins played by sessions ruined early
+
+        """
+        session = Session(10, [(self.wheel.get_outcome('0'), 10)], 10000)
+        result = compare_sessions(self.wheel, [session], 20, INDEPENDENT)
+        self.assertEqual(20, result.bankrolls[0].count)
+        self.assertLess(result.spins, 20 * 1000)
+
+    def test_antithetic(self):
+        """
+        Tests that antithetic pairs reduce the standard error of a bet on Low
+
+        """
+        antithetic = compare_sessions(self.wheel, [self.low_session], 400, ANTITHETIC)
+        independent = compare_sessions(self.wheel, [self.low_session], 400, INDEPENDENT)
+        self.assertEqual(200, antithetic.bankrolls[0].count)
+        self.assertEqual(50 * 200, antithetic.spins)
+        self.assertLess(antithetic.bankrolls[0].standard_error, independent.bankrolls[0].standard_error / 2)
+
+    def test_stratified_is_exact_without_ruin(self):
+        """
+        Tests that stratified blocks give the exact expected bankroll when no session can be ruined
+
+        """
+        result = compare_sessions(self.wheel, [self.low_session, self.dozen_session], 76, STRATIFIED)
+        expected_bankroll = 1000 - 50 * 10 * 2 / 38
+        self.assertEqual(2, result.bankrolls[0].count)
+        self.assertAlmostEqual(expected_bankroll, result.bankrolls[0].mean)
+        self.assertAlmostEqual(expected_bankroll, result.bankrolls[1].mean)
+        self.assertAlmostEqual(0, result.differences[1].standard_error)
+
+
+if __name__ == '__main__':
+    unittest.main()
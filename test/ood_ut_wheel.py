@@ -23,11 +23,16 @@ Test module for the bin class
 
 """
 
+import subprocess
+import sys
 import unittest
+from threading import Thread
 
-from ood_wheel import Wheel
-from ood_outcome import Outcome
-from ood_bin import Bin
+from ood_wheel import ConcurrentWheel, Wheel, default_wheel
+from ood_outcome import Outcome, OutcomeRegistry
+from ood_bin import Bin, BitsetBin
+from ood_bin_builder import BinBuilder
+from ood_wheel_layout import EUROPEAN
 
 
 class TestWheel(unittest.TestCase):
@@ -64,6 +69,60 @@ class TestWheel(unittest.TestCase):
         self.wheel.add_outcome_to_wheel_bin(1, Outcome('00-0-1-2-3', 6))
         self.assertEqual(self.wheel.get_wheel_bin(1), self.bin2)
 
+    def test_add_outcome_to_bitset_wheel_bin(self):
+        """
+        Tests that a wheel built with BitsetBin keeps BitsetBin instances as outcomes are added
+
+        """
+        wheel = Wheel(bin_class=BitsetBin)
+        outcome = OutcomeRegistry().get_outcome('Red', 1)
+        wheel.add_outcome_to_wheel_bin(3, outcome)
+        self.assertIsInstance(wheel.get_wheel_bin(3), BitsetBin)
+        self.assertTrue(wheel.get_wheel_bin(3).wins(outcome.outcome_id))
+        self.assertIsInstance(wheel.spawn(1)[0].get_wheel_bin(0), BitsetBin)
+
+
+class TestWheelOutcomeIndexes(unittest.TestCase):
+    """
+     This unit test class tests the name and reverse Outcome indexes of a built Wheel.
+    """
+
+    def setUp(self):
+        """
+        setup function for the TestWheelOutcomeIndexes class
+
+        """
+        self.wheel = Wheel()
+        self.registry = OutcomeRegistry()
+        BinBuilder(self.registry).build_bins(self.wheel)
+
+    def test_get_outcome(self):
+        """
+        Tests that Outcomes are found by name
+
+        """
+        self.assertIs(self.registry.get_outcome('Red', 1), self.wheel.get_outcome('Red'))
+        self.assertEqual(8, self.wheel.get_outcome('{1 - 2 - 4 - 5}').odds)
+        self.assertRaises(KeyError, self.wheel.get_outcome, 'Purple')
+
+    def test_get_outcome_bins(self):
+        """
+        Tests that the reverse index lists the bins containing an Outcome
+
+        """
+        self.assertEqual((1, 2, 4, 5), self.wheel.get_outcome_bins(self.wheel.get_outcome('{1 - 2 - 4 - 5}')))
+        self.assertEqual(tuple(range(1, 13)), self.wheel.get_outcome_bins(self.wheel.get_outcome('Dozen 1')))
+        self.assertEqual((), self.wheel.get_outcome_bins(Outcome('Purple', 1)))
+
+    def test_indexes_follow_changes(self):
+        """
+        Tests that the indexes are rebuilt after an Outcome is added
+
+        """
+        red_outcome = self.wheel.get_outcome('Red')
+        self.wheel.add_outcome_to_wheel_bin(0, red_outcome)
+        self.assertEqual(0, self.wheel.get_outcome_bins(red_outcome)[0])
+
 
 class TestWheelRandomChoice(unittest.TestCase):
     """
@@ -88,6 +147,158 @@ class TestWheelRandomChoice(unittest.TestCase):
         for bin_number in range(10):
             self.assertEqual(self.wheel.bins[expected_random_bin[bin_number]], self.wheel.next_wheel_bin())
 
+    def test_next_wheel_bins(self):
+        """
+        Tests that calling the next_wheel_bins method returns the numbers of randomly selected Bins.
+
+        """
+        expected_random_bins = [5, 32, 29, 9, 18, 17, 24, 29, 3, 1]
+        self.assertEqual(expected_random_bins, list(self.wheel.next_wheel_bins(10)))
+        self.assertEqual(0, len(self.wheel.next_wheel_bins(0)))
+
+
+class TestWheelSeeding(unittest.TestCase):
+    """
+     This unit test class tests that wheels built from an explicit seed are reproducible
+     and that spawned wheels draw from independent streams.
+    """
+
+    def test_seeded_wheels_are_reproducible(self):
+        """
+        Tests that two wheels with the same seed spin the same bins.
+
+        """
+        self.assertEqual(Wheel(42).next_wheel_bins(100), Wheel(42).next_wheel_bins(100))
+
+    def test_spawned_wheels(self):
+        """
+        Tests that spawned wheels share the bins, differ from each other and are reproducible.
+
+        """
+        wheel = Wheel(42)
+        children = wheel.spawn(2)
+        self.assertIs(wheel.bins, children[0].bins)
+        self.assertNotEqual(children[0].next_wheel_bins(100), children[1].next_wheel_bins(100))
+        self.assertEqual([child.next_wheel_bins(100) for child in Wheel(42).spawn(2)],
+                         [child.next_wheel_bins(100) for child in Wheel(42).spawn(2)])
+
+    def test_spawned_wheels_see_bin_changes(self):
+        """
+        Tests that a Bin changed through one spawned wheel updates the derived tables of all of them.
+
+        """
+        wheel = Wheel(42)
+        BinBuilder().build_bins(wheel)
+        children = wheel.spawn(2)
+        red = wheel.get_outcome('Red')
+        wheel.payout_matrix()
+        self.assertEqual(1, children[0].get_outcome_bins(red)[0])
+        children[1].add_outcome_to_wheel_bin(0, red)
+        for spawned in (wheel, children[0], children[1]):
+            self.assertEqual(0, spawned.get_outcome_bins(red)[0])
+            self.assertEqual(red.odds, spawned.payout_matrix().rows[0][spawned.payout_matrix().column(red)])
+
+
+class TestConcurrentWheel(unittest.TestCase):
+    """
+     This unit test class tests that threads sharing a ConcurrentWheel draw from their own streams.
+    """
+
+    def test_threads_draw_independent_streams(self):
+        """
+        Tests that every thread gets its own generator over the shared bins.
+
+        """
+        wheel = ConcurrentWheel(42)
+        main_spins = wheel.next_wheel_bins(100)
+        thread_spins = {}
+
+        def spin(thread_number):
+            thread_spins[thread_number] = (wheel.next_wheel_bins(100), wheel.random_number_generator)
+
+        threads = [Thread(target=spin, args=(thread_number,)) for thread_number in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Wheel(42).next_wheel_bins(100), main_spins)
+        generators = {id(generator) for _, generator in thread_spins.values()}
+        generators.add(id(wheel.random_number_generator))
+        self.assertEqual(5, len(generators))
+        self.assertEqual(4, wheel.seed_sequence.children_spawned)
+        expected_spins = sorted(child.random().choices(range(38), k=100)
+                                for child in ConcurrentWheel(42).seed_sequence.spawn(4))
+        self.assertEqual(expected_spins, sorted(list(spins) for spins, _ in thread_spins.values()))
+
+    def test_spawn_keeps_concurrency(self):
+        """
+        Tests that wheels spawned from a ConcurrentWheel are concurrent too.
+
+        """
+        self.assertIsInstance(ConcurrentWheel(1).spawn(1)[0], ConcurrentWheel)
+
+    def test_spawn_races_with_first_spins(self):
+        """
+        Tests that spawning wheels while threads spin for the first time never repeats a spawn key.
+
+        """
+        wheel = ConcurrentWheel(42)
+        spawn_keys = []
+
+        def spin():
+            spawn_keys.append(wheel.random_number_generator.getstate())
+
+        def spawn():
+            for child in wheel.spawn(50):
+                spawn_keys.append(child.random_number_generator.getstate())
+
+        threads = [Thread(target=spin) for _ in range(50)] + [Thread(target=spawn) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(250, wheel.seed_sequence.children_spawned)
+        self.assertEqual(250, len(set(spawn_keys)))
+
+
+class TestDefaultWheel(unittest.TestCase):
+    """
+     This unit test class tests the shared default wheels.
+    """
+
+    def test_default_wheel_is_shared(self):
+        """
+        Tests that the default wheel of a layout is built once and shared.
+
+        """
+        self.assertIs(default_wheel(), default_wheel())
+        self.assertEqual(38, len(default_wheel().bins))
+        self.assertEqual(37, len(default_wheel(EUROPEAN).bins))
+        self.assertIsNot(default_wheel(), default_wheel(EUROPEAN))
+
+    def test_default_wheel_is_frozen(self):
+        """
+        Tests that the default wheel and the wheels spawned from it cannot be changed.
+
+        """
+        red_outcome = default_wheel().get_outcome('Red')
+        self.assertTrue(default_wheel().frozen)
+        self.assertRaises(ValueError, default_wheel().add_outcome_to_wheel_bin, 0, red_outcome)
+        spawned_wheel = default_wheel().spawn(1)[0]
+        self.assertIs(default_wheel().bins, spawned_wheel.bins)
+        self.assertRaises(ValueError, spawned_wheel.load_wheel_bins, [[]] * 38)
+        self.assertIn(red_outcome, spawned_wheel.get_wheel_bin(1))
+
+    def test_import_does_not_build(self):
+        """
+        Tests that importing the wheel module neither builds a wheel nor imports the BinBuilder.
+
+        """
+        code = "import sys, ood_wheel; print('ood_bin_builder' in sys.modules, len(ood_wheel._default_wheels))"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual('False 0', output.strip())
+
 
 if __name__ == '__main__':
     unittest.main()